@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional, Tuple
 
 from img import Img
 
@@ -22,3 +23,35 @@ class Board:
             H_cells=self.H_cells,
             img=copy.deepcopy(self.img)
         )
+
+    def in_bounds(self, r: int, c: int) -> bool:
+        return 0 <= r < self.H_cells and 0 <= c < self.W_cells
+
+
+def cell_name(cell: Tuple[int, int]) -> str:
+    """Display name of a (row, col) cell: (1, 4) -> 'e2', (0, 26) -> 'aa1', (99, 0) -> 'a100'.
+
+    Columns are letters like spreadsheet columns (a..z, aa, ab, ...), so
+    any board size has a name.  Only for printing and logs - commands
+    carry the integer cell.
+    """
+    r, c = int(cell[0]), int(cell[1])
+    letters = ""
+    c += 1
+    while c:
+        c, rem = divmod(c - 1, 26)
+        letters = chr(ord('a') + rem) + letters
+    return f"{letters}{r + 1}"
+
+
+def parse_cell_name(name: str) -> Optional[Tuple[int, int]]:
+    """Inverse of cell_name ('e2' -> (1, 4)); None if `name` is not a cell name."""
+    name = name.strip().lower()
+    split = len(name) - len(name.lstrip("abcdefghijklmnopqrstuvwxyz"))
+    letters, digits = name[:split], name[split:]
+    if not letters or not digits.isdigit() or int(digits) < 1:
+        return None
+    c = 0
+    for ch in letters:
+        c = c * 26 + ord(ch) - ord('a') + 1
+    return (int(digits) - 1, c - 1)
@@ -0,0 +1,507 @@
+import contextlib
+import itertools
+import multiprocessing
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from Moves import MoveTable
+
+# ערכי חומר לפי סוג כלי - אין שח במשחק הזה, המלך הוא עוד כלי שצריך לאכול
+PIECE_VALUES = {"P": 100, "N": 300, "B": 300, "R": 500, "Q": 900, "K": 400}
+DEFAULT_VALUE = 300
+CENTER_WEIGHT = 5     # לכל משבצת מהשפה (עד 3 בכל ציר)
+WIN_SCORE = 1_000_000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+_MASK = (1 << 64) - 1
+_SIDE_KEY = 0x2545F4914F6CDD1D
+
+
+def _mix(x: int) -> int:
+    """splitmix64 - Zobrist keys computed on demand, so a 256x256 board needs no key tables."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class BotPosition:
+    """The game as the search sees it: per-piece arrays with make/unmake and an incremental hash.
+
+    Follows Game's rules: a piece may act once its cooldown is over, a
+    move is legal by its MoveTable against the occupancy bitboard, and
+    when two pieces meet the one that started moving earlier wins (a
+    jumping piece is only met when it lands, which is decided the same
+    way).  Each ply is one decision of the side to move, then `ply_ms`
+    of game time passes.  Slides are resolved when they start - crossing
+    paths mid-slide is not modelled.  The hash covers placement, which
+    pieces are still cooling down and the side to move, and is updated
+    with a few XORs per make/unmake.
+    """
+
+    def __init__(self, dims: Tuple[int, int], tables: List[MoveTable], kinds: List[Tuple[int, str]],
+                 timing: dict, pieces, now_ms: int, side: int, ply_ms: int):
+        self.H, self.W = dims
+        self.tables = tables
+        self.kind_team = [team for team, _ in kinds]
+        self.kind_value = [PIECE_VALUES.get(piece_type, DEFAULT_VALUE) for _, piece_type in kinds]
+        self.move_cooldown_ms = timing["move_cooldown_ms"]
+        self.jump_cooldown_ms = timing["jump_cooldown_ms"]
+        self.jump_air_ms = timing["jump_air_ms"]
+        self.ply_ms = ply_ms
+        self.center = [CENTER_WEIGHT * (min(r, self.H - 1 - r, 3) + min(c, self.W - 1 - c, 3))
+                       for r in range(self.H) for c in range(self.W)]
+
+        self.ids: List[str] = []
+        self.kind: List[int] = []
+        self.cell: List[int] = []
+        self.ready: List[int] = []
+        self.last: List[int] = []
+        self.air: List[int] = []
+        self.at: Dict[int, int] = {}
+        self.by_team: Dict[int, List[int]] = {}
+        self.score: Dict[int, int] = {}
+        self.cooling = set()
+        self.occ = 0
+        self.hash = 0
+        self.t = now_ms
+        self.side = side
+        for piece_id, kind, r, c, ready_ms, last_ms in pieces:
+            i = len(self.ids)
+            cell = r * self.W + c
+            team = self.kind_team[kind]
+            self.ids.append(piece_id)
+            self.kind.append(kind)
+            self.cell.append(cell)
+            self.ready.append(ready_ms)
+            self.last.append(last_ms)
+            self.air.append(0)
+            self.at[cell] = i
+            self.by_team.setdefault(team, []).append(i)
+            self.score[team] = self.score.get(team, 0) + self._value(i, cell)
+            self.occ |= 1 << cell
+            self.hash ^= self._place_key(kind, cell)
+            if ready_ms > now_ms:
+                self.cooling.add(i)
+                self.hash ^= self._cool_key(kind, cell)
+        self.score.setdefault(side, 0)
+        self.other = {side: next((team for team in self.score if team != side), side)}
+        self.other[self.other[side]] = side
+        self.score.setdefault(self.other[side], 0)
+
+    # ------------------------------------------------------------ hashing / scoring
+    def _place_key(self, kind: int, cell: int) -> int:
+        return _mix((kind * self.H * self.W + cell) << 1)
+
+    def _cool_key(self, kind: int, cell: int) -> int:
+        return _mix(((kind * self.H * self.W + cell) << 1) | 1)
+
+    def _value(self, i: int, cell: int) -> int:
+        return self.kind_value[self.kind[i]] + self.center[cell]
+
+    def evaluate(self) -> int:
+        """Material and centralisation of the side to move minus the opponent's."""
+        return self.score[self.side] - self.score[self.other[self.side]]
+
+    def is_over(self) -> bool:
+        return not self.score[self.side] or not self.score[self.other[self.side]]
+
+    # ------------------------------------------------------------ move generation
+    def actions(self, first=None) -> list:
+        """(piece, target cell, is_jump) of every ready piece of the side to move, then None (wait).
+
+        Quiet moves come before moves onto an enemy (which the earlier
+        mover usually wins), so cutoffs come sooner; `first` (the
+        transposition table's move) is tried first when it is legal here.
+        """
+        quiet, contacts, jumps = [], [], []
+        W, t, occ, at, side = self.W, self.t, self.occ, self.at, self.side
+        for i in self.by_team.get(side, ()):
+            cell = self.cell[i]
+            if cell < 0 or self.ready[i] > t:
+                continue
+            r, c = divmod(cell, W)
+            for nr, nc in self.tables[self.kind[i]].legal_moves(r, c, occ):
+                target = nr * W + nc
+                j = at.get(target)
+                if j is None:
+                    quiet.append((i, target, False))
+                elif self.kind_team[self.kind[j]] != side:
+                    contacts.append((i, target, False))
+            jumps.append((i, cell, True))
+        ordered = quiet + jumps + [None] + contacts
+        if first is not None and first in ordered:
+            ordered.remove(first)
+            ordered.insert(0, first)
+        return ordered
+
+    # ------------------------------------------------------------ make / unmake
+    def _lift(self, i: int):
+        cell = self.cell[i]
+        self.occ &= ~(1 << cell)
+        del self.at[cell]
+        self.hash ^= self._place_key(self.kind[i], cell)
+        if i in self.cooling:
+            self.hash ^= self._cool_key(self.kind[i], cell)
+        self.score[self.kind_team[self.kind[i]]] -= self._value(i, cell)
+
+    def _drop(self, i: int, cell: int):
+        self.cell[i] = cell
+        self.occ |= 1 << cell
+        self.at[cell] = i
+        self.hash ^= self._place_key(self.kind[i], cell)
+        if i in self.cooling:
+            self.hash ^= self._cool_key(self.kind[i], cell)
+        self.score[self.kind_team[self.kind[i]]] += self._value(i, cell)
+
+    def make(self, action) -> tuple:
+        """Play `action` (None = wait) for the side to move, then let `ply_ms` pass."""
+        t = self.t
+        undo_hash, undo_score = self.hash, dict(self.score)
+        saved = None
+        captured = None
+        if action is not None:
+            i, target, is_jump = action
+            origin = self.cell[i]
+            saved = (i, origin, self.ready[i], self.last[i], self.air[i], i in self.cooling)
+            self._lift(i)
+            self.last[i] = t
+            self.cooling.add(i)
+            if is_jump:
+                self.ready[i] = t + self.jump_cooldown_ms
+                self.air[i] = t + self.jump_air_ms
+                self._drop(i, origin)
+            else:
+                self.ready[i] = t + self.move_cooldown_ms
+                j = self.at.get(target)
+                if j is not None:
+                    # כמו Game._resolve_collisions: הראשון שהתחיל לזוז מנצח (קופץ נבדק כשהוא נוחת)
+                    loser = i if self.last[j] <= self.last[i] else j
+                    if loser == j:
+                        captured = (j, target, j in self.cooling)
+                        self._lift(j)
+                        self.cell[j] = -1
+                        self.cooling.discard(j)
+                        self._drop(i, target)
+                    else:
+                        self.cell[i] = -1
+                        self.cooling.discard(i)
+                else:
+                    self._drop(i, target)
+        self.t = t + self.ply_ms
+        expired = [i for i in self.cooling if self.ready[i] <= self.t]
+        for i in expired:
+            self.cooling.discard(i)
+            self.hash ^= self._cool_key(self.kind[i], self.cell[i])
+        self.side = self.other[self.side]
+        self.hash ^= _SIDE_KEY
+        return (t, undo_hash, undo_score, saved, captured, expired)
+
+    def unmake(self, undo: tuple):
+        t, undo_hash, undo_score, saved, captured, expired = undo
+        self.side = self.other[self.side]
+        self.cooling.update(expired)
+        if saved is not None:
+            i, origin, ready, last, air, was_cooling = saved
+            cell = self.cell[i]
+            if cell >= 0:
+                self.occ &= ~(1 << cell)
+                del self.at[cell]
+            if captured is not None:
+                j, target, j_cooling = captured
+                self.cell[j] = target
+                self.occ |= 1 << target
+                self.at[target] = j
+                if j_cooling:
+                    self.cooling.add(j)
+            self.cell[i] = origin
+            self.occ |= 1 << origin
+            self.at[origin] = i
+            self.ready[i], self.last[i], self.air[i] = ready, last, air
+            if not was_cooling:
+                self.cooling.discard(i)
+        self.t = t
+        self.hash = undo_hash
+        self.score = undo_score
+
+    def jump_target(self, i: int) -> Tuple[int, int]:
+        """A neighbouring cell for a Jump command - Game wants one, the piece jumps in place."""
+        r, c = divmod(self.cell[i], self.W)
+        team = self.kind_team[self.kind[i]]
+        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < self.H and 0 <= nc < self.W:
+                j = self.at.get(nr * self.W + nc)
+                if j is None or self.kind_team[self.kind[j]] != team:
+                    return (nr, nc)
+        return (r, c)
+
+
+class BotSearch:
+    """Anytime alpha-beta: iterative deepening under a hard deadline, with a transposition table.
+
+    Each finished depth leaves the best root move, so the answer is
+    ready whenever the budget runs out (the deadline is checked every
+    64 nodes and unwinds the search at once).  The table maps the
+    position hash to (depth, value, bound, best move); it bounds and
+    orders the next iterations and is kept across decisions, cleared
+    when it grows past `tt_size` entries.
+    """
+
+    def __init__(self, tt_size: int = 1 << 18):
+        self.tt: Dict[int, tuple] = {}
+        self.tt_size = tt_size
+        self.nodes = 0
+        self.tt_hits = 0
+        self.deadline = 0.0
+
+    def search(self, pos: BotPosition, budget_ms: float, max_depth: int = 32):
+        """Best action for the side to move within `budget_ms`; returns (action, info)."""
+        began = time.perf_counter()
+        self.deadline = began + budget_ms / 1000.0
+        self.nodes = self.tt_hits = 0
+        if len(self.tt) > self.tt_size:
+            self.tt.clear()
+
+        best_action, best_value, depth_done = None, 0, 0
+        for depth in range(1, max_depth + 1):
+            try:
+                action, value = self._root(pos, depth, best_action)
+            except _SearchTimeout as timeout:
+                # עומק חלקי: המהלך הקודם נבדק ראשון, כל מהלך שעקף אותו טוב יותר
+                if timeout.args and timeout.args[0] is not None:
+                    best_action, best_value = timeout.args
+                break
+            best_action, best_value, depth_done = action, value, depth
+            if abs(value) >= WIN_SCORE:
+                break
+        return best_action, {"depth": depth_done, "score": best_value, "nodes": self.nodes,
+                             "tt_hits": self.tt_hits, "tt_size": len(self.tt),
+                             "ms": (time.perf_counter() - began) * 1000}
+
+    def _root(self, pos: BotPosition, depth: int, previous):
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_action, best_value = None, -WIN_SCORE - 1
+        for action in pos.actions(previous):
+            undo = pos.make(action)
+            try:
+                value = -self._negamax(pos, depth - 1, -beta, -alpha)
+            except _SearchTimeout:
+                pos.unmake(undo)
+                raise _SearchTimeout(best_action, best_value)
+            pos.unmake(undo)
+            if value > best_value:
+                best_action, best_value = action, value
+            alpha = max(alpha, value)
+        self.tt[pos.hash] = (depth, best_value, EXACT, best_action)
+        return best_action, best_value
+
+    def _negamax(self, pos: BotPosition, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        if not self.nodes & 63 and time.perf_counter() > self.deadline:
+            raise _SearchTimeout(None)
+        if pos.is_over():
+            return WIN_SCORE if pos.score[pos.side] else -WIN_SCORE
+        if depth == 0:
+            return pos.evaluate()
+
+        alpha_in = alpha
+        first = None
+        entry = self.tt.get(pos.hash)
+        if entry is not None:
+            entry_depth, value, bound, first = entry
+            if entry_depth >= depth:
+                self.tt_hits += 1
+                if bound == EXACT:
+                    return value
+                if bound == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        best_action, best_value = None, -WIN_SCORE - 1
+        for action in pos.actions(first):
+            undo = pos.make(action)
+            try:
+                value = -self._negamax(pos, depth - 1, -beta, -alpha)
+            finally:
+                pos.unmake(undo)
+            if value > best_value:
+                best_action, best_value = action, value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+        bound = UPPER if best_value <= alpha_in else LOWER if best_value >= beta else EXACT
+        self.tt[pos.hash] = (depth, best_value, bound, best_action)
+        return best_value
+
+
+def _bot_main(conn, setup: dict, quiet: bool):
+    """Worker process: answers ("search", ...) requests until ("stop",) or the pipe closes."""
+    dims = tuple(setup["dims"])
+    tables = [MoveTable(rules, dims) for rules in setup["rules"]]
+    searcher = BotSearch(setup.get("tt_size", 1 << 18))
+    devnull = open(os.devnull, "w") if quiet else None
+    with contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext():
+        try:
+            while True:
+                message = conn.recv()
+                if message[0] != "search":
+                    break
+                _, request_id, now_ms, side, budget_ms, pieces = message
+                pos = BotPosition(dims, tables, setup["kinds"], setup["timing"], pieces,
+                                  now_ms, side, setup["ply_ms"])
+                action, info = searcher.search(pos, budget_ms)
+                move = None
+                if action is not None:
+                    i, target, is_jump = action
+                    from_cell = divmod(pos.cell[i], pos.W)
+                    to_cell = pos.jump_target(i) if is_jump else divmod(target, pos.W)
+                    move = (pos.ids[i], from_cell, to_cell, is_jump)
+                conn.send(("move", request_id, move, info))
+        except (EOFError, OSError, KeyboardInterrupt):
+            pass  # המשחק נסגר - אין למי לענות
+    if devnull is not None:
+        devnull.close()
+
+
+class BotPlayer:
+    """Computer opponent for one team; thinks in a worker process, moves like a player.
+
+    Every `every_ms` of game time, if one of its pieces is ready, the
+    game thread sends a compact snapshot (piece id, kind, cell, cooldown
+    end, last move time) down a Pipe and goes on ticking; the worker runs
+    BotSearch for at most `think_ms` and sends back one move.  ``on_tick``
+    only polls the pipe, so the search never takes frame time.  The reply
+    is re-checked against the live game by ``Game._attempt_move`` (the
+    piece must still stand where the bot saw it), which puts the
+    Command on ``user_input_queue`` exactly as a key press would.
+    """
+
+    def __init__(self, team: int, think_ms: float = 150, every_ms: int = 250, ply_ms: int = 250,
+                 quiet: bool = True):
+        self.team = team
+        self.think_ms = think_ms
+        self.every_ms = every_ms
+        self.ply_ms = ply_ms
+        self.quiet = quiet
+        self.kinds: Dict[Tuple[int, str], int] = {}
+        self.decisions = 0
+        self.submitted = 0
+        self.stale = 0
+        self.depths: List[int] = []
+        self.think_times: List[float] = []
+        self._ids = itertools.count()
+        self._conn = None
+        self._proc: Optional[multiprocessing.Process] = None
+        self._waiting = False
+        self._next_ms = 0
+
+    # ------------------------------------------------------------ lifecycle
+    def start(self, game):
+        """Spawn the worker with the move rules and timing of the game's piece kinds."""
+        if self._proc is not None:
+            return
+        rules = []
+        for piece in game.pieces:
+            key = (piece.team, getattr(piece, 'piece_type', ""))
+            if key not in self.kinds:
+                self.kinds[key] = len(rules)
+                rules.append(list(piece.current_state.moves.rules))
+        setup = {"dims": (game.board.H_cells, game.board.W_cells), "kinds": list(self.kinds),
+                 "rules": rules, "ply_ms": self.ply_ms,
+                 "timing": {"move_cooldown_ms": game.MOVE_COOLDOWN_MS,
+                            "jump_cooldown_ms": game.JUMP_COOLDOWN_MS,
+                            "jump_air_ms": game.JUMP_AIR_MS}}
+        ctx = multiprocessing.get_context()
+        parent, child = ctx.Pipe()
+        self._proc = ctx.Process(target=_bot_main, name=f"bot-team-{self.team}", daemon=True,
+                                 args=(child, setup, self.quiet))
+        self._proc.start()
+        child.close()
+        self._conn = parent
+
+    def stop(self, timeout: float = 1.0):
+        if self._proc is None:
+            return
+        try:
+            self._conn.send(("stop",))
+        except (OSError, EOFError):
+            pass
+        self._proc.join(timeout)
+        if self._proc.is_alive():
+            self._proc.terminate()
+        self._conn.close()
+        self._proc = None
+        self._waiting = False
+
+    # ------------------------------------------------------------ game thread
+    def on_tick(self, game, now_ms: int):
+        """Called by Game every tick: collect a finished decision, maybe ask for the next one."""
+        if self._proc is None:
+            self.start(game)
+        if self._waiting:
+            try:
+                if not self._conn.poll():
+                    return
+                reply = self._conn.recv()
+            except (EOFError, OSError):
+                print(f"Bot worker for team {self.team} exited, restarting")
+                self.stop()
+                return
+            self._on_reply(game, reply, now_ms)
+        if now_ms >= self._next_ms and not game.game_over:
+            self._request(game, now_ms)
+
+    def _request(self, game, now_ms: int):
+        pieces = []
+        any_ready = False
+        for piece in game.pieces:
+            kind = self.kinds.get((piece.team, getattr(piece, 'piece_type', "")))
+            if kind is None:
+                continue
+            physics = piece.current_state.physics
+            # כלי בתנועה נחשב כבר ביעד שלו
+            r, c = physics.target_cell if physics.is_moving() and physics.target_cell else physics.get_cell_pos()
+            pieces.append((piece.piece_id, kind, int(r), int(c), piece.cooldown_end_time,
+                           piece.last_move_timestamp))
+            if piece.team == self.team and piece.cooldown_end_time <= now_ms and not physics.is_moving():
+                any_ready = True
+        if not any_ready:
+            self._next_ms = now_ms + self.every_ms
+            return
+        self._conn.send(("search", next(self._ids), now_ms, self.team, self.think_ms, tuple(pieces)))
+        self._waiting = True
+
+    def _on_reply(self, game, reply, now_ms: int):
+        _, _, move, info = reply
+        self._waiting = False
+        self._next_ms = now_ms + self.every_ms
+        self.decisions += 1
+        self.depths.append(info["depth"])
+        self.think_times.append(info["ms"])
+        if move is None:
+            return  # הכי טוב לחכות
+        piece_id, from_cell, to_cell, is_jump = move
+        piece = next((p for p in game.pieces if p.piece_id == piece_id), None)
+        if piece is None or piece.current_state.physics.get_cell_pos() != tuple(from_cell):
+            self.stale += 1  # הלוח השתנה בזמן החיפוש
+            return
+        if game._attempt_move(piece, list(to_cell), is_jump, now_ms):
+            self.submitted += 1
+
+    def stats(self) -> dict:
+        times = sorted(self.think_times)
+        return {"decisions": self.decisions, "submitted": self.submitted, "stale": self.stale,
+                "mean_depth": sum(self.depths) / len(self.depths) if self.depths else 0.0,
+                "think_p50_ms": times[len(times) // 2] if times else 0.0,
+                "think_max_ms": times[-1] if times else 0.0}
@@ -1,21 +1,148 @@
 # bus.py
+import queue
+import sys
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
 
 class Event:
-    def __init__(self, name, data):
-        self.name = name
+    __slots__ = ("name", "data", "keys")
+
+    def __init__(self, name, data, keys: Tuple[Hashable, ...] = ()):
+        self.name = sys.intern(name)
         self.data = data
+        # מפתחות למנויים ממוקדים - למשל piece_id או קבוצה
+        self.keys = keys
 
 
 class EventBus:
-    def __init__(self):
-        self.subscribers = {}
+    """Publish/subscribe hub with optional queued dispatch.
+
+    Handlers are indexed by ``(event name, key)``; ``key=None`` means
+    "every event of that name".  An event only reaches the handlers of its
+    name and of the keys it carries, so publishing costs O(matching
+    handlers) rather than O(subscribers).
+
+    Until ``start()`` is called, ``publish`` runs the handlers immediately
+    (the original behaviour).  After ``start()`` events are collected into
+    a per-tick batch; ``flush()`` hands the batch to a bounded queue and a
+    background dispatcher thread runs the handlers, so a slow subscriber
+    never stalls the frame loop.  When the queue is full, ``overflow``
+    decides: ``"drop_oldest"``, ``"drop_newest"`` or ``"block"``.
+    """
+
+    OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+    def __init__(self, max_queue: int = 256, overflow: str = "drop_oldest"):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.subscribers: Dict[Tuple[str, Optional[Hashable]], List[Callable]] = {}
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.dropped_events = 0
+        self._batch: List[Event] = []
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------ subscriptions
+    def subscribe(self, event_name, handler, key: Optional[Hashable] = None):
+        with self._lock:
+            self.subscribers.setdefault((event_name, key), []).append(handler)
+
+    def unsubscribe(self, event_name, handler, key: Optional[Hashable] = None):
+        with self._lock:
+            handlers = self.subscribers.get((event_name, key))
+            if handlers and handler in handlers:
+                handlers.remove(handler)
+                if not handlers:
+                    del self.subscribers[(event_name, key)]
 
-    def subscribe(self, event_name, handler):
-        if event_name not in self.subscribers:
-            self.subscribers[event_name] = []
-        self.subscribers[event_name].append(handler)
+    def _handlers_for(self, event: Event) -> List[Callable]:
+        handlers = list(self.subscribers.get((event.name, None), ()))
+        for key in event.keys:
+            handlers.extend(self.subscribers.get((event.name, key), ()))
+        return handlers
+
+    # ------------------------------------------------------------ publishing
+    @property
+    def is_async(self) -> bool:
+        return self._thread is not None
 
     def publish(self, event: Event):
-        handlers = self.subscribers.get(event.name, [])
-        for handler in handlers:
-            handler(event)
+        if self._thread is None:
+            self._dispatch(event)
+        else:
+            self._batch.append(event)
+
+    def flush(self):
+        """Hand the events published since the last flush to the dispatcher (once per tick)."""
+        if self._thread is None or not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        if self.overflow == "block":
+            self._queue.put(batch)
+            return
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            if self.overflow == "drop_newest":
+                self.dropped_events += len(batch)
+                return
+            # drop_oldest - מפנים מקום לאצווה החדשה
+            try:
+                self.dropped_events += len(self._queue.get_nowait())
+                self._queue.task_done()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(batch)
+            except queue.Full:
+                self.dropped_events += len(batch)
+
+    def pending(self) -> int:
+        """Batches waiting for the dispatcher thread."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    # ------------------------------------------------------------ dispatcher
+    def start(self):
+        """Switch to queued dispatch on a background thread."""
+        if self._thread is not None:
+            return
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._thread = threading.Thread(target=self._dispatch_loop, name="EventBus", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Deliver what is already queued, then stop the dispatcher and go back to direct dispatch."""
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+        self._queue = None
+
+    def join(self):
+        """Block until every flushed batch has been handled."""
+        if self._queue is not None:
+            self._queue.join()
+
+    def _dispatch_loop(self):
+        q = self._queue
+        while True:
+            batch = q.get()
+            try:
+                if batch is None:
+                    return
+                for event in batch:
+                    self._dispatch(event)
+            finally:
+                q.task_done()
+
+    def _dispatch(self, event: Event):
+        for handler in self._handlers_for(event):
+            try:
+                handler(event)
+            except Exception as e:
+                print(f"Error in handler for {event.name}: {e}")
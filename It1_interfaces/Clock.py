@@ -0,0 +1,31 @@
+import time
+
+
+class WallClock:
+    """Real time: milliseconds since the first call (time.perf_counter)."""
+
+    def __init__(self):
+        self.start_time = None
+
+    def now_ms(self) -> int:
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+            return 0
+        return int((time.perf_counter() - self.start_time) * 1000)
+
+
+class ManualClock:
+    """Simulated time that only moves when advanced - for headless runs and tests."""
+
+    def __init__(self, start_ms: int = 0):
+        self.current_ms = start_ms
+
+    def now_ms(self) -> int:
+        return self.current_ms
+
+    def advance(self, dt_ms: int) -> int:
+        self.current_ms += dt_ms
+        return self.current_ms
+
+    def set(self, now_ms: int):
+        self.current_ms = now_ms
@@ -0,0 +1,198 @@
+import heapq
+import itertools
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class Trajectory:
+    """Straight slide from `from_cell` (at start_ms) to `to_cell` (at end_ms), then rest there."""
+
+    def __init__(self, start_ms: float, from_cell: Tuple[float, float],
+                 end_ms: float, to_cell: Tuple[float, float]):
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.from_cell = (float(from_cell[0]), float(from_cell[1]))
+        self.to_cell = (float(to_cell[0]), float(to_cell[1]))
+
+    @classmethod
+    def resting(cls, cell: Tuple[int, int], since_ms: float = 0) -> "Trajectory":
+        return cls(since_ms, cell, since_ms, cell)
+
+    def pos(self, t: float) -> Tuple[float, float]:
+        if t >= self.end_ms or self.end_ms <= self.start_ms:
+            return self.to_cell
+        ratio = max(0.0, (t - self.start_ms) / (self.end_ms - self.start_ms))
+        (r1, c1), (r2, c2) = self.from_cell, self.to_cell
+        return (r1 + (r2 - r1) * ratio, c1 + (c2 - c1) * ratio)
+
+    def cell(self, t: float) -> Tuple[int, int]:
+        r, c = self.pos(t)
+        return (round(r), round(c))
+
+    def bbox_cells(self):
+        (r1, c1), (r2, c2) = self.from_cell, self.to_cell
+        for r in range(math.floor(min(r1, r2)), math.ceil(max(r1, r2)) + 1):
+            for c in range(math.floor(min(c1, c2)), math.ceil(max(c1, c2)) + 1):
+                yield (r, c)
+
+
+class CollisionPredictor:
+    """Schedules collisions from known slide trajectories instead of polling every frame.
+
+    Every piece has a trajectory: a resting position, or the straight
+    slide `Physics` computed when its command was accepted.  When a
+    trajectory changes, the first contact time with every piece that can
+    be reached (movers, and resting pieces inside the swept box) is
+    solved analytically and pushed on a priority queue.  ``pop_due`` only
+    looks at the head of the queue, so a frame with nothing about to
+    collide costs nothing.  Stale events (a piece moved again or was
+    captured) are dropped by version number when popped.
+    """
+
+    # שני כלים "באותה משבצת" כשהמרחק בכל ציר קטן מחצי משבצת
+    CONTACT = 0.5
+
+    def __init__(self):
+        self._traj: Dict[object, Trajectory] = {}
+        self._version: Dict[object, int] = {}
+        self._jump_until: Dict[object, float] = {}
+        self._resting: Dict[Tuple[int, int], Set[object]] = {}
+        self._resting_cell: Dict[object, Tuple[int, int]] = {}
+        self._active: Set[object] = set()
+        self._arrivals: List[tuple] = []
+        self._events: List[tuple] = []
+        self._seq = itertools.count()
+
+    # ------------------------------------------------------------ tracking
+    def add(self, piece, cell: Tuple[int, int], now_ms: float = 0):
+        """Start tracking a piece resting on `cell`."""
+        self._version[piece] = self._version.get(piece, 0) + 1
+        self._traj[piece] = Trajectory.resting(cell, now_ms)
+        self._set_resting(piece, tuple(cell))
+
+    def remove(self, piece):
+        """Stop tracking a piece (captured); its pending events become stale."""
+        self._unset_resting(piece)
+        self._active.discard(piece)
+        self._traj.pop(piece, None)
+        self._jump_until.pop(piece, None)
+        self._version[piece] = self._version.get(piece, 0) + 1
+
+    def on_move(self, piece, from_cell, to_cell, start_ms: float, duration_ms: float):
+        """A slide was accepted: replace the piece's trajectory and schedule its contacts."""
+        if piece not in self._traj:
+            return
+        self._version[piece] += 1
+        self._unset_resting(piece)
+        traj = Trajectory(start_ms, from_cell, start_ms + (duration_ms or 0), to_cell)
+        self._traj[piece] = traj
+        self._active.add(piece)
+        heapq.heappush(self._arrivals, (traj.end_ms, next(self._seq), piece, self._version[piece]))
+        self._schedule(piece, start_ms)
+
+    def on_jump(self, piece, until_ms: float):
+        """The piece is in the air (cannot collide) until `until_ms`."""
+        if piece not in self._traj:
+            return
+        self._jump_until[piece] = until_ms
+        self._push(until_ms, "land", piece, None)
+
+    def jump_until(self, piece) -> float:
+        return self._jump_until.get(piece, 0)
+
+    def cell_at(self, piece, t: float) -> Optional[Tuple[int, int]]:
+        traj = self._traj.get(piece)
+        return traj.cell(t) if traj is not None else None
+
+    def pending(self) -> int:
+        return len(self._events)
+
+    def next_event_ms(self) -> Optional[float]:
+        """Time of the earliest queued event (it may turn out stale when popped), or None."""
+        return self._events[0][0] if self._events else None
+
+    # ------------------------------------------------------------ events
+    def pop_due(self, now_ms: float) -> List[Tuple[float, str, object, object]]:
+        """Pop every still-valid event with time <= now_ms, in time order."""
+        while self._arrivals and self._arrivals[0][0] <= now_ms:
+            _, _, piece, version = heapq.heappop(self._arrivals)
+            if self._version.get(piece) == version:
+                self._active.discard(piece)
+                self._set_resting(piece, self._traj[piece].cell(math.inf))
+
+        due = []
+        while self._events and self._events[0][0] <= now_ms:
+            t, _, kind, a, va, b, vb = heapq.heappop(self._events)
+            if self._version.get(a) != va or a not in self._traj:
+                continue
+            if b is not None and (self._version.get(b) != vb or b not in self._traj):
+                continue
+            due.append((t, kind, a, b))
+        return due
+
+    def reschedule_pair(self, a, b, after_ms: float):
+        """Look for the next contact of a and b at or after `after_ms` (e.g. once a jump lands)."""
+        if a in self._traj and b in self._traj:
+            t = self._first_contact(self._traj[a], self._traj[b], after_ms)
+            if t is not None:
+                self._push(t, "collision", a, b)
+
+    # ---------------------------------------------------------- internals
+    def _push(self, t: float, kind: str, a, b):
+        heapq.heappush(self._events, (t, next(self._seq), kind,
+                                      a, self._version[a],
+                                      b, self._version[b] if b is not None else None))
+
+    def _set_resting(self, piece, cell: Tuple[int, int]):
+        self._unset_resting(piece)
+        self._resting.setdefault(cell, set()).add(piece)
+        self._resting_cell[piece] = cell
+
+    def _unset_resting(self, piece):
+        cell = self._resting_cell.pop(piece, None)
+        if cell is not None:
+            occupants = self._resting.get(cell)
+            if occupants is not None:
+                occupants.discard(piece)
+                if not occupants:
+                    del self._resting[cell]
+
+    def _schedule(self, piece, t_min: float):
+        traj = self._traj[piece]
+        candidates = set(self._active)
+        for cell in traj.bbox_cells():
+            candidates.update(self._resting.get(cell, ()))
+        candidates.discard(piece)
+        for other in candidates:
+            t = self._first_contact(traj, self._traj[other], t_min)
+            if t is not None:
+                self._push(t, "collision", piece, other)
+
+    def _first_contact(self, a: Trajectory, b: Trajectory, t_min: float) -> Optional[float]:
+        """Earliest t >= t_min where |a - b| < CONTACT on both axes (piecewise-linear solve)."""
+        breaks = sorted({t for t in (a.end_ms, b.end_ms) if t > t_min})
+        bounds = [t_min] + breaks + [math.inf]
+        for seg_start, seg_end in zip(bounds, bounds[1:]):
+            ar, ac = a.pos(seg_start)
+            br, bc = b.pos(seg_start)
+            if seg_end == math.inf:
+                vr = vc = 0.0
+            else:
+                er, ec = a.pos(seg_end)
+                fr, fc = b.pos(seg_end)
+                span = seg_end - seg_start
+                vr = ((er - fr) - (ar - br)) / span
+                vc = ((ec - fc) - (ac - bc)) / span
+            lo, hi = seg_start, seg_end
+            for x0, v in ((ar - br, vr), (ac - bc, vc)):
+                if v == 0:
+                    if abs(x0) >= self.CONTACT:
+                        lo, hi = math.inf, -math.inf
+                        break
+                    continue
+                t1 = seg_start + (-self.CONTACT - x0) / v
+                t2 = seg_start + (self.CONTACT - x0) / v
+                lo, hi = max(lo, min(t1, t2)), min(hi, max(t1, t2))
+            if lo < hi:
+                return lo
+        return None
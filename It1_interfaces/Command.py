@@ -1,12 +1,20 @@
+import sys
 from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Command:
     timestamp: int          # ms since game start
     piece_id: str
     type: str               # "Move" | "Jump" | …
-    params: List            # payload (e.g. ["e2", "e4"]) 
+    params: Tuple           # payload (e.g. ((1, 4), (3, 4)) - from/to cells as (row, col))
+
+    def __post_init__(self):
+        # מזהים חוזרים נשמרים פעם אחת בזיכרון; params כטופל קבוע
+        self.piece_id = sys.intern(self.piece_id)
+        self.type = sys.intern(self.type)
+        self.params = tuple(self.params)
+
 
 def is_movement_command(self) -> bool:
     """בדיקה האם זו פקודת תנועה"""
@@ -0,0 +1,440 @@
+import bisect
+import lzma
+import pathlib
+import struct
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from Command import Command
+
+MAGIC = b"CTDLOG\x01"
+CODECS = {"none": 0, "zlib": 1, "lzma": 2}
+
+_FILE_HEADER = struct.Struct("<7sBd")      # magic, codec, tick_ms
+_BLOCK_HEADER = struct.Struct("<IIqqB")    # stored bytes, raw bytes, first ms, last ms, flags
+_RECORD_HEADER = struct.Struct("<BI")      # kind, body length
+_COMMAND = struct.Struct("<qq")            # tick in which it was applied, command timestamp
+_KEYFRAME = struct.Struct("<qqH")          # tick ms, tick index, piece count
+# pos, prev_pos, from_cell, target, start, duration, cooldown start/duration, state,
+# capture flags, is_jumping, team, cooldown_end, jump_end, last_move
+_PIECE = struct.Struct("<12dBBBBBqqq")
+
+RECORD_COMMAND = 1
+RECORD_KEYFRAME = 2
+BLOCK_KEYFRAME = 1
+
+
+def _compress(codec: int, raw: bytes) -> bytes:
+    if codec == 1:
+        return zlib.compress(raw, 6)
+    if codec == 2:
+        return lzma.compress(raw)
+    return raw
+
+
+def _decompress(codec: int, stored: bytes) -> bytes:
+    if codec == 1:
+        return zlib.decompress(stored)
+    if codec == 2:
+        return lzma.decompress(stored)
+    return stored
+
+
+# ------------------------------------------------------------------ encoding
+def _pack_str(out: bytearray, s: str):
+    data = s.encode("utf-8")
+    out += struct.pack("<H", len(data))
+    out += data
+
+
+def _unpack_str(buf: bytes, at: int) -> Tuple[str, int]:
+    (n,) = struct.unpack_from("<H", buf, at)
+    at += 2
+    return buf[at:at + n].decode("utf-8"), at + n
+
+
+def _pack_value(out: bytearray, value):
+    """params payload: strings, ints, floats and nested tuples (cells are (row, col) int pairs)."""
+    if isinstance(value, str):
+        out += b"s"
+        _pack_str(out, value)
+    elif isinstance(value, bool) or isinstance(value, int):
+        out += b"i" + struct.pack("<q", int(value))
+    elif isinstance(value, float):
+        out += b"f" + struct.pack("<d", value)
+    else:
+        items = tuple(value)
+        out += b"t" + struct.pack("<H", len(items))
+        for item in items:
+            _pack_value(out, item)
+
+
+def _unpack_value(buf: bytes, at: int):
+    tag = buf[at:at + 1]
+    at += 1
+    if tag == b"s":
+        return _unpack_str(buf, at)
+    if tag == b"i":
+        return struct.unpack_from("<q", buf, at)[0], at + 8
+    if tag == b"f":
+        return struct.unpack_from("<d", buf, at)[0], at + 8
+    (n,) = struct.unpack_from("<H", buf, at)
+    at += 2
+    items = []
+    for _ in range(n):
+        item, at = _unpack_value(buf, at)
+        items.append(item)
+    return tuple(items), at
+
+
+def encode_command(applied_ms: int, cmd: Command) -> bytes:
+    out = bytearray(_COMMAND.pack(applied_ms, cmd.timestamp))
+    _pack_str(out, cmd.piece_id)
+    _pack_str(out, cmd.type)
+    _pack_value(out, cmd.params)
+    return bytes(out)
+
+
+def decode_command(body: bytes) -> Tuple[int, Command]:
+    applied_ms, timestamp = _COMMAND.unpack_from(body, 0)
+    at = _COMMAND.size
+    piece_id, at = _unpack_str(body, at)
+    cmd_type, at = _unpack_str(body, at)
+    params, at = _unpack_value(body, at)
+    return applied_ms, Command(timestamp, piece_id, cmd_type, params)
+
+
+class PieceSnapshot:
+    """Everything the simulation needs to put one piece back where it was."""
+
+    __slots__ = ("piece_id", "code", "team", "row", "is_jumping", "cooldown_end_time",
+                 "jump_end_time", "last_move_timestamp", "can_be_captured", "can_capture")
+
+    def __init__(self, piece_id: str, code: str, team: int, row: Tuple[float, ...],
+                 is_jumping: bool, cooldown_end_time: int, jump_end_time: int,
+                 last_move_timestamp: int, can_be_captured: bool = True, can_capture: bool = True):
+        self.piece_id = piece_id
+        self.code = code              # סוג הכלי אצל PieceFactory, למשל "QW"
+        self.team = team
+        self.row = row                # שורת PhysicsWorld: 12 מספרים + קוד מצב
+        self.is_jumping = is_jumping
+        self.cooldown_end_time = cooldown_end_time
+        self.jump_end_time = jump_end_time
+        self.last_move_timestamp = last_move_timestamp
+        self.can_be_captured = can_be_captured
+        self.can_capture = can_capture
+
+    @property
+    def cell(self) -> Tuple[int, int]:
+        return (int(round(self.row[0])), int(round(self.row[1])))
+
+
+class Keyframe:
+    __slots__ = ("time_ms", "tick_index", "pieces")
+
+    def __init__(self, time_ms: int, tick_index: int, pieces: List[PieceSnapshot]):
+        self.time_ms = time_ms
+        self.tick_index = tick_index
+        self.pieces = pieces
+
+
+def snapshot_game(game, now_ms: int, tick_index: int) -> Keyframe:
+    pieces = []
+    for piece in game.pieces:
+        physics = piece.current_state.physics
+        world, i = physics.world, physics.index
+        row = (tuple(world.pos[i]) + tuple(world.prev_pos[i]) + tuple(world.from_cell[i])
+               + tuple(world.target[i]) + (world.start_ms[i], world.duration_ms[i],
+                                           world.cooldown_start_ms[i], world.cooldown_duration_ms[i],
+                                           int(world.state[i])))
+        pieces.append(PieceSnapshot(
+            piece.piece_id, piece.piece_id.rsplit("_", 1)[0], piece.team, row,
+            piece.is_jumping, piece.cooldown_end_time, piece.jump_end_time,
+            piece.last_move_timestamp, physics.can_be_captured_flag, physics.can_capture_flag))
+    return Keyframe(now_ms, tick_index, pieces)
+
+
+def encode_keyframe(keyframe: Keyframe) -> bytes:
+    out = bytearray(_KEYFRAME.pack(keyframe.time_ms, keyframe.tick_index, len(keyframe.pieces)))
+    for p in keyframe.pieces:
+        _pack_str(out, p.piece_id)
+        _pack_str(out, p.code)
+        out += _PIECE.pack(*(float(v) for v in p.row[:12]), int(p.row[12]),
+                           p.can_be_captured, p.can_capture, p.is_jumping, p.team,
+                           int(p.cooldown_end_time), int(p.jump_end_time),
+                           int(p.last_move_timestamp))
+    return bytes(out)
+
+
+def decode_keyframe(body: bytes) -> Keyframe:
+    time_ms, tick_index, count = _KEYFRAME.unpack_from(body, 0)
+    at = _KEYFRAME.size
+    pieces = []
+    for _ in range(count):
+        piece_id, at = _unpack_str(body, at)
+        code, at = _unpack_str(body, at)
+        values = _PIECE.unpack_from(body, at)
+        at += _PIECE.size
+        row = values[:13]
+        can_be_captured, can_capture, is_jumping, team, cooldown_end, jump_end, last_move = values[13:]
+        pieces.append(PieceSnapshot(piece_id, code, team, row, bool(is_jumping), cooldown_end,
+                                    jump_end, last_move, bool(can_be_captured), bool(can_capture)))
+    return Keyframe(time_ms, tick_index, pieces)
+
+
+# ------------------------------------------------------------------ writer
+class CommandLogWriter:
+    """Append-only log of every command the game applied, plus periodic keyframes.
+
+    Records are length-prefixed and grouped into blocks that are
+    compressed as a unit (``codec``: "none", "zlib" or "lzma").  Every
+    keyframe starts a new block, so a reader can jump straight to the
+    block of the nearest keyframe without decompressing anything before
+    it.  Attach it with ``game.command_log = CommandLogWriter(path)``.
+    """
+
+    def __init__(self, path, codec: str = "zlib", keyframe_interval_ms: int = 5000,
+                 tick_ms: float = 1000.0 / 60, block_bytes: int = 64 * 1024):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec}")
+        self.path = pathlib.Path(path)
+        self.codec = CODECS[codec]
+        self.keyframe_interval_ms = keyframe_interval_ms
+        self.block_bytes = block_bytes
+        self._file = open(self.path, "wb")
+        self._file.write(_FILE_HEADER.pack(MAGIC, self.codec, tick_ms))
+        self._buffer = bytearray()
+        self._block_flags = 0
+        self._first_ms: Optional[int] = None
+        self._last_ms = 0
+        self._last_keyframe_ms: Optional[int] = None
+        self.commands_written = 0
+        self.keyframes_written = 0
+
+    def _append(self, kind: int, time_ms: int, body: bytes):
+        if self._first_ms is None:
+            self._first_ms = time_ms
+        self._last_ms = time_ms
+        self._buffer += _RECORD_HEADER.pack(kind, len(body))
+        self._buffer += body
+        if len(self._buffer) >= self.block_bytes:
+            self.flush()
+
+    def write_command(self, applied_ms: int, cmd: Command):
+        """Record a command applied during the tick at `applied_ms`."""
+        self._append(RECORD_COMMAND, applied_ms, encode_command(applied_ms, cmd))
+        self.commands_written += 1
+
+    def write_keyframe(self, keyframe: Keyframe):
+        self.flush()
+        self._block_flags = BLOCK_KEYFRAME
+        self._append(RECORD_KEYFRAME, keyframe.time_ms, encode_keyframe(keyframe))
+        self._last_keyframe_ms = keyframe.time_ms
+        self.keyframes_written += 1
+
+    def on_tick(self, game, now_ms: int, tick_index: int):
+        """Called by Game at the end of every tick; writes a keyframe when one is due."""
+        if self._last_keyframe_ms is None or now_ms - self._last_keyframe_ms >= self.keyframe_interval_ms:
+            self.write_keyframe(snapshot_game(game, now_ms, tick_index))
+
+    def flush(self):
+        if not self._buffer:
+            return
+        raw = bytes(self._buffer)
+        stored = _compress(self.codec, raw)
+        self._file.write(_BLOCK_HEADER.pack(len(stored), len(raw), self._first_ms,
+                                            self._last_ms, self._block_flags))
+        self._file.write(stored)
+        self._file.flush()
+        self._buffer.clear()
+        self._block_flags = 0
+        self._first_ms = None
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+# ------------------------------------------------------------------ reader
+class CommandLogReader:
+    """Reads a command log; opening it only scans block headers (no decompression)."""
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        with open(self.path, "rb") as f:
+            magic, self.codec, self.tick_ms = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a command log")
+            # (offset of the stored bytes, stored length, first ms, last ms, flags)
+            self.blocks: List[Tuple[int, int, int, int, int]] = []
+            while True:
+                header = f.read(_BLOCK_HEADER.size)
+                if len(header) < _BLOCK_HEADER.size:
+                    break  # סוף הקובץ (או בלוק שנקטע בקריסה)
+                stored_len, _, first_ms, last_ms, flags = _BLOCK_HEADER.unpack(header)
+                offset = f.tell()
+                if offset + stored_len > self.path.stat().st_size:
+                    break
+                self.blocks.append((offset, stored_len, first_ms, last_ms, flags))
+                f.seek(stored_len, 1)
+        self._keyframe_blocks = [i for i, b in enumerate(self.blocks) if b[4] & BLOCK_KEYFRAME]
+        self._keyframe_times = [self.blocks[i][2] for i in self._keyframe_blocks]
+
+    @property
+    def end_ms(self) -> int:
+        return self.blocks[-1][3] if self.blocks else 0
+
+    def records(self, from_block: int = 0) -> Iterator[Tuple[int, object]]:
+        """Yield (kind, Command-with-applied-ms or Keyframe) from `from_block` on."""
+        with open(self.path, "rb") as f:
+            for offset, stored_len, _, _, _ in self.blocks[from_block:]:
+                f.seek(offset)
+                raw = _decompress(self.codec, f.read(stored_len))
+                at = 0
+                while at < len(raw):
+                    kind, length = _RECORD_HEADER.unpack_from(raw, at)
+                    at += _RECORD_HEADER.size
+                    body = raw[at:at + length]
+                    at += length
+                    if kind == RECORD_COMMAND:
+                        yield kind, decode_command(body)
+                    elif kind == RECORD_KEYFRAME:
+                        yield kind, decode_keyframe(body)
+
+    def commands(self) -> Iterator[Tuple[int, Command]]:
+        for kind, record in self.records():
+            if kind == RECORD_COMMAND:
+                yield record
+
+    def keyframe_block_before(self, time_ms: int) -> Optional[int]:
+        """Index of the block holding the last keyframe at or before `time_ms` (binary search)."""
+        i = bisect.bisect_right(self._keyframe_times, time_ms) - 1
+        return self._keyframe_blocks[i] if i >= 0 else None
+
+
+# ------------------------------------------------------------------ replay
+def restore_keyframe(game, keyframe: Keyframe):
+    """Put the pieces of a freshly built game into the state recorded in `keyframe`."""
+    by_id: Dict[str, PieceSnapshot] = {p.piece_id: p for p in keyframe.pieces}
+    for piece in game.pieces:
+        snap = by_id[piece.piece_id]
+        physics = piece.current_state.physics
+        world, i = physics.world, physics.index
+        row = snap.row
+        world.pos[i] = row[0:2]
+        world.prev_pos[i] = row[2:4]
+        world.from_cell[i] = row[4:6]
+        world.target[i] = row[6:8]
+        world.start_ms[i], world.duration_ms[i] = row[8], row[9]
+        world.cooldown_start_ms[i], world.cooldown_duration_ms[i] = row[10], row[11]
+        world.state[i] = int(row[12])
+        physics.can_be_captured_flag = snap.can_be_captured
+        physics.can_capture_flag = snap.can_capture
+        piece.is_jumping = snap.is_jumping
+        piece.cooldown_end_time = snap.cooldown_end_time
+        piece.jump_end_time = snap.jump_end_time
+        piece.last_move_timestamp = snap.last_move_timestamp
+
+        # אינדקס התפוסה וחיזוי ההתנגשויות - כל הכלים נחים במשבצת שלהם
+        slot = game.occupancy.slot_of(piece)
+        game.collisions.remove(piece)
+        game.collisions.add(piece, physics.get_cell_pos(), keyframe.time_ms)
+        if physics.is_moving() and physics.target_cell is not None:
+            game.occupancy.vacate(slot)
+        else:
+            game.occupancy.move(slot, physics.get_cell_pos())
+
+    # מעבר שני: ההחלקות והקפיצות - רק אחרי שכל הכלים במקום, אחרת add() של כלי
+    # מאוחר יותר בלולאה מיישן מגעים שכבר תוזמנו מולו
+    for piece in game.pieces:
+        physics = piece.current_state.physics
+        if physics.is_moving() and physics.target_cell is not None:
+            game.collisions.on_move(piece, physics.move_from_cell, physics.target_cell,
+                                    physics.start_time_ms, physics.duration_ms)
+        if piece.is_jumping and piece.jump_end_time > keyframe.time_ms:
+            game.collisions.on_jump(piece, piece.jump_end_time)
+
+
+class Replay:
+    """Seekable re-simulation of a command log on a HeadlessEngine.
+
+    ``seek(t)`` binary-searches the nearest keyframe at or before `t`,
+    rebuilds the pieces from it and re-runs only the commands logged
+    after it, on the original tick grid, as fast as the engine goes.
+    """
+
+    def __init__(self, path, piece_factory, board):
+        self.reader = CommandLogReader(path)
+        self.piece_factory = piece_factory
+        self.board = board
+
+    def _engine_from(self, keyframe: Keyframe):
+        from Clock import ManualClock
+        from HeadlessEngine import HeadlessEngine
+        from PhysicsWorld import PhysicsWorld
+
+        # עולם פיזיקה משלו - עדכון המנוע לא נוגע בכלים של משחקים אחרים
+        world = PhysicsWorld()
+        pieces = []
+        for snap in keyframe.pieces:
+            piece = self.piece_factory.create_piece(snap.code, snap.cell, world)
+            piece.piece_id = snap.piece_id
+            pieces.append(piece)
+        engine = HeadlessEngine(pieces, self.board, ManualClock(keyframe.time_ms))
+        engine.ticks = keyframe.tick_index
+        restore_keyframe(engine.game, keyframe)
+        return engine
+
+    def _tick_at(self, engine, now_ms: int, tick_index: int):
+        engine.clock.set(now_ms)
+        engine.ticks = tick_index
+        engine.game._tick(now_ms, tick_index)
+
+    def _run_grid(self, engine, index: int, until_ms: int, inclusive: bool) -> int:
+        """Regular ticks of the original grid up to `until_ms`; returns the last tick index."""
+        tick_ms = self.reader.tick_ms
+        while True:
+            t = round((index + 1) * tick_ms)
+            if t > until_ms or (t == until_ms and not inclusive):
+                return index
+            index += 1
+            self._tick_at(engine, t, index)
+
+    def _apply_group(self, engine, index: int, applied_ms: int, commands: List[Command]) -> int:
+        """Replay one tick that applied `commands`, after the regular ticks before it."""
+        index = self._run_grid(engine, index, applied_ms, inclusive=False)
+        for cmd in commands:
+            engine.apply(cmd)
+        if round((index + 1) * self.reader.tick_ms) == applied_ms:
+            index += 1
+        self._tick_at(engine, applied_ms, index)
+        return index
+
+    def seek(self, time_ms: int):
+        """Return a HeadlessEngine whose game is in the state it had at `time_ms`."""
+        block = self.reader.keyframe_block_before(time_ms)
+        if block is None:
+            raise ValueError(f"No keyframe at or before {time_ms} ms")
+        engine = None
+        index = 0
+        group_ms, group = None, []
+        for kind, record in self.reader.records(block):
+            if engine is None:
+                engine = self._engine_from(record)
+                index = record.tick_index
+                continue
+            if kind != RECORD_COMMAND:
+                continue
+            applied_ms, cmd = record
+            if applied_ms > time_ms:
+                break
+            if applied_ms != group_ms and group:
+                index = self._apply_group(engine, index, group_ms, group)
+                group = []
+            group_ms = applied_ms
+            group.append(cmd)
+        if group:
+            index = self._apply_group(engine, index, group_ms, group)
+        self._run_grid(engine, index, time_ms, inclusive=True)
+        return engine
@@ -0,0 +1,142 @@
+import bisect
+import csv
+import io
+import json
+import math
+import pathlib
+from typing import Dict, List, Optional, Union
+
+
+class PhaseHistogram:
+    """Fixed-size log-bucketed histogram of durations (seconds).
+
+    Buckets grow geometrically from `min_s` to `max_s` with
+    `per_decade` buckets per factor of ten (12% wide at 20/decade), so
+    recording is one bisect and an increment, memory never grows, and
+    percentiles are accurate to half a bucket.
+    """
+
+    def __init__(self, min_s: float = 1e-6, max_s: float = 10.0, per_decade: int = 20):
+        decades = math.log10(max_s / min_s)
+        self.bounds = [min_s * 10 ** (i / per_decade) for i in range(int(decades * per_decade) + 1)]
+        self.counts = [0] * (len(self.bounds) + 1)  # האחרון - מעל max_s
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Duration (seconds) below which a fraction `q` of the samples fall."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                if i == 0:
+                    return self.bounds[0]
+                if i == len(self.bounds):
+                    return self.max
+                # אמצע הדלי (גאומטרי), לא יותר מהמקסימום שנמדד
+                return min(math.sqrt(self.bounds[i - 1] * self.bounds[i]), self.max)
+        return self.max
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class FrameStats:
+    """Always-on per-phase timing of the game loop.
+
+    Phases: "keyboard", "update", "commands", "collisions" (simulation
+    thread, once per tick) and "draw", "show" (render thread, once per
+    frame).  Each phase has its own histogram and is written by a single
+    thread, so recording takes no lock.  ``budget(kind, seconds, limit)``
+    counts ticks and frames that overran their period, and ``error``
+    counts exceptions that used to be only printed.  Export with
+    ``to_json`` / ``to_csv`` / ``export(path)``.
+    """
+
+    PHASES = ("keyboard", "update", "commands", "collisions", "draw", "show")
+
+    def __init__(self):
+        self.phases: Dict[str, PhaseHistogram] = {phase: PhaseHistogram() for phase in self.PHASES}
+        self.overruns: Dict[str, int] = {"tick": 0, "frame": 0}
+        self.budget_counts: Dict[str, int] = {"tick": 0, "frame": 0}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, phase: str, seconds: float):
+        self.phases[phase].record(seconds)
+
+    def budget(self, kind: str, seconds: float, limit: float):
+        """Count one tick/frame of `seconds` against its `limit` (the tick or frame period)."""
+        self.budget_counts[kind] += 1
+        if seconds > limit:
+            self.overruns[kind] += 1
+
+    def error(self, phase: str):
+        self.errors[phase] = self.errors.get(phase, 0) + 1
+
+    def reset(self):
+        for histogram in self.phases.values():
+            histogram.reset()
+        for counts in (self.overruns, self.budget_counts):
+            for kind in counts:
+                counts[kind] = 0
+        self.errors.clear()
+
+    # ------------------------------------------------------------ export
+    def summary(self) -> dict:
+        phases = {}
+        for phase, h in self.phases.items():
+            phases[phase] = {"count": h.count,
+                             "mean_ms": h.total / h.count * 1000 if h.count else 0.0,
+                             "p50_ms": h.percentile(0.50) * 1000,
+                             "p95_ms": h.percentile(0.95) * 1000,
+                             "p99_ms": h.percentile(0.99) * 1000,
+                             "max_ms": h.max * 1000}
+        return {"phases": phases,
+                "overruns": {kind: {"count": self.overruns[kind], "of": self.budget_counts[kind]}
+                             for kind in self.overruns},
+                "errors": dict(self.errors)}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.summary(), indent=indent)
+
+    def to_csv(self) -> str:
+        """One row per phase, then one per budget kind (overruns in the count column)."""
+        summary = self.summary()
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["phase", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "errors"])
+        for phase, row in summary["phases"].items():
+            writer.writerow([phase, row["count"]] + [f"{row[k]:.4f}" for k in
+                            ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")] +
+                            [summary["errors"].get(phase, 0)])
+        for kind, row in summary["overruns"].items():
+            writer.writerow([f"{kind}_overruns", row["count"], "", "", "", "", "", ""])
+        return out.getvalue()
+
+    def export(self, path: Union[str, pathlib.Path]):
+        """Write the stats to `path` - CSV for a .csv suffix, JSON otherwise."""
+        path = pathlib.Path(path)
+        path.write_text(self.to_csv() if path.suffix.lower() == ".csv" else self.to_json(),
+                        encoding="utf-8")
+
+    def overlay_rows(self) -> List[tuple]:
+        """Rows of text cells for the on-screen overlay (a single-cell row spans the width)."""
+        rows = [("phase (ms)", "p50", "p95", "p99")]
+        for phase, h in self.phases.items():
+            rows.append((phase,) + tuple(f"{h.percentile(q) * 1000:.2f}" for q in (0.50, 0.95, 0.99)))
+        rows.append((f"overruns: tick {self.overruns['tick']}  frame {self.overruns['frame']}",))
+        return rows
@@ -2,23 +2,51 @@ import inspect
 import pathlib
 import queue, threading, time, cv2, math
 from typing import List, Dict, Tuple, Optional
-from Board   import Board
+from Board   import Board, cell_name
 from Bus.bus import EventBus, Event
+from GameEvents import PieceCaptured, PieceMoved
+from Clock   import WallClock
+from CollisionPredictor import CollisionPredictor
+from FrameStats import FrameStats
 from Command import Command
-from Piece   import Piece
-from img     import Img
+from OccupancyGrid import OccupancyGrid
+from Piece   import Piece, TEAM_NONE, TEAM_WHITE, TEAM_BLACK
+from RenderSnapshot import FrameTimeline, PieceView, RenderSnapshot, SnapshotBuffer
+from Renderer import Renderer
+from Scheduler import FixedStepScheduler, FramePacer
+from SpriteCache import sprite_loader
+from HudLayers import GlyphAtlas, Layer, LayerCache, paste
+from KeyInput import CURSOR_STEPS, InputPump, KeyBindings
 
 class InvalidBoard(Exception): ...
 
 class Game:
-    def __init__(self, pieces: List[Piece], board: Board):
-        """Initialize the game with pieces, board, and optional event bus."""
+    CURSOR_COLORS = {1: (0, 255, 0), 2: (0, 0, 255)}          # ירוק לשחקן 1, אדום לשחקן 2
+    SELECTION_COLORS = {1: (0, 255, 255), 2: (255, 0, 255)}   # צהוב, מגנטה
+    MOVE_COOLDOWN_MS = 4000   # השהיה אחרי מהלך רגיל
+    JUMP_COOLDOWN_MS = 1000   # השהיה אחרי קפיצה
+    JUMP_AIR_MS = 500         # זמן באוויר - לא מתנגשים עד הנחיתה
+    JUMP_MAX_DISTANCE = 3
+
+    def __init__(self, pieces: List[Piece], board: Board, clock=None):
+        """Initialize the game with pieces, board, and optional clock (defaults to wall time)."""
         self.pieces = pieces
         self.board = board
-        self.event_bus = EventBus()
+        self.clock = clock if clock is not None else WallClock()
+        self.event_bus = EventBus()  # run() מעביר לשיגור ברקע - מאזין איטי לא עוצר את הלולאה
+        self.event_counts: Dict[str, int] = {}
+        self.command_log = None  # CommandLogWriter אופציונלי - הקלטת פקודות לשחזור
+        self.spectator = None  # SpectatorStream אופציונלי - שידור MJPEG לצופים
+        self.bots = []  # BotPlayer-ים - חושבים בתהליך נפרד, מהלכים נכנסים ל-user_input_queue
         self.user_input_queue = queue.Queue()
+        # מקשים עם זמן הלכידה - נלכדים בחוט הראשי, מטופלים בחוט הסימולציה
+        self.input_pump = InputPump()
+        self.key_bindings = KeyBindings()
         self.current_board = None
-        self.game_start_time = None
+        self.renderer = None  # נוצר בציור הראשון - מצב headless לא מקצה חוצץ תמונה
+        # שכבות טקסט מוכנות מראש (HUD, סמנים, כלי דמו) - מצוירות מחדש רק כשהערך משתנה
+        self.hud_layers = LayerCache()
+        self.countdown_glyphs = None  # GlyphAtlas לספרות ההשהיה - נבנה בשימוש הראשון
         self.window_name = "Chess Game"
         self.mouse_callback_active = False
         
@@ -28,17 +56,43 @@ class Game:
         
         # מיקומי שחקנים
         self.player1_cursor = [0, 0]  # [row, col]
-        self.player2_cursor = [7, 7]  # [row, col]
+        self.player2_cursor = [board.H_cells - 1, board.W_cells - 1]  # [row, col]
         self.player1_selected_piece = None
         self.player2_selected_piece = None
         
         # מיפוי שחקנים לצבעים
         self.player_colors = {1: "white", 2: "black"}
         
-        # FPS control
+        # FPS control - קצב ציור וקצב סימולציה קבוע נפרדים
         self.target_fps = 30
+        self.sim_hz = 60
         self.frame_time = 1.0 / self.target_fps
         self.last_frame_time = time.perf_counter()
+        self.render_alpha = 1.0  # אינטרפולציה בין הטיק הקודם לנוכחי
+        self.animate_sprites = True  # מצב headless מכבה עדכון אנימציות
+        # run(): הסימולציה מפרסמת תמונות מצב, החוט הראשי מצייר את האחרונה
+        self.snapshots = SnapshotBuffer()
+        self.frame_timeline = FrameTimeline()
+        # זמני כל שלב בלולאה (היסטוגרמות קבועות) - תמיד פעיל, שכבת תצוגה ב-'i'
+        self.frame_stats = FrameStats()
+        self.show_stats = False
+        self._stats_lines = ()
+        self._stats_refresh_at = 0.0
+        self._stop = threading.Event()
+        
+        # אינדקס תפוסה - חיפוש כלי לפי משבצת ב-O(1)
+        self.occupancy = OccupancyGrid(board.H_cells, board.W_cells)
+        # חיזוי התנגשויות ממסלולי ההחלקה - במקום סריקה בכל פריים
+        self.collisions = CollisionPredictor()
+        # מונים חיים לכל קבוצה ולכל (קבוצה, סוג) - מתעדכנים באכילה
+        self.team_counts: Dict[int, int] = {TEAM_WHITE: 0, TEAM_BLACK: 0}
+        self.type_counts: Dict[Tuple[int, str], int] = {}
+        for piece in self.pieces:
+            self._register_piece(piece)
+        
+        # עולמות הפיזיקה של הכלים - מעודכנים במעבר וקטורי אחד בכל טיק
+        self.physics_worlds = list({id(p.current_state.physics.world): p.current_state.physics.world
+                                    for p in self.pieces}.values())
         
         # הגדרת event handlers
         self._setup_event_handlers()
@@ -49,24 +103,39 @@ class Game:
         self.event_bus.subscribe("piece_captured", self._on_piece_captured)
         self.event_bus.subscribe("turn_changed", self._on_turn_changed)
 
+    def _register_piece(self, piece: Piece):
+        """Add a piece to the occupancy grid, the collision predictor and the team counters."""
+        if getattr(piece, 'team', TEAM_NONE) == TEAM_NONE:
+            piece.team = self._team_from_piece_id(piece.piece_id)
+        piece_type = getattr(piece, 'piece_type', "")
+        self.team_counts[piece.team] = self.team_counts.get(piece.team, 0) + 1
+        key = (piece.team, piece_type)
+        self.type_counts[key] = self.type_counts.get(key, 0) + 1
+        
+        physics = piece.current_state.physics
+        slot = self.occupancy.add(piece, physics.get_cell_pos())
+        physics.bind_occupancy(self.occupancy, slot)
+        self.collisions.add(piece, physics.get_cell_pos())
+
+    def _count_event(self, event: Event):
+        # ספירה בלבד - הדפסה לכל אירוע מאטה את הלולאה
+        self.event_counts[event.name] = self.event_counts.get(event.name, 0) + 1
+
     def _on_piece_moved(self, event: Event):
         """טיפול באירוע תזוזת כלי"""
-        print(f"Piece moved: {event.data['piece_id']} to {event.data['position']}")
+        self._count_event(event)
 
     def _on_piece_captured(self, event: Event):
         """טיפול באירוע אכילת כלי"""
-        print(f"Piece captured: {event.data['captured_piece']} by {event.data['capturing_piece']}")
+        self._count_event(event)
 
     def _on_turn_changed(self, event: Event):
         """טיפול באירוע החלפת תור"""
-        print(f"Turn changed to: {event.data['new_turn']}")
+        self._count_event(event)
 
     def game_time_ms(self) -> int:
         """Return the current game time in milliseconds."""
-        if self.game_start_time is None:
-            self.game_start_time = time.perf_counter()
-            return 0
-        return int((time.perf_counter() - self.game_start_time) * 1000)
+        return self.clock.now_ms()
 
     def clone_board(self) -> Board:
         return self.board.clone()
@@ -77,59 +146,40 @@ class Game:
             cv2.namedWindow(self.window_name, cv2.WINDOW_AUTOSIZE)
             self.mouse_callback_active = True
 
-    def _handle_keyboard_input(self):
-        key = cv2.waitKey(1) & 0xFF
-        key = cv2.waitKey(1) & 0xFF
-        if key == 0 or key == 224:  # אם זה מקש מיוחד
-            key = cv2.waitKey(1) & 0xFF  # קלט נוסף - הקוד האמיתי
-        if key != 255:
-            print(f"Key pressed: {key}")
+    def _cursor(self, player_num: int) -> list:
+        return self.player1_cursor if player_num == 1 else self.player2_cursor
+
+    def _handle_key(self, key: int, timestamp: Optional[int] = None) -> bool:
+        """Apply one key press through `key_bindings`; returns False when a player quits.
 
-        if key == 255:  # No key pressed
+        `timestamp` is the game time the key was captured at - moves are
+        stamped with it rather than with the time the tick handles them.
+        """
+        print(f"Key pressed: {key}")
+        binding = self.key_bindings.get(key)
+        if binding is None:
             return True
+        player_num, action = binding
 
-        # Player 1 (Arrow keys + Enter + Shift for jump)
-        if key == 82 or key == 65362:  # Up arrow (תיקון עבור מערכות שונות)
-            self.player1_cursor[0] = max(0, self.player1_cursor[0] - 1)
-        elif key == 84 or key == 65364: # Down arrow
-            self.player1_cursor[0] = min(self.board.H_cells - 1, self.player1_cursor[0] + 1)
-        elif key == 81 or key == 65361: # Left arrow
-            self.player1_cursor[1] = max(0, self.player1_cursor[1] - 1)
-        elif key == 83 or key == 65363: # Right arrow
-            self.player1_cursor[1] = min(self.board.W_cells - 1, self.player1_cursor[1] + 1)
-        elif key == 13 or key == 10:  # Enter - Regular move
-            self._handle_player_action(1, self.player1_cursor, False)
-        elif key == ord('j') or key == ord('J'):  # 'j' key for Player 1 jump
-            self._handle_player_action(1, self.player1_cursor, True)
-
-        # Player 2 (WASD + Space + 'K' for jump)
-        elif key == ord('w') or key == ord('W'):  # W
-            self.player2_cursor[0] = max(0, self.player2_cursor[0] - 1)
-        elif key == ord('s') or key == ord('S'):  # S
-            self.player2_cursor[0] = min(self.board.H_cells - 1, self.player2_cursor[0] + 1)
-        elif key == ord('a') or key == ord('A'):  # A
-            self.player2_cursor[1] = max(0, self.player2_cursor[1] - 1)
-        elif key == ord('d') or key == ord('D'):  # D
-            self.player2_cursor[1] = min(self.board.W_cells - 1, self.player2_cursor[1] + 1)
-        elif key == ord(' '):  # Space - Regular move
-            self._handle_player_action(2, self.player2_cursor, False)
-        elif key == ord('k') or key == ord('K'):  # 'k' key for Player 2 jump
-            self._handle_player_action(2, self.player2_cursor, True)
-
-        # Exit keys - always active
-        elif key == ord('q') or key == ord('Q') or key == 27:  # 'q' or ESC
+        if action == "quit":
             return False
-
-        # Key to reset selection
-        elif key == ord('r') or key == ord('R'):
+        if action == "stats":
+            self.show_stats = not self.show_stats
+        elif action == "reset":
             self.player1_selected_piece = None
             self.player2_selected_piece = None
             print("Selection reset")
-            
+        elif action in CURSOR_STEPS:
+            cursor = self._cursor(player_num)
+            d_row, d_col = CURSOR_STEPS[action]
+            cursor[0] = min(max(cursor[0] + d_row, 0), self.board.H_cells - 1)
+            cursor[1] = min(max(cursor[1] + d_col, 0), self.board.W_cells - 1)
+        elif action in ("move", "jump"):
+            self._handle_player_action(player_num, self._cursor(player_num), action == "jump", timestamp)
         return True
 
-    
-    def _handle_player_action(self, player_num: int, cursor_pos: list, is_jump: bool = False):
+    def _handle_player_action(self, player_num: int, cursor_pos: list, is_jump: bool = False,
+                              timestamp: Optional[int] = None):
         """Handle player action (select piece or move piece) - REMOVED TURN CHECK!"""
         row, col = cursor_pos
         piece_at_cursor = self._find_piece_at_cell(row, col)
@@ -145,11 +195,12 @@ class Game:
                     
                     self.player1_selected_piece = piece_at_cursor
                     print(f"Player 1 selected: {piece_at_cursor.piece_id}")
+                    self._prefetch_piece_sprites(piece_at_cursor)
                 else:
                     print("No valid piece to select at this position")
             else:
                 # ניסיון להזיז כלי
-                if self._attempt_move(self.player1_selected_piece, cursor_pos, is_jump):
+                if self._attempt_move(self.player1_selected_piece, cursor_pos, is_jump, timestamp):
                     self.player1_selected_piece = None
                 else:
                     # אם המהלך לא חוקי, בדוק אם רוצים לבחור כלי אחר
@@ -157,6 +208,7 @@ class Game:
                         if not self._is_piece_in_cooldown(piece_at_cursor):
                             self.player1_selected_piece = piece_at_cursor
                             print(f"Player 1 selected: {piece_at_cursor.piece_id}")
+                            self._prefetch_piece_sprites(piece_at_cursor)
                     else:
                         print("Invalid move!")
                         self.player1_selected_piece = None
@@ -172,11 +224,12 @@ class Game:
                     
                     self.player2_selected_piece = piece_at_cursor
                     print(f"Player 2 selected: {piece_at_cursor.piece_id}")
+                    self._prefetch_piece_sprites(piece_at_cursor)
                 else:
                     print("No valid piece to select at this position")
             else:
                 # ניסיון להזיז כלי
-                if self._attempt_move(self.player2_selected_piece, cursor_pos, is_jump):
+                if self._attempt_move(self.player2_selected_piece, cursor_pos, is_jump, timestamp):
                     self.player2_selected_piece = None
                 else:
                     # אם המהלך לא חוקי, בדוק אם רוצים לבחור כלי אחר
@@ -184,25 +237,34 @@ class Game:
                         if not self._is_piece_in_cooldown(piece_at_cursor):
                             self.player2_selected_piece = piece_at_cursor
                             print(f"Player 2 selected: {piece_at_cursor.piece_id}")
+                            self._prefetch_piece_sprites(piece_at_cursor)
                     else:
                         print("Invalid move!")
                         self.player2_selected_piece = None
 
+    def _prefetch_piece_sprites(self, piece: Piece):
+        """כלי נבחר - ספרייטי התזוזה והקפיצה מפוענחים ברקע לפני שיידרשו"""
+        try:
+            piece.current_state.prefetch(("move", "jump"))
+        except Exception as e:
+            print(f"Error prefetching sprites for {piece.piece_id}: {e}")
+
     def _is_piece_in_cooldown(self, piece: Piece) -> bool:
         """בדיקה אם הכלי במצב השהיה"""
         now_ms = self.game_time_ms()
-        return hasattr(piece, 'cooldown_end_time') and now_ms < piece.cooldown_end_time
+        return now_ms < piece.cooldown_end_time
     
-    def _attempt_move(self, piece: Piece, target_pos: list, is_jump: bool = False) -> bool:
-        """ניסיון להזיז כלי - עם תמיכה בקפיצה"""
-        now_ms = self.game_time_ms()
+    def _attempt_move(self, piece: Piece, target_pos: list, is_jump: bool = False,
+                      timestamp: Optional[int] = None) -> bool:
+        """ניסיון להזיז כלי - עם תמיכה בקפיצה (timestamp: זמן לחיצת המקש, ברירת מחדל - עכשיו)"""
+        now_ms = self.game_time_ms() if timestamp is None else timestamp
         
         if not hasattr(piece, 'current_state') or not piece.current_state or \
         not hasattr(piece.current_state, 'physics') or not piece.current_state.physics:
             print("Piece has no valid state or physics!")
             return False
             
-        if self._is_piece_in_cooldown(piece):
+        if now_ms < piece.cooldown_end_time:
             remaining_time = (piece.cooldown_end_time - now_ms) / 1000.0
             print(f"{piece.piece_id} is in cooldown, {remaining_time:.1f}s remaining!")
             return False
@@ -226,14 +288,17 @@ class Game:
         # חישוב מרחק המהלך
         distance = abs(target_row - current_row) + abs(target_col - current_col)
         
-        # הגבלת מרחק המהלך (כלי יכול לזוז רק משבצת אחת בכל כיוון)
-        if distance > 1 and not is_jump:
-            print("Regular move can only be to adjacent cell!")
-            return False
+        # מהלך רגיל - לפי טבלת המהלכים של סוג הכלי, עם חסימה ע"י כלים בדרך
+        if not is_jump:
+            table = piece.current_state.moves.compiled()
+            if not table.is_legal(current_row, current_col, target_row, target_col,
+                                  self.occupancy.bitboard):
+                print("Illegal move for this piece (or the path is blocked)!")
+                return False
         
         # עבור קפיצה, אפשר מרחק גדול יותר אבל מוגבל
-        if is_jump and distance > 3:
-            print("Jump distance too far! Maximum 3 cells.")
+        if is_jump and distance > self.JUMP_MAX_DISTANCE:
+            print(f"Jump distance too far! Maximum {self.JUMP_MAX_DISTANCE} cells.")
             return False
             
         # בדיקה אם יש כלי יריב במיקום היעד
@@ -248,98 +313,60 @@ class Game:
             else:
                 print(f"{piece.piece_id} will capture {target_piece.piece_id}.")
         
-        self._create_move_command(piece, target_pos, is_jump)
-        
-        # הגדרת זמן השהיה
-        cooldown_duration = 1000 if is_jump else 4000  # 1 שנייה לקפיצה, 4 שניות למהלך רגיל
-        piece.cooldown_end_time = now_ms + cooldown_duration
-        
-        # הגדרת timestamp למהלך (לצורך התנגשויות)
-        piece.last_move_timestamp = now_ms
+        # ההשהיה מתחילה עם הקבלה - ניסיון נוסף לפני הטיק הבא כבר נדחה
+        self._start_cooldown(piece, now_ms, is_jump)
+        self._create_move_command(piece, target_pos, is_jump, now_ms)
         
         print(f"{piece.piece_id} {'jumped' if is_jump else 'moved'} to ({target_row}, {target_col})")
         return True
 
+    @staticmethod
+    def _team_from_piece_id(piece_id: str) -> int:
+        """קבוצה לפי שם הכלי - רק לכלים שלא נוצרו ב-PieceFactory, נקרא פעם אחת ברישום"""
+        piece_id_lower = piece_id.lower()
+        if any(identifier in piece_id_lower for identifier in ["white", "w_", "_w", "light", "bw", "kw", "nw", "pw", "qw", "rw"]):
+            return TEAM_WHITE
+        if any(identifier in piece_id_lower for identifier in ["black", "b_", "_b", "dark", "bb", "kb", "nb", "pb", "qb", "rb"]):
+            return TEAM_BLACK
+        return TEAM_NONE
+
     def _can_player_control_piece(self, player_num: int, piece: Piece) -> bool:
         """בדיקה אם השחקן יכול לשלוט בכלי"""
-        piece_id_lower = piece.piece_id.lower()
-        
-        if player_num == 1:  # שחקן לבן
-            return any(identifier in piece_id_lower for identifier in ["white", "w_", "_w", "light", "bw", "kw", "nw", "pw", "qw", "rw"])
-        else:  # שחקן שחור
-            return any(identifier in piece_id_lower for identifier in ["black", "b_", "_b", "dark", "bb", "kb", "nb", "pb", "qb", "rb"])
+        return piece.team == player_num
     
     def _is_same_team(self, piece1: Piece, piece2: Piece) -> bool:
         """בדיקה אם שני כלים שייכים לאותה קבוצה"""
-        p1_id = piece1.piece_id.lower()
-        p2_id = piece2.piece_id.lower()
-        
-        # בדיקה אם שניהם לבנים
-        p1_white = any(identifier in p1_id for identifier in ["white", "w_", "_w", "light", "bw", "kw", "nw", "pw", "qw", "rw"])
-        p2_white = any(identifier in p2_id for identifier in ["white", "w_", "_w", "light", "bw", "kw", "nw", "pw", "qw", "rw"])
-        
-        # בדיקה אם שניהם שחורים
-        p1_black = any(identifier in p1_id for identifier in ["black", "b_", "_b", "dark", "bb", "kb", "nb", "pb", "qb", "rb"])
-        p2_black = any(identifier in p2_id for identifier in ["black", "b_", "_b", "dark", "bb", "kb", "nb", "pb", "qb", "rb"])
-        
-        return (p1_white and p2_white) or (p1_black and p2_black)
+        return piece1.team == piece2.team and piece1.team != TEAM_NONE
 
-    def _create_move_command(self, piece: Piece, target_pos: list, is_jump: bool = False):
+    def _create_move_command(self, piece: Piece, target_pos: list, is_jump: bool = False,
+                             timestamp: Optional[int] = None):
         """יצירת פקודת תזוזה עם תמיכה בקפיצה"""
         try:
             current_r, current_c = piece.current_state.physics.get_cell_pos()
             target_r, target_c = target_pos
-            
-            # עדכון מיקום הכלי
-            piece.current_state.physics.row = target_r
-            piece.current_state.physics.col = target_c
-            
-            # אתחול מאפייני קפיצה
-            if not hasattr(piece, 'is_jumping'):
-                piece.is_jumping = False
-            if not hasattr(piece, 'jump_end_time'):
-                piece.jump_end_time = 0
-            
-            piece.is_jumping = is_jump
-            if is_jump:
-                piece.jump_end_time = self.game_time_ms() + 500  # קפיצה נמשכת חצי שנייה
-            else:
-                piece.jump_end_time = 0
-            
-            # המרה לסימון שחמט
-            current_pos_chess = chr(ord('a') + int(current_c)) + str(int(current_r) + 1)
-            target_chess_pos = chr(ord('a') + target_c) + str(target_r + 1)
+            # משבצות כמספרים שלמים - סימון שחמט רק להדפסה
+            from_cell = (int(current_r), int(current_c))
+            to_cell = (int(target_r), int(target_c))
             
             cmd_type = "Jump" if is_jump else "Move"
             cmd = Command(
-                timestamp=self.game_time_ms(),
+                timestamp=self.game_time_ms() if timestamp is None else timestamp,
                 piece_id=piece.piece_id,
                 type=cmd_type,
-                params=[current_pos_chess, target_chess_pos]
+                params=(from_cell, to_cell)
             )
             
             self.user_input_queue.put(cmd)
-            print(f"{cmd_type} command created: {piece.piece_id} from {current_pos_chess} to {target_chess_pos}")
+            print(f"{cmd_type} command created: {piece.piece_id} from {cell_name(from_cell)} to {cell_name(to_cell)}")
         except Exception as e:
             print(f"Error creating move command: {e}")
 
     def _find_piece_at_cell(self, r: int, c: int) -> Optional[Piece]:
         """מציאת כלי במיקום נתון"""
-        for piece in self.pieces:
-            try:
-                if hasattr(piece, 'current_state') and piece.current_state and \
-                   hasattr(piece.current_state, 'physics') and piece.current_state.physics:
-                    piece_r, piece_c = piece.current_state.physics.get_cell_pos()
-                    if piece_r == r and piece_c == c:
-                        return piece
-            except Exception as e:
-                print(f"Error checking piece position: {e}")
-                continue
-        return None
+        return self.occupancy.piece_at(r, c)
 
-    def run(self):
-        """לולאת המשחק הראשית - ללא בדיקות תור"""
-        self.start_user_input_thread()
+    def start(self):
+        """איפוס הכלים לתחילת משחק (משותף ללולאה הגרפית ולמנוע ה-headless)"""
         start_ms = self.game_time_ms()
         
         # איפוס ודא שכל הכלים מאותחלים עם מאפייני קירור וקפיצה
@@ -347,74 +374,205 @@ class Game:
             try:
                 if hasattr(p, 'reset'):
                     p.reset(start_ms)
-                # ודא קיום מאפיינים אלו על אובייקט Piece
-                if not hasattr(p, 'cooldown_end_time'):
-                    p.cooldown_end_time = 0
-                if not hasattr(p, 'is_jumping'):
-                    p.is_jumping = False
-                if not hasattr(p, 'jump_end_time'):
-                    p.jump_end_time = 0
-                if not hasattr(p, 'last_move_timestamp'):
-                    p.last_move_timestamp = 0
+                # השהיה, קפיצה וזמן תזוזה - שדות קבועים של Piece
+                p.reset_game_state()
             except Exception as e:
                 print(f"Error resetting piece {p.piece_id}: {e}")
+        
+        # תהליכי הבוטים עולים לפני חוטי הלולאה
+        for bot in self.bots:
+            bot.start(self)
+
+    def _update_pieces(self, now: int, frame_count: int = 0):
+        """עדכון פיזיקה (וקטורי, לכל העולם) ואנימציות של כל הכלים"""
+        for world in self.physics_worlds:
+            world.update(now)
+        
+        if not self.animate_sprites:
+            return
+        for p in self.pieces:
+            try:
+                p.current_state.advance(now)
+                p.last_update_time = now
+            except Exception as e:
+                self.frame_stats.error("update")
+                if frame_count % (self.sim_hz * 10) == 0:  # כל 10 שניות
+                    print(f"Error updating piece {p.piece_id}: {e}")
+
+    def _drain_commands(self):
+        """טיפול בפקודות ממתינות"""
+        while not self.user_input_queue.empty():
+            cmd: Command = self.user_input_queue.get()
+            if self.command_log is not None:
+                self.command_log.write_command(self.game_time_ms(), cmd)
+            self._process_input(cmd)
+
+    def _tick(self, now: int, tick_index: int = 0):
+        """One simulation tick: physics, pending commands, collisions."""
+        stats = self.frame_stats
+        began = time.perf_counter()
+        
+        # עדכון פיזיקה ואנימציות
+        self._update_pieces(now, tick_index)
+        updated = time.perf_counter()
+
+        # בוטים: רק בדיקת הצינור - החיפוש רץ בתהליך שלהם
+        for bot in self.bots:
+            try:
+                bot.on_tick(self, now)
+            except Exception as e:
+                stats.error("bots")
+                print(f"Error in bot for team {bot.team}: {e}")
+
+        # טיפול בפקודות ממתינות
+        try:
+            self._drain_commands()
+        except Exception as e:
+            stats.error("commands")
+            print(f"Error processing input: {e}")
+        drained = time.perf_counter()
+
+        # בדיקת התנגשויות לפני הציור
+        try:
+            self._resolve_collisions()
+        except Exception as e:
+            stats.error("collisions")
+            print(f"Error resolving collisions: {e}")
+        resolved = time.perf_counter()
+
+        # כל האירועים של הטיק יוצאים כאצווה אחת
+        self.event_bus.flush()
+
+        if self.command_log is not None:
+            self.command_log.on_tick(self, now, tick_index)
+        
+        stats.record("update", updated - began)
+        stats.record("commands", drained - updated)
+        stats.record("collisions", resolved - drained)
+        stats.budget("tick", time.perf_counter() - began, 1.0 / self.sim_hz)
+
+    def run(self):
+        """לולאת המשחק - סימולציה בחוט משלה, ציור והצגה בחוט הראשי.
+
+        HighGUI (waitKey/imshow) must stay on the main thread, so it is the
+        simulation that moves out: it ticks at `sim_hz` and publishes an
+        immutable RenderSnapshot after every step.  The main thread reads
+        keys, draws the newest snapshot and shows it at `target_fps`; a
+        slow frame never delays a tick, and ticks never wait for drawing.
+        """
+        self.start_user_input_thread()
+        # חוט רקע - ישן עד הטיק הבא בלי ספין: ספין מחזיק את ה-GIL וגוזל זמן מהציור,
+        # ואיחור קטן של טיק נבלע במצבר של FixedStepScheduler
+        scheduler = FixedStepScheduler(self.sim_hz, self.sim_hz, pacer=FramePacer(spin_ms=0))
+        self.clock = scheduler.clock
+        self.start()
+        self.event_bus.start()
+        self._stop.clear()
+        self.snapshots.publish(self._snapshot(self.game_time_ms()))
 
         print("Simultaneous Chess Game started!")
         print("White player (Player 1): Arrow keys + Enter (move) + J (jump)")
         print("Black player (Player 2): WASD + Space (move) + K (jump)")
-        print("Press 'r' to reset selection, 'q' to quit")
+        print("Press 'r' to reset selection, 'i' for frame stats, 'q' to quit")
 
-        frame_count = 0
-        while not self._is_win():
-            current_time = time.perf_counter()
-            now = self.game_time_ms()
-            frame_count += 1
+        simulation = threading.Thread(target=self._simulation_loop, args=(scheduler,),
+                                      name="GameSimulation", daemon=True)
+        simulation.start()
+        self._render_loop(scheduler.tick_s)
 
-            # עדכון פיזיקה ואנימציות
-            for p in self.pieces:
-                try:
-                    if hasattr(p, 'update'):
-                        p.update(now)
-                except Exception as e:
-                    if frame_count % (self.target_fps * 10) == 0:  # כל 10 שניות
-                        print(f"Error updating piece {p.piece_id}: {e}")
+        self._stop.set()
+        simulation.join(timeout=1.0)
+        for bot in self.bots:
+            bot.stop()
+            s = bot.stats()
+            print(f"Bot (team {bot.team}): {s['decisions']} decisions, {s['submitted']} moves, "
+                  f"mean depth {s['mean_depth']:.1f}, think p50 {s['think_p50_ms']:.0f} ms "
+                  f"(max {s['think_max_ms']:.0f} ms)")
+        self._announce_win()
+        self.event_bus.stop(timeout=1.0)
+        if self.command_log is not None:
+            self.command_log.flush()
+        cv2.destroyAllWindows()
+        breakdown = self.frame_time_breakdown()
+        if breakdown:
+            print("Frame time (ms): " + ", ".join(f"{k} {v:.2f}" for k, v in breakdown.items()))
+        loads = sprite_loader.stats()
+        print(f"Sprite sets: {loads['eager_sets']} eager ({loads['eager_ms']:.0f} ms), "
+              f"{loads['prefetch_sets']} prefetched ({loads['prefetch_ms']:.0f} ms), "
+              f"{loads['lazy_sets']} lazy ({loads['lazy_ms']:.0f} ms)")
 
-            # טיפול בקלט מקלדת
+    def _simulation_loop(self, scheduler: FixedStepScheduler):
+        """חוט הסימולציה: מקשים, טיקים קבועים ופרסום תמונת מצב - אף פעם לא מחכה לציור"""
+        scheduler.start()
+        while not self._stop.is_set():
+            # טיקים קבועים של סימולציה - זמן קפוא אחד לכל טיק
+            began = time.perf_counter()
+            for now in scheduler.due_ticks():
+                self._apply_keys(scheduler, now)
+                self._tick(now, scheduler.tick_index)
+            ticked = time.perf_counter()
             try:
-                if not self._handle_keyboard_input():
-                    break
+                self.snapshots.publish(self._snapshot(self.game_time_ms(), scheduler.tick_index,
+                                                      scheduler.alpha))
             except Exception as e:
-                print(f"Error handling keyboard input: {e}")
+                print(f"Error taking render snapshot: {e}")
+            self.frame_timeline.record("tick", began, ticked)
+            self.frame_timeline.record("snapshot", ticked, time.perf_counter())
 
-            # טיפול בפקודות ממתינות
-            try:
-                while not self.user_input_queue.empty():
-                    cmd: Command = self.user_input_queue.get()
-                    self._process_input(cmd)
-            except Exception as e:
-                print(f"Error processing input: {e}")
+            if self._is_win():
+                self._stop.set()
+            scheduler.wait_next_frame()
 
-            # בדיקת התנגשויות לפני הציור
+    def _apply_keys(self, scheduler: FixedStepScheduler, now: int):
+        """מקשים שנלכדו עד הטיק הזה, לפי סדר הלכידה ועם זמן הלכידה"""
+        began = time.perf_counter()
+        for event in self.input_pump.drain_until(scheduler.wall_time_of(now)):
+            timestamp = min(int(scheduler.game_ms_at(event.captured_at)), now)
             try:
-                self._resolve_collisions()
+                if not self._handle_key(event.key, max(timestamp, 0)):
+                    self._stop.set()
             except Exception as e:
-                print(f"Error resolving collisions: {e}")
+                self.frame_stats.error("keyboard")
+                print(f"Error handling keyboard input: {e}")
+        self.frame_stats.record("keyboard", time.perf_counter() - began)
 
-            # ציור
+    def _render_loop(self, tick_s: float):
+        """החוט הראשי: ציור תמונת המצב האחרונה, הצגה בקצב target_fps ולכידת מקשים בזמן ההמתנה"""
+        next_frame = time.perf_counter()
+        while not self._stop.is_set():
+            # ציור עם אינטרפולציה - כמה מהטיק הבא כבר עבר מאז הפרסום
             try:
-                self._draw()
-                if not self._show():
+                _, snapshot = self.snapshots.latest()
+                began = time.perf_counter()
+                alpha = min(snapshot.alpha + (began - snapshot.published_at) / tick_s, 1.0)
+                self._draw(snapshot, alpha)
+                drawn = time.perf_counter()
+                shown = self._show()
+                ended = time.perf_counter()
+                self.frame_timeline.record("draw", began, drawn)
+                self.frame_timeline.record("show", drawn, ended)
+                self.frame_stats.record("draw", drawn - began)
+                self.frame_stats.record("show", ended - drawn)
+                self.frame_stats.budget("frame", ended - began, self.frame_time)
+                if not shown:
                     break
             except Exception as e:
+                self.frame_stats.error("draw")
                 print(f"Error drawing/showing frame: {e}")
 
-            # FPS control
-            elapsed = time.perf_counter() - current_time
-            if elapsed < self.frame_time:
-                time.sleep(self.frame_time - elapsed)
+            # FPS control - ההמתנה לפריים הבא היא זמן לכידת המקשים
+            next_frame += self.frame_time
+            try:
+                self.input_pump.pump_until(next_frame)
+            except Exception as e:
+                print(f"Error reading keyboard input: {e}")
+            if next_frame < time.perf_counter():
+                next_frame = time.perf_counter()  # לא מנסים "להשלים" פריימים
 
-        self._announce_win()
-        cv2.destroyAllWindows()
+    def frame_time_breakdown(self) -> dict:
+        """Mean ms per phase (tick/snapshot on the simulation thread, draw/show on the
+        main thread), each thread's busy fraction and how much of drawing overlapped ticks."""
+        return self.frame_timeline.breakdown()
 
     def _process_input(self, cmd: Command):
         """עיבוד פקודה מהמשתמש"""
@@ -426,165 +584,239 @@ class Game:
                     
                     # פרסום אירוע תזוזה
                     if cmd.type in ["Move", "Jump"]:
-                        event = Event("piece_moved", {
-                            "piece_id": piece.piece_id,
-                            "command": cmd,
-                            "position": cmd.params[1] if len(cmd.params) > 1 else None
-                        })
+                        self._apply_move_bookkeeping(piece, cmd)
+                        event = Event("piece_moved", PieceMoved(
+                            piece.piece_id, cmd, cmd.params[1] if len(cmd.params) > 1 else None
+                        ), keys=(piece.piece_id, piece.team))
                         self.event_bus.publish(event)
                 except Exception as e:
                     print(f"Error processing command for piece {piece.piece_id}: {e}")
                 break
 
-    def _draw(self):
-        """ציור המצב הנוכחי - עם תמיכה בקפיצות"""
+    def _apply_move_bookkeeping(self, piece: Piece, cmd: Command):
+        """תפוסה, התנגשויות וקפיצה של פקודה שהתקבלה - לפי זמן הפקודה"""
+        is_jump = cmd.type == "Jump"
+        
+        physics = piece.current_state.physics
+        
+        # הכלי בדרך - המשבצת המקורית מתפנה, Physics יציב אותו ביעד בסיום ההחלקה
+        if not is_jump and physics.is_moving():
+            self.occupancy.vacate(self.occupancy.slot_of(piece))
+            self.collisions.on_move(piece, physics.move_from_cell, physics.target_cell,
+                                    physics.start_time_ms, physics.duration_ms)
+        
+        piece.is_jumping = is_jump
+        piece.jump_end_time = cmd.timestamp + self.JUMP_AIR_MS if is_jump else 0
+        if is_jump:
+            self.collisions.on_jump(piece, piece.jump_end_time)
+        
+        # מהלך שעבר את _attempt_move כבר קיבל השהיה; פקודות משוחזרות (CommandLog) מקבלות אותה כאן
+        self._start_cooldown(piece, cmd.timestamp, is_jump)
+
+    def _start_cooldown(self, piece: Piece, timestamp: int, is_jump: bool):
+        """השהיה וזמן המהלך (לקביעת המנצח בהתנגשות) - לפי זמן הפקודה"""
+        cooldown_duration = self.JUMP_COOLDOWN_MS if is_jump else self.MOVE_COOLDOWN_MS
+        piece.cooldown_end_time = timestamp + cooldown_duration
+        piece.last_move_timestamp = timestamp
+
+    def _snapshot(self, now_ms: int, tick_index: int = 0, alpha: float = 1.0) -> RenderSnapshot:
+        """Immutable copy of everything the next frame shows - taken on the simulation thread."""
+        pieces = tuple(piece.render_view(now_ms) if hasattr(piece, 'render_view')
+                       else self._demo_view(piece, now_ms) for piece in self.pieces)
+        cursors = ((1, tuple(self.player1_cursor)), (2, tuple(self.player2_cursor)))
+        selections = tuple((player_num, selected.current_state.physics.get_cell_pos())
+                           for player_num, selected in ((1, self.player1_selected_piece),
+                                                        (2, self.player2_selected_piece))
+                           if selected)
+        return RenderSnapshot(tick_index, now_ms, alpha, time.perf_counter(), pieces, cursors,
+                              selections, self._game_info_signature())
+
+    def _demo_view(self, piece: Piece, now_ms: int) -> PieceView:
+        """תמונת מצב לכלי בלי גרפיקה - מצויר כריבוע דמו"""
+        cell = piece.current_state.physics.get_cell_pos()
+        return PieceView(piece.piece_id, getattr(piece, 'piece_type', ""), piece.team, "", 0, None,
+                         cell, cell, False, False, piece.is_jumping,
+                         now_ms < piece.cooldown_end_time, piece.cooldown_end_time)
+
+    def _draw(self, snapshot: Optional[RenderSnapshot] = None, alpha: Optional[float] = None):
+        """ציור תמונת מצב - רק משבצות שהשתנו מצוירות מחדש.
+
+        Without a snapshot one is taken from the live game, for single
+        threaded callers (headless tools, tests).
+        """
         try:
-            self.current_board = self.clone_board()
-            now_ms = self.game_time_ms()
+            if snapshot is None:
+                snapshot = self._snapshot(self.game_time_ms())
+            if alpha is None:
+                alpha = self.render_alpha
+            if self.renderer is None:
+                self.renderer = Renderer(self.board)
+            board = self.renderer.frame_board
+            self.current_board = board
+            now_ms = snapshot.now_ms
             
             # ציור כל הכלים
-            for piece in self.pieces:
+            for view in snapshot.pieces:
                 try:
-                    if hasattr(piece, 'draw_on_board'):
-                        piece.draw_on_board(self.current_board, now_ms)
+                    if view.sprite is not None:
+                        self.renderer.add(("piece", view.piece_id),
+                                          view.signature(board, alpha),
+                                          view.draw_rect(board, alpha),
+                                          lambda v=view: self._draw_piece(v, alpha))
                     else:
-                        self._draw_demo_piece(piece, now_ms)
+                        self.renderer.add(("piece", view.piece_id),
+                                          self._demo_piece_signature(view, now_ms),
+                                          self._demo_piece_rect(view),
+                                          lambda v=view: self._draw_demo_piece(v, now_ms))
                 except Exception as e:
-                    print(f"Error drawing piece {piece.piece_id}: {e}")
+                    print(f"Error drawing piece {view.piece_id}: {e}")
             
             # ציור סמני השחקנים
-            self._draw_cursor(1, self.player1_cursor, (0, 255, 0))  # ירוק לשחקן 1
-            self._draw_cursor(2, self.player2_cursor, (0, 0, 255))  # אדום לשחקן 2
+            for player_num, (row, col) in snapshot.cursors:
+                self.renderer.add(("cursor", player_num), (row, col),
+                                  self._cell_rect(row, col),
+                                  lambda n=player_num, pos=(row, col): self._draw_cursor(
+                                      n, pos, self.CURSOR_COLORS[n]))
             
             # ציור בחירות
-            if self.player1_selected_piece:
-                try:
-                    r, c = self.player1_selected_piece.current_state.physics.get_cell_pos()
-                    self._draw_selection(r, c, (0, 255, 255))  # צהוב
-                except Exception as e:
-                    print(f"Error drawing player 1 selection: {e}")
-                    
-            if self.player2_selected_piece:
-                try:
-                    r, c = self.player2_selected_piece.current_state.physics.get_cell_pos()
-                    self._draw_selection(r, c, (255, 0, 255))  # מגנטה
-                except Exception as e:
-                    print(f"Error drawing player 2 selection: {e}")
+            for player_num, (r, c) in snapshot.selections:
+                self.renderer.add(("selection", player_num), (r, c),
+                                  self._cell_rect(r, c),
+                                  lambda r=r, c=c, n=player_num: self._draw_selection(
+                                      r, c, self.SELECTION_COLORS[n]))
             
             # הצגת מידע על המשחק
-            self._draw_game_info()
+            hud = snapshot.hud
+            self.renderer.add(("hud",), hud, self._game_info_rect(hud),
+                              lambda: self._draw_game_info(hud))
+            
+            # שכבת זמני השלבים - מתרעננת 4 פעמים בשנייה
+            if self.show_stats:
+                lines = self._stats_overlay_lines()
+                self.renderer.add(("stats",), lines, self._stats_overlay_rect(lines),
+                                  lambda: self._draw_stats_overlay(lines))
+            
+            self.renderer.render()
             
         except Exception as e:
             print(f"Error in draw method: {e}")
 
-    def _draw_demo_piece(self, piece: Piece, now_ms: int):
+    def _draw_piece(self, view: PieceView, alpha: float = 1.0):
+        try:
+            view.draw(self.current_board, alpha)
+        except Exception as e:
+            print(f"Error drawing piece {view.piece_id}: {e}")
+
+    def _cell_rect(self, row: int, col: int) -> Tuple[int, int, int, int]:
+        x = col * self.board.cell_W_pix
+        y = row * self.board.cell_H_pix
+        return (x, y, x + self.board.cell_W_pix, y + self.board.cell_H_pix)
+
+    def _demo_piece_signature(self, view: PieceView, now_ms: int):
+        remaining = f"{max(0, (view.cooldown_end_time - now_ms) / 1000.0):.1f}" if view.in_cooldown else ""
+        return (view.cell, view.is_jumping, view.in_cooldown, remaining)
+
+    def _demo_piece_rect(self, view: PieceView) -> Tuple[int, int, int, int]:
+        r, c = view.cell
+        x0, y0, x1, y1 = self._cell_rect(r, c)
+        return (x0, y0 - 25, x1, y1 + 10)  # טקסט הקפיצה מעל, זמן ההשהיה מתחת
+
+    def _draw_demo_piece(self, view: PieceView, now_ms: int):
         """ציור משופר לכלי דמו עם אינדיקציה לקפיצה וקירור"""
         try:
-            r, c = piece.current_state.physics.get_cell_pos()
-            x = c * self.current_board.cell_W_pix + 10
-            y = r * self.current_board.cell_H_pix + 10
-            
-            # בדיקה אם הכלי קופץ
-            is_jumping = hasattr(piece, 'is_jumping') and piece.is_jumping
-            
-            # בדיקה אם הכלי בהשהיה
-            in_cooldown = self._is_piece_in_cooldown(piece)
-            
-            # צבע לפי השחקן ומצב
-            if self._can_player_control_piece(1, piece):
-                if in_cooldown:
-                    color = (150, 150, 150)  # אפור - בהשהיה
-                    border_color = (100, 100, 100)
-                else:
-                    color = (255, 255, 255)  # לבן
-                    border_color = (200, 200, 200)
-            else:
-                if in_cooldown:
-                    color = (80, 80, 80)  # אפור כהה - בהשהיה
-                    border_color = (50, 50, 50)
-                else:
-                    color = (40, 40, 40)  # כמעט שחור
-                    border_color = (100, 100, 100)
-            
-            # אם קופץ, הזז מעט למעלה וצייר צללית
-            jump_offset = 0
-            if is_jumping:
-                jump_offset = -15
-                # צללית תחתית
-                shadow_center = (
-                    c * self.current_board.cell_W_pix + self.current_board.cell_W_pix // 2, 
-                    r * self.current_board.cell_H_pix + self.current_board.cell_H_pix // 2
-                )
-                cv2.circle(self.current_board.img.img, shadow_center, 30, (100, 100, 100), 3)
+            r, c = view.cell
+            cell_x = c * self.current_board.cell_W_pix
+            cell_y = r * self.current_board.cell_H_pix
             
-            # ציור צללית רגילה
-            if not is_jumping:
-                shadow_offset = 3
-                cv2.rectangle(self.current_board.img.img, 
-                            (x + shadow_offset, y + shadow_offset), 
-                            (x + 60 + shadow_offset, y + 60 + shadow_offset), 
-                            (20, 20, 20), -1)
-            
-            # ציור הכלי עצמו (עם היסט קפיצה)
-            piece_y = y + jump_offset
-            cv2.rectangle(self.current_board.img.img, 
-                        (x, piece_y), 
-                        (x + 60, piece_y + 60), 
-                        color, -1)
-            cv2.rectangle(self.current_board.img.img, 
-                        (x, piece_y), 
-                        (x + 60, piece_y + 60), 
-                        border_color, 2)
-                            
-            # הוספת טקסט
-            piece_name = piece.piece_id
+            # תווית לפי שם הכלי
+            piece_name = view.piece_id
             if "_" in piece_name:
-                piece_type = piece_name.split('_')[0][:2].upper()
+                label = piece_name.split('_')[0][:2].upper()
             else:
-                piece_type = piece_name[:2].upper()
+                label = piece_name[:2].upper()
             
-            text_color = (0, 0, 0) if self._can_player_control_piece(1, piece) else (255, 255, 255)
+            # הכלי עצמו - שכבה אחת לכל שילוב של צבע, מצב ותווית
+            key = ("demo", view.team == TEAM_WHITE, view.in_cooldown, view.is_jumping, label)
+            tile = self.hud_layers.get(key, lambda: self._build_demo_tile(*key[1:]))
+            tile.draw_on(self.current_board.img, cell_x, cell_y - 25)
             
-            cv2.putText(self.current_board.img.img, piece_type, 
-                        (x + 15, piece_y + 35), cv2.FONT_HERSHEY_SIMPLEX, 
-                        0.6, text_color, 2)
-                            
-            # אינדיקטור קפיצה
-            if is_jumping:
-                cv2.putText(self.current_board.img.img, "JUMP", 
-                            (x + 10, piece_y - 5), cv2.FONT_HERSHEY_SIMPLEX, 
-                            0.4, (0, 255, 255), 1)
-                            
-            # אינדיקטור השהיה עם זמן נותר
-            if in_cooldown:
-                remaining_time = max(0, (piece.cooldown_end_time - now_ms) / 1000.0)
-                cooldown_text = f"{remaining_time:.1f}s"
-                cv2.putText(self.current_board.img.img, cooldown_text, 
-                            (x + 5, piece_y + 75), cv2.FONT_HERSHEY_SIMPLEX, 
-                            0.35, (255, 100, 100), 1)
+            # אינדיקטור השהיה עם זמן נותר - מורכב מאטלס הספרות
+            if view.in_cooldown:
+                if self.countdown_glyphs is None:
+                    self.countdown_glyphs = GlyphAtlas("0123456789.s", 0.35, (255, 100, 100))
+                remaining_time = max(0, (view.cooldown_end_time - now_ms) / 1000.0)
+                piece_y = cell_y + 10 + (-15 if view.is_jumping else 0)
+                self.countdown_glyphs.draw(self.current_board.img, f"{remaining_time:.1f}s",
+                                           cell_x + 15, piece_y + 75)
                         
         except Exception as e:
             print(f"Error drawing demo piece: {e}")
 
+    def _build_demo_tile(self, is_white: bool, in_cooldown: bool, is_jumping: bool, label: str) -> Layer:
+        """שכבת כלי דמו בגודל _demo_piece_rect (מתחילה 25 פיקסלים מעל המשבצת)"""
+        cell_w, cell_h = self.board.cell_W_pix, self.board.cell_H_pix
+        layer = Layer(cell_w, cell_h + 35)
+        x, y = 10, 35
+        
+        # צבע לפי השחקן ומצב
+        if is_white:
+            if in_cooldown:
+                color = (150, 150, 150)  # אפור - בהשהיה
+                border_color = (100, 100, 100)
+            else:
+                color = (255, 255, 255)  # לבן
+                border_color = (200, 200, 200)
+        else:
+            if in_cooldown:
+                color = (80, 80, 80)  # אפור כהה - בהשהיה
+                border_color = (50, 50, 50)
+            else:
+                color = (40, 40, 40)  # כמעט שחור
+                border_color = (100, 100, 100)
+        
+        # אם קופץ, הזז מעט למעלה וצייר צללית
+        jump_offset = 0
+        if is_jumping:
+            jump_offset = -15
+            # צללית תחתית
+            layer.circle((cell_w // 2, 25 + cell_h // 2), 30, (100, 100, 100), 3)
+        else:
+            # ציור צללית רגילה
+            shadow_offset = 3
+            layer.rectangle((x + shadow_offset, y + shadow_offset),
+                            (x + 60 + shadow_offset, y + 60 + shadow_offset), (20, 20, 20), -1)
+        
+        # ציור הכלי עצמו (עם היסט קפיצה)
+        piece_y = y + jump_offset
+        layer.rectangle((x, piece_y), (x + 60, piece_y + 60), color, -1)
+        layer.rectangle((x, piece_y), (x + 60, piece_y + 60), border_color, 2)
+        
+        text_color = (0, 0, 0) if is_white else (255, 255, 255)
+        layer.text(label, (x + 15, piece_y + 35), 0.6, text_color, 2)
+        
+        # אינדיקטור קפיצה
+        if is_jumping:
+            layer.text("JUMP", (x + 10, piece_y - 5), 0.4, (0, 255, 255), 1)
+        return layer
+
     def _draw_cursor(self, player_num: int, cursor_pos: list, color: tuple):
-        """ציור סמן השחקן"""
+        """ציור סמן השחקן - שכבה מוכנה לכל שחקן"""
         try:
             row, col = cursor_pos
-            x = col * self.board.cell_W_pix
-            y = row * self.board.cell_H_pix
-            
-            # ציור מסגרת סמן
-            cv2.rectangle(self.current_board.img.img, (x, y),
-                         (x + self.board.cell_W_pix - 1, y + self.board.cell_H_pix - 1),
-                         color, 3)
-            
-            # הצגת מספר השחקן
-            cv2.putText(self.current_board.img.img, str(player_num), 
-                       (x + 5, y + 25), cv2.FONT_HERSHEY_SIMPLEX, 
-                       0.7, color, 2)
+            layer = self.hud_layers.get(("cursor", player_num, color),
+                                        lambda: self._build_cursor_layer(player_num, color))
+            layer.draw_on(self.current_board.img, col * self.board.cell_W_pix, row * self.board.cell_H_pix)
         except Exception as e:
             print(f"Error drawing cursor: {e}")
 
+    def _build_cursor_layer(self, player_num: int, color: tuple) -> Layer:
+        layer = Layer(self.board.cell_W_pix, self.board.cell_H_pix)
+        # מסגרת בעובי 3 מוזחת פנימה - נשארת בתוך המשבצת
+        layer.rectangle((2, 2), (self.board.cell_W_pix - 3, self.board.cell_H_pix - 3), color, 3)
+        # הצגת מספר השחקן
+        layer.text(str(player_num), (5, 25), 0.7, color, 2)
+        return layer
+
     def _draw_selection(self, row: int, col: int, color: tuple):
         """ציור בחירת כלי"""
         try:
@@ -593,80 +825,132 @@ class Game:
             
             # מסגרת עבה לציון בחירה
             cv2.rectangle(self.current_board.img.img,
-                         (x + 2, y + 2),
-                         (x + self.board.cell_W_pix - 3, y + self.board.cell_H_pix - 3),
+                         (x + 3, y + 3),
+                         (x + self.board.cell_W_pix - 4, y + self.board.cell_H_pix - 4),
                          color, 5)
         except Exception as e:
             print(f"Error drawing selection: {e}")
 
-    def _draw_game_info(self):
-        """ציור מידע משופר על המשחק"""
+    def _game_info_signature(self):
+        """Values shown by _draw_game_info - the HUD is repainted only when they change"""
+        selected = []
+        for piece in (self.player1_selected_piece, self.player2_selected_piece):
+            if piece:
+                selected.append((piece.piece_id, self._is_piece_in_cooldown(piece)))
+            else:
+                selected.append(None)
+        return (tuple(selected), self.team_counts[TEAM_WHITE], self.team_counts[TEAM_BLACK])
+
+    def _game_info_rect(self, hud: Optional[tuple] = None) -> Tuple[int, int, int, int]:
+        selected, _, _ = hud if hud is not None else self._game_info_signature()
+        selected_count = sum(info is not None for info in selected)
+        bottom = 55 + 2 * 25 + 30 * selected_count + 25
+        return (0, 0, 480, bottom)
+
+    def _draw_game_info(self, hud: Optional[tuple] = None):
+        """ציור מידע על המשחק - שכבה אחת לכל ערך HUD, ממוזגת לפריים במעבר אחד"""
         try:
-            # מידע כללי על המשחק
-            game_text = "Simultaneous Chess - No Turns!"
-            
-            # ציור רקע לטקסט
-            cv2.rectangle(self.current_board.img.img, (5, 5), (350, 45), (0, 0, 0), -1)
-            cv2.rectangle(self.current_board.img.img, (5, 5), (350, 45), (255, 255, 255), 2)
-            
-            cv2.putText(self.current_board.img.img, game_text, 
-                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
-                    0.7, (255, 255, 255), 2)
-            
-            # הוראות משחק
-            instructions = [
-                "P1: Arrows+Enter+J(jump) | P2: WASD+Space+K(jump)",
-                "Cooldown: 4s move, 1s jump | R=reset, Q=quit"
-            ]
-            
-            y_offset = 55
-            for instruction in instructions:
-                cv2.rectangle(self.current_board.img.img, (5, y_offset), (len(instruction) * 8 + 10, y_offset + 20), (30, 30, 30), -1)
-                cv2.putText(self.current_board.img.img, instruction, 
-                        (10, y_offset + 15), cv2.FONT_HERSHEY_SIMPLEX, 
-                        0.4, (200, 200, 200), 1)
-                y_offset += 25
-            
-            # מידע על הכלים הנבחרים
-            if self.player1_selected_piece:
-                selected_text = f"P1 Selected: {self.player1_selected_piece.piece_id}"
-                in_cooldown = self._is_piece_in_cooldown(self.player1_selected_piece)
-                color = (100, 100, 100) if in_cooldown else (0, 150, 0)
-                
-                cv2.rectangle(self.current_board.img.img, (5, y_offset), (300, y_offset + 25), color, -1)
-                cv2.putText(self.current_board.img.img, selected_text, 
-                        (10, y_offset + 18), cv2.FONT_HERSHEY_SIMPLEX, 
-                        0.5, (255, 255, 255), 1)
-                y_offset += 30
-                
-            if self.player2_selected_piece:
-                selected_text = f"P2 Selected: {self.player2_selected_piece.piece_id}"
-                in_cooldown = self._is_piece_in_cooldown(self.player2_selected_piece)
-                color = (100, 100, 100) if in_cooldown else (150, 0, 0)
-                
-                cv2.rectangle(self.current_board.img.img, (5, y_offset), (300, y_offset + 25), color, -1)
-                cv2.putText(self.current_board.img.img, selected_text, 
-                        (10, y_offset + 18), cv2.FONT_HERSHEY_SIMPLEX, 
-                        0.5, (255, 255, 255), 1)
-                y_offset += 30
-            
-            # הצגת מספר הכלים שנותרו
-            white_pieces = [p for p in self.pieces if self._can_player_control_piece(1, p)]
-            black_pieces = [p for p in self.pieces if self._can_player_control_piece(2, p)]
-            
-            pieces_info = f"White: {len(white_pieces)} pieces | Black: {len(black_pieces)} pieces"
-            cv2.putText(self.current_board.img.img, pieces_info, 
-                    (10, y_offset + 18), cv2.FONT_HERSHEY_SIMPLEX, 
-                    0.5, (200, 200, 200), 1)
-            
+            if hud is None:
+                hud = self._game_info_signature()
+            layer = self.hud_layers.get(("hud", hud), lambda: self._build_hud_layer(hud))
+            layer.draw_on(self.current_board.img, 0, 0)
         except Exception as e:
             print(f"Error drawing game info: {e}")
 
+    def _build_hud_layer(self, hud: tuple) -> Layer:
+        """הרכבת ה-HUD משכבת הטקסט הקבוע ומשורות דינמיות שמורות (בחירה, ספירת כלים)"""
+        (p1_selected, p2_selected), white_count, black_count = hud
+        _, _, width, height = self._game_info_rect(hud)
+        layer = Layer(width, height)
+        paste(layer, self.hud_layers.get(("hud-static",), self._build_hud_static_layer), 0, 0)
+        
+        # מידע על הכלים הנבחרים
+        y_offset = 55 + 2 * 25
+        for player_num, selected, color in ((1, p1_selected, (0, 150, 0)),
+                                            (2, p2_selected, (150, 0, 0))):
+            if selected:
+                line = self.hud_layers.get(("hud-selected", player_num, selected),
+                                           lambda: self._build_selected_line(player_num, *selected, color))
+                paste(layer, line, 0, y_offset)
+                y_offset += 30
+        
+        # הצגת מספר הכלים שנותרו
+        line = self.hud_layers.get(("hud-counts", white_count, black_count),
+                                   lambda: self._build_text_line(
+                                       f"White: {white_count} pieces | Black: {black_count} pieces", width))
+        paste(layer, line, 0, y_offset)
+        return layer
+
+    def _build_hud_static_layer(self) -> Layer:
+        """כותרת והוראות - נכתבות פעם אחת"""
+        layer = Layer(480, 55 + 2 * 25)
+        
+        # מידע כללי על המשחק
+        game_text = "Simultaneous Chess - No Turns!"
+        
+        # ציור רקע לטקסט
+        layer.rectangle((5, 5), (350, 45), (0, 0, 0), -1)
+        layer.rectangle((5, 5), (350, 45), (255, 255, 255), 2)
+        layer.text(game_text, (10, 30), 0.7, (255, 255, 255), 2)
+        
+        # הוראות משחק
+        instructions = [
+            "P1: Arrows+Enter+J(jump) | P2: WASD+Space+K(jump)",
+            "Cooldown: 4s move, 1s jump | R=reset, Q=quit"
+        ]
+        
+        y_offset = 55
+        for instruction in instructions:
+            layer.rectangle((5, y_offset), (len(instruction) * 8 + 10, y_offset + 20), (30, 30, 30), -1)
+            layer.text(instruction, (10, y_offset + 15), 0.4, (200, 200, 200), 1)
+            y_offset += 25
+        return layer
+
+    def _build_selected_line(self, player_num: int, piece_id: str, in_cooldown: bool, color: tuple) -> Layer:
+        layer = Layer(301, 26)
+        color = (100, 100, 100) if in_cooldown else color
+        layer.rectangle((5, 0), (300, 25), color, -1)
+        layer.text(f"P{player_num} Selected: {piece_id}", (10, 18), 0.5, (255, 255, 255), 1)
+        return layer
+
+    def _build_text_line(self, text: str, width: int) -> Layer:
+        layer = Layer(width, 25)
+        layer.text(text, (10, 18), 0.5, (200, 200, 200), 1)
+        return layer
+
+    def _stats_overlay_lines(self) -> tuple:
+        now = time.perf_counter()
+        if now >= self._stats_refresh_at:
+            self._stats_lines = tuple(self.frame_stats.overlay_rows())
+            self._stats_refresh_at = now + 0.25
+        return self._stats_lines
+
+    def _stats_overlay_rect(self, lines: tuple) -> Tuple[int, int, int, int]:
+        bottom = self.board.H_cells * self.board.cell_H_pix
+        return (0, bottom - 16 * len(lines) - 10, 270, bottom)
+
+    def _draw_stats_overlay(self, lines: tuple):
+        """ציור טבלת זמני השלבים בפינה השמאלית התחתונה"""
+        try:
+            x0, y0, x1, y1 = self._stats_overlay_rect(lines)
+            layer = Layer(x1 - x0, y1 - y0)
+            layer.rectangle((0, 0), (x1 - x0 - 1, y1 - y0 - 1), (0, 0, 0), -1)
+            for i, row in enumerate(lines):
+                for x, cell in zip((6, 110, 160, 210), row):
+                    layer.text(cell, (x, 18 + 16 * i), 0.4, (0, 255, 0), 1)
+            layer.draw_on(self.current_board.img, x0, y0)
+        except Exception as e:
+            print(f"Error drawing frame stats: {e}")
+
     def _show(self) -> bool:
         """הצגת הפריים הנוכחי"""
         if self.current_board is None or self.current_board.img.img is None:
             return True
             
+        # לצופים - רק מסירה (העתק + קידוד ברקע), אף פעם לא מחכה
+        if self.spectator is not None:
+            self.spectator.submit(self.current_board.img.img)
+        
         try:
             cv2.imshow(self.window_name, self.current_board.img.img)
             if cv2.getWindowProperty(self.window_name, cv2.WND_PROP_VISIBLE) < 1:
@@ -679,72 +963,62 @@ class Game:
             return False
 
     def _resolve_collisions(self):
-        """פתרון התנגשויות ואכילות - עם תמיכה בקפיצות"""
+        """פתרון התנגשויות ואכילות שהגיע זמנן - לפי התור של CollisionPredictor"""
         now_ms = self.game_time_ms()
-        pieces_to_remove = []
         
-        # שלב 1: עדכון סטטוס קפיצה של כל הכלים
-        for piece in self.pieces:
-            if hasattr(piece, 'is_jumping') and piece.is_jumping and \
-            hasattr(piece, 'jump_end_time') and now_ms >= piece.jump_end_time:
-                piece.is_jumping = False
-                print(f"{piece.piece_id} landed from jump.")
-        
-        # שלב 2: בדיקת התנגשויות - רק כלים שלא קופצים
-        piece_positions: Dict[Tuple[int, int], List[Piece]] = {}
-        
-        for piece in self.pieces:
-            if not hasattr(piece, 'current_state') or not piece.current_state or \
-            not hasattr(piece.current_state, 'physics'):
+        for event_ms, kind, piece_a, piece_b in self.collisions.pop_due(now_ms):
+            # נחיתה מקפיצה
+            if kind == "land":
+                piece_a.is_jumping = False
+                print(f"{piece_a.piece_id} landed from jump.")
                 continue
             
-            try:
-                r, c = piece.current_state.physics.get_cell_pos()
-            except:
+            if self._is_same_team(piece_a, piece_b):
                 continue
-                
-            # כלים קופצים אינם נמצאים על הלוח לצורך התנגשויות רגילות
-            if hasattr(piece, 'is_jumping') and piece.is_jumping:
+            
+            # כלי קופץ לא מתנגש - בודקים שוב כשהוא נוחת
+            landing_ms = max(self.collisions.jump_until(piece_a), self.collisions.jump_until(piece_b))
+            if landing_ms > event_ms:
+                self.collisions.reschedule_pair(piece_a, piece_b, landing_ms)
                 continue
             
-            if (r, c) not in piece_positions:
-                piece_positions[(r, c)] = []
-            piece_positions[(r, c)].append(piece)
-
-        # בדיקת התנגשויות במיקומים שבהם יש יותר מכלי אחד
-        for pos, occupying_pieces in piece_positions.items():
-            if len(occupying_pieces) > 1:
-                # מיון הכלים לפי זמן המהלך האחרון - הראשון שהתחיל לזוז מנצח
-                occupying_pieces.sort(key=lambda p: getattr(p, 'last_move_timestamp', 0))
-                
-                winner_piece = occupying_pieces[0]  # הכלי עם הזמן הקטן ביותר (התחיל ראשון)
-                
-                # הסרת כל הכלים האחרים שאינם מאותו צוות
-                for piece_to_check in occupying_pieces[1:]:
-                    if not self._is_same_team(winner_piece, piece_to_check):
-                        if piece_to_check not in pieces_to_remove:
-                            pieces_to_remove.append(piece_to_check)
-                            print(f"{winner_piece.piece_id} captured {piece_to_check.piece_id} at {pos}")
-                            
-                            event = Event("piece_captured", {
-                                "captured_piece": piece_to_check.piece_id,
-                                "capturing_piece": winner_piece.piece_id,
-                                "position": pos
-                            })
-                            self.event_bus.publish(event)
-        
-        # הסרת הכלים שנאכלו
-        for piece in pieces_to_remove:
-            if piece in self.pieces:
-                # ביטול בחירה אם הכלי שנאכל היה נבחר
-                if self.player1_selected_piece == piece:
-                    self.player1_selected_piece = None
-                    print("Player 1's selected piece was captured!")
-                if self.player2_selected_piece == piece:
-                    self.player2_selected_piece = None
-                    print("Player 2's selected piece was captured!")
-                
-                self.pieces.remove(piece)
+            # הראשון שהתחיל לזוז מנצח
+            winner_piece, captured_piece = sorted(
+                (piece_a, piece_b), key=lambda p: p.last_move_timestamp)
+            pos = self.collisions.cell_at(winner_piece, event_ms)
+            print(f"{winner_piece.piece_id} captured {captured_piece.piece_id} at {pos}")
+            
+            event = Event(
+                "piece_captured", PieceCaptured(captured_piece.piece_id, winner_piece.piece_id, pos),
+                keys=(captured_piece.piece_id, winner_piece.piece_id, captured_piece.team))
+            self.event_bus.publish(event)
+            
+            self._remove_captured_piece(captured_piece)
+            
+            # המנצח נשאר במשבצת - מוודאים שהאינדקס מצביע עליו
+            if not winner_piece.current_state.physics.is_moving():
+                self.occupancy.move(self.occupancy.slot_of(winner_piece), pos)
+
+    def _remove_captured_piece(self, piece: Piece):
+        """הסרת כלי שנאכל מהמשחק ומכל האינדקסים"""
+        if piece not in self.pieces:
+            return
+        
+        # ביטול בחירה אם הכלי שנאכל היה נבחר
+        if self.player1_selected_piece == piece:
+            self.player1_selected_piece = None
+            print("Player 1's selected piece was captured!")
+        if self.player2_selected_piece == piece:
+            self.player2_selected_piece = None
+            print("Player 2's selected piece was captured!")
+        
+        self.pieces.remove(piece)
+        self.occupancy.remove(self.occupancy.slot_of(piece))
+        self.collisions.remove(piece)
+        piece.current_state.physics.release()
+        
+        self.team_counts[piece.team] -= 1
+        self.type_counts[(piece.team, getattr(piece, 'piece_type', ""))] -= 1
 
     def _get_player_num_for_piece(self, piece: Piece) -> int:
         """פונקציית עזר למציאת מספר השחקן השולט בכלי"""
@@ -760,20 +1034,20 @@ class Game:
             if self.game_over:
                 return True
                 
-            # בדיקה אם נשארו כלים לכל צד
-            white_pieces = [p for p in self.pieces if self._can_player_control_piece(1, p)]
-            black_pieces = [p for p in self.pieces if self._can_player_control_piece(2, p)]
+            # בדיקה אם נשארו כלים לכל צד - לפי המונים, בלי לעבור על הכלים
+            white_count = self.team_counts[TEAM_WHITE]
+            black_count = self.team_counts[TEAM_BLACK]
             
             # רק אם אחד הצדדים איבד את כל הכלים
-            if len(white_pieces) == 0 and len(black_pieces) > 0:
+            if white_count == 0 and black_count > 0:
                 self.game_over = True
-                self.winner = black_pieces[0]
+                self.winner = self._first_piece_of_team(TEAM_BLACK)
                 return True
-            elif len(black_pieces) == 0 and len(white_pieces) > 0:
+            elif black_count == 0 and white_count > 0:
                 self.game_over = True
-                self.winner = white_pieces[0]
+                self.winner = self._first_piece_of_team(TEAM_WHITE)
                 return True
-            elif len(white_pieces) == 0 and len(black_pieces) == 0:
+            elif white_count == 0 and black_count == 0:
                 self.game_over = True
                 self.winner = None  # תיקו
                 return True
@@ -783,6 +1057,9 @@ class Game:
             print(f"Error checking win condition: {e}")
             return False
 
+    def _first_piece_of_team(self, team: int) -> Optional[Piece]:
+        return next((p for p in self.pieces if p.team == team), None)
+
     def _announce_win(self):
         """הכרזת המנצח"""
         try:
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from Command import Command
+
+
+def _cell(cell) -> Optional[list]:
+    return list(cell) if cell is not None else None
+
+
+@dataclass(slots=True)
+class PieceMoved:
+    """Payload of "piece_moved" - published for every accepted Move/Jump command."""
+    piece_id: str
+    command: Command
+    position: Optional[Tuple[int, int]]   # משבצת היעד (שורה, עמודה)
+
+    def to_message(self) -> dict:
+        """JSON-ready fields for clients (the command itself stays on the server)."""
+        return {"piece_id": self.piece_id, "position": _cell(self.position)}
+
+
+@dataclass(slots=True)
+class PieceCaptured:
+    """Payload of "piece_captured"."""
+    captured_piece: str
+    capturing_piece: str
+    position: Optional[Tuple[int, int]]
+
+    def to_message(self) -> dict:
+        return {"captured_piece": self.captured_piece, "capturing_piece": self.capturing_piece,
+                "position": _cell(self.position)}
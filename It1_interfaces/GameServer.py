@@ -0,0 +1,336 @@
+import asyncio
+import collections
+import json
+import pathlib
+import random
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from Board import Board
+from Clock import ManualClock
+from Game import Game
+from Piece import Piece, TEAM_WHITE, TEAM_BLACK
+
+try:
+    import websockets
+except ImportError:  # WebSocket הוא אופציונלי - TCP עובד בלי התלות
+    websockets = None
+
+
+class Room:
+    """One game hosted by the server, ticked by its own coroutine.
+
+    The room owns a ``Game`` driven by a ManualClock: every tick freezes
+    the room's time, drains the commands clients sent since the last tick
+    (``_process_input``) and resolves collisions, exactly like
+    ``Game.run`` but without a window.  Game events are broadcast as
+    NDJSON to every client in the room.
+    """
+
+    def __init__(self, room_id: str, pieces: List[Piece], board: Board, tick_hz: float = 30):
+        self.room_id = room_id
+        self.clock = ManualClock()
+        self.game = Game(pieces, board, clock=self.clock)
+        self.game.animate_sprites = False
+        self.game.start()
+        self.period = 1.0 / tick_hz
+        self.tick_index = 0
+        self.clients: Set["ClientConnection"] = set()
+        # קבוצה -> הלקוח ששולט בה; לקוח בלי קבוצה רק צופה
+        self.seats: Dict[int, "ClientConnection"] = {}
+        self.closed = False
+        # איחור תחילת הטיק מול הלו"ז ומשך הטיק (שניות) - לבנצ'מרק ולניטור
+        self.lateness = collections.deque(maxlen=1024)
+        self.durations = collections.deque(maxlen=1024)
+        self.game.event_bus.subscribe("piece_moved", self._broadcast_event)
+        self.game.event_bus.subscribe("piece_captured", self._broadcast_event)
+
+    def describe(self) -> dict:
+        return {"room": self.room_id, "now_ms": self.clock.now_ms(), "pieces": [
+            {"piece_id": p.piece_id, "type": p.piece_type, "team": p.team,
+             "cell": list(p.current_state.physics.get_cell_pos())} for p in self.game.pieces]}
+
+    def _broadcast_event(self, event):
+        self.broadcast({"event": event.name, "room": self.room_id, **event.data.to_message()})
+
+    def broadcast(self, message: dict):
+        for client in list(self.clients):
+            client.send(message)
+
+    def request_move(self, piece_id: str, target_cell, is_jump: bool = False,
+                     team: Optional[int] = None) -> bool:
+        """Validate a move with the game rules; accepted moves are applied on the next tick.
+
+        With `team`, only that team's pieces may be moved.
+        """
+        piece = next((p for p in self.game.pieces if p.piece_id == piece_id), None)
+        if piece is None or (team is not None and piece.team != team):
+            return False
+        return self.game._attempt_move(piece, list(target_cell), is_jump)
+
+    def take_seat(self, client: "ClientConnection", team: int) -> bool:
+        """Bind `client` to `team` in this room; False if another client holds it."""
+        holder = self.seats.get(team)
+        if holder is not None and holder is not client:
+            return False
+        self.leave_seat(client)
+        self.seats[team] = client
+        client.teams[self] = team
+        return True
+
+    def leave_seat(self, client: "ClientConnection"):
+        team = client.teams.pop(self, None)
+        if team is not None and self.seats.get(team) is client:
+            del self.seats[team]
+
+    def tick(self, now_ms: int):
+        self.tick_index += 1
+        self.clock.set(now_ms)
+        self.game._tick(now_ms, self.tick_index)
+        if self.game._is_win():
+            self.closed = True
+            winner = self.game.winner.team if self.game.winner is not None else None
+            self.broadcast({"event": "game_over", "room": self.room_id, "winner": winner})
+
+    async def autoplay(self, seed: int = 0, every_s: float = 1.0):
+        """Random legal moves every ~`every_s` seconds - load tests and demos."""
+        rng = random.Random(seed)
+        while not self.closed:
+            await asyncio.sleep(every_s * rng.uniform(0.5, 1.5))
+            if not self.game.pieces:
+                return
+            piece = rng.choice(self.game.pieces)
+            table = piece.current_state.moves.compiled()
+            moves = table.legal_moves(*piece.current_state.physics.get_cell_pos(),
+                                      self.game.occupancy.bitboard)
+            if moves:
+                self.request_move(piece.piece_id, rng.choice(moves))
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start
+        while not self.closed:
+            deadline += self.period
+            delay = deadline - loop.time()
+            # גם כשמאחרים מוותרים על המעבד - שאר החדרים והלקוחות צריכים לרוץ
+            await asyncio.sleep(max(delay, 0))
+            begin = loop.time()
+            self.lateness.append(begin - deadline)
+            if begin - deadline > self.period:
+                deadline = begin  # לא "משלימים" טיקים שהוחמצו
+            self.tick(int((begin - start) * 1000))
+            self.durations.append(loop.time() - begin)
+
+
+class ClientConnection:
+    """A connected client; `write` pushes one NDJSON line to the transport.
+
+    A client moves only the team it joined with.  `trusted` lifts that
+    check - only for in-process relays that authenticate their own
+    users (the ShardSupervisor worker's forwarder), never for sockets.
+    """
+
+    def __init__(self, write: Callable[[str], None], trusted: bool = False):
+        self._write = write
+        self.trusted = trusted
+        self.rooms: Set[Room] = set()
+        self.teams: Dict[Room, int] = {}
+
+    def send(self, message: dict):
+        try:
+            self._write(json.dumps(message) + "\n")
+        except Exception as e:
+            print(f"Error sending to client: {e}")
+
+
+class GameServer:
+    """Hosts many rooms in one asyncio event loop.
+
+    Clients speak newline-delimited JSON over TCP (``serve_tcp``) or
+    WebSocket (``serve_websocket``, needs the ``websockets`` package):
+
+        {"op": "create", "room": "r1"}
+        {"op": "join", "room": "r1", "team": "white"}
+        {"op": "move", "room": "r1", "piece_id": "QW_1a2b", "to": [3, 3], "jump": false}
+        {"op": "leave", "room": "r1"}
+
+    Every request gets a reply line ``{"ok": ..., ...}``; game events are
+    pushed to the room's clients as they happen.  "join" with a team
+    ("white"/"black" or 1/2) takes that side, one client per side;
+    without one the client only watches.  A client may move only its
+    own team's pieces, and every move goes through the game's own
+    validation (cooldown, move table, capture rules).
+    """
+
+    TEAMS = {"white": TEAM_WHITE, "w": TEAM_WHITE, "1": TEAM_WHITE,
+             "black": TEAM_BLACK, "b": TEAM_BLACK, "2": TEAM_BLACK}
+
+    def __init__(self, room_factory: Callable[[], Tuple[List[Piece], Board]], tick_hz: float = 30):
+        self.room_factory = room_factory
+        self.tick_hz = tick_hz
+        self.rooms: Dict[str, Room] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    # ------------------------------------------------------------ rooms
+    def create_room(self, room_id: str) -> Room:
+        if room_id in self.rooms:
+            return self.rooms[room_id]
+        pieces, board = self.room_factory()
+        room = Room(room_id, pieces, board, self.tick_hz)
+        self.rooms[room_id] = room
+        self._tasks[room_id] = asyncio.get_running_loop().create_task(room.run())
+        return room
+
+    async def close_room(self, room_id: str):
+        room = self.rooms.pop(room_id, None)
+        task = self._tasks.pop(room_id, None)
+        if room is not None:
+            room.closed = True
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def close(self):
+        for room_id in list(self.rooms):
+            await self.close_room(room_id)
+
+    # ------------------------------------------------------------ protocol
+    def handle_message(self, client: ClientConnection, message: dict) -> dict:
+        op = message.get("op")
+        room_id = message.get("room")
+        if op == "create":
+            room = self.create_room(room_id)
+            return {"ok": True, **room.describe()}
+        room = self.rooms.get(room_id)
+        if room is None:
+            return {"ok": False, "error": f"no such room: {room_id}"}
+        if op == "join":
+            team = None
+            if message.get("team") is not None:
+                team = self.TEAMS.get(str(message["team"]).lower())
+                if team is None:
+                    return {"ok": False, "error": f"unknown team: {message['team']}"}
+                if not room.take_seat(client, team):
+                    return {"ok": False, "error": f"team {team} is already taken in {room_id}"}
+            room.clients.add(client)
+            client.rooms.add(room)
+            return {"ok": True, "team": team, **room.describe()}
+        if op == "leave":
+            room.leave_seat(client)
+            room.clients.discard(client)
+            client.rooms.discard(room)
+            return {"ok": True, "room": room_id}
+        if op == "move":
+            team = client.teams.get(room)
+            if team is None and not client.trusted:
+                return {"ok": False, "error": "join the room with a team to move"}
+            accepted = room.request_move(message["piece_id"], message["to"], bool(message.get("jump")),
+                                         team=None if client.trusted else team)
+            return {"ok": accepted, "room": room_id}
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    def _handle_line(self, client: ClientConnection, line: str):
+        line = line.strip()
+        if not line:
+            return
+        try:
+            reply = self.handle_message(client, json.loads(line))
+        except (ValueError, KeyError, TypeError) as e:
+            reply = {"ok": False, "error": f"bad request: {e}"}
+        client.send(reply)
+
+    def _disconnect(self, client: ClientConnection):
+        for room in client.rooms:
+            room.leave_seat(client)
+            room.clients.discard(client)
+        client.rooms.clear()
+
+    # ------------------------------------------------------------ transports
+    async def _tcp_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = ClientConnection(lambda text: writer.write(text.encode("utf-8")))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._handle_line(client, line.decode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._disconnect(client)
+            writer.close()
+
+    async def serve_tcp(self, host: str = "127.0.0.1", port: int = 8765):
+        """Start the NDJSON-over-TCP listener; returns the asyncio server."""
+        return await asyncio.start_server(self._tcp_client, host, port)
+
+    async def _ws_client(self, websocket, path: Optional[str] = None):
+        loop = asyncio.get_running_loop()
+        client = ClientConnection(lambda text: loop.create_task(websocket.send(text)))
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    message = message.decode("utf-8")
+                for line in message.splitlines():
+                    self._handle_line(client, line)
+        finally:
+            self._disconnect(client)
+
+    async def serve_websocket(self, host: str = "127.0.0.1", port: int = 8766):
+        """Start the NDJSON-over-WebSocket listener (one or more lines per message)."""
+        if websockets is None:
+            raise RuntimeError("WebSocket support needs the 'websockets' package")
+        return await websockets.serve(self._ws_client, host, port)
+
+
+class StandardRoomFactory:
+    """Room factory for the standard 8x8 setup: ``factory() -> (pieces, board)``.
+
+    The board and piece templates are loaded on the first call, so the
+    object itself is just a path and can be pickled to worker processes.
+    """
+
+    SETUP = [(code, (row, col)) for code, row in (("PW", 1), ("PB", 6)) for col in range(8)] + \
+            [(code + team, (row, col)) for team, row in (("W", 0), ("B", 7))
+             for col, code in enumerate("RNBQKBNR")]
+
+    def __init__(self, pieces_root: Optional[pathlib.Path] = None):
+        self.pieces_root = pieces_root or pathlib.Path(__file__).resolve().parent.parent / "pieces"
+        self._board = None
+        self._factory = None
+
+    def __getstate__(self):
+        return {"pieces_root": self.pieces_root, "_board": None, "_factory": None}
+
+    def __call__(self):
+        from PhysicsWorld import PhysicsWorld
+        if self._factory is None:
+            from main import create_board
+            from PieceFactory import PieceFactory
+            self._board = create_board()
+            self._factory = PieceFactory(self._board, self.pieces_root)
+        world = PhysicsWorld()  # עולם נפרד לכל חדר
+        return [self._factory.create_piece(code, cell, world) for code, cell in self.SETUP], self._board
+
+
+def main():
+    import sys
+
+    async def serve():
+        server = GameServer(StandardRoomFactory())
+        tcp = await server.serve_tcp(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+        print(f"Game server listening on {tcp.sockets[0].getsockname()}")
+        if websockets is not None:
+            await server.serve_websocket()
+        async with tcp:
+            await tcp.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
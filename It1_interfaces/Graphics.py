@@ -1,88 +1,87 @@
 import pathlib
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple, Optional
-import copy
-import glob
+from typing import Dict, Tuple, Optional
 from img import Img
 from Command import Command
+from SpriteCache import sprite_files, sprite_loader
 
 
 
+def blank_img(cell_size: Tuple[int, int]) -> Img:
+    """A transparent cell - what a piece shows when no frame is decoded at all."""
+    import numpy as np
+    img = Img()
+    img.img = np.zeros((cell_size[1], cell_size[0], 4), dtype=np.uint8)
+    return img
+
+
 class Graphics:
+    """Frames and timing of one piece state, shared by every piece of that type.
+
+    Immutable once built: per-piece animation progress (when the state
+    was entered, the current frame) lives in the piece's State record,
+    which asks ``frame_at`` / ``is_finished`` with its elapsed time.
+    Timing comes from the number of frame files, so it is the same
+    whether or not the frames have been decoded yet; ``get_img`` returns
+    None until they are, and never decodes on the calling thread.
+    """
+
     def __init__(self,
                  sprites_folder: pathlib.Path,
                  cell_size: tuple[int, int],
                  loop: bool = True,
-                 fps: float = 6.0):
+                 fps: float = 6.0,
+                 lazy: bool = False):
         self.sprites_folder = sprites_folder
         self.cell_size = cell_size
         self.loop = loop
         self.fps = fps
-        self.sprites = []
+        self.atlas = None
+        self._pending = None  # פענוח ברקע שעוד לא נאסף
         self.frame_duration_ms = int(1000 / fps)
-        self.current_frame = 0
-        self.start_time_ms = 0
-        self.current_command = None
-        self._load_sprites()
+        # מספר הפריימים מרשימת הקבצים - התזמון לא תלוי בפענוח (תיקייה ריקה: ריבוע ברירת מחדל אחד)
+        self.frame_count = max(1, len(sprite_files(sprites_folder)))
+        if not lazy:
+            self._load_sprites()
 
     def _load_sprites(self):
+        """Fetch the decoded frames from the shared sprite cache (disk only on a miss)."""
+        self.atlas = sprite_loader.load(self.sprites_folder, self.cell_size)
 
-        if not self.sprites_folder.exists():
-            return
-            
-        extensions = ['*.png', '*.jpg', '*.jpeg', '*.bmp']
-        sprite_files = []
-        
-        for ext in extensions:
-            sprite_files.extend(glob.glob(str(self.sprites_folder / ext)))
-        
-        sprite_files.sort()  # Ensure consistent ordering
-        
-        for sprite_file in sprite_files:
-            try:
-                sprite = Img().read(sprite_file, size=self.cell_size, keep_aspect=True)
-                self.sprites.append(sprite)
-            except Exception as e:
-                print(f"Failed to load sprite {sprite_file}: {e}")
-        
-        # If no sprites found, create a default colored square
-        if not self.sprites:
-            import numpy as np
-            default_img = Img()
-            default_img.img = np.full((self.cell_size[1], self.cell_size[0], 4), 
-                                    [100, 100, 255, 255], dtype=np.uint8)
-            self.sprites.append(default_img)
+    def prefetch(self):
+        """Start decoding the frames on the loader pool if they are not decoded yet."""
+        if self.atlas is None and self._pending is None:
+            self._pending = sprite_loader.submit(self.sprites_folder, self.cell_size)
 
-    def copy(self):
-        new_graphics = Graphics(self.sprites_folder, self.cell_size, self.loop, self.fps)
-        new_graphics.sprites = self.sprites.copy()
-        new_graphics.current_frame = self.current_frame
-        new_graphics.start_time_ms = self.start_time_ms
-        new_graphics.current_command = self.current_command
-        return new_graphics
+    def _ready_atlas(self):
+        """The decoded frames if they are available now; otherwise start decoding and return None."""
+        if self.atlas is None:
+            if self._pending is None:
+                self.prefetch()
+            if not self._pending.done():
+                return None
+            self.atlas = self._pending.result()
+        return self.atlas
 
-    def reset(self, cmd: Command):
-        self.current_command = cmd
-        self.start_time_ms = cmd.timestamp
-        self.current_frame = 0
+    def is_ready(self) -> bool:
+        """The frames are decoded (starts the decode in the background if not)."""
+        return self._ready_atlas() is not None
 
-    def update(self, now_ms: int):
-        if not self.sprites or self.start_time_ms == 0:
-            return
-        elapsed_ms = now_ms - self.start_time_ms
+    def frame_at(self, elapsed_ms: int) -> int:
+        """Frame index `elapsed_ms` after the state was entered (looping or holding the last)."""
         frame_index = int(elapsed_ms / self.frame_duration_ms)
-        
         if self.loop:
-            self.current_frame = frame_index % len(self.sprites)
-        else:
-            self.current_frame = min(frame_index, len(self.sprites) - 1)
+            return frame_index % self.frame_count
+        return min(frame_index, self.frame_count - 1)
 
-    def get_img(self) -> Img:
+    def is_finished(self, elapsed_ms: int) -> bool:
+        """A non-looping animation has shown its last frame for a full frame time."""
+        return self.loop or elapsed_ms >= self.frame_count * self.frame_duration_ms
 
-        if not self.sprites:
-            empty_img = Img()
-            import numpy as np
-            empty_img.img = np.zeros((self.cell_size[1], self.cell_size[0], 4), dtype=np.uint8)
-            return empty_img
-            
-        return self.sprites[self.current_frame]
\ No newline at end of file
+    def get_img(self, frame_index: int = 0) -> Optional[Img]:
+        """Frame `frame_index`, or None while the frames are still decoding - never waits for them."""
+        atlas = self._ready_atlas()
+        if atlas is None:
+            return None
+        frames = atlas.frames
+        return frames[min(frame_index, len(frames) - 1)]
@@ -7,8 +7,11 @@ class GraphicsFactory:
     def load(self,
              sprites_dir: pathlib.Path,
              cfg: dict,
-             cell_size: tuple[int, int]) -> Graphics:
-        loop = cfg.get('loop', True) if cfg else True
-        fps = cfg.get('fps', 6.0) if cfg else 6.0
+             cell_size: tuple[int, int],
+             lazy: bool = False) -> Graphics:
+        # מפתחות config.json של המצבים (is_loop, frames_per_sec), או השמות הקצרים
+        cfg = cfg or {}
+        loop = cfg.get('is_loop', cfg.get('loop', True))
+        fps = cfg.get('frames_per_sec', cfg.get('fps', 6.0))
         
-        return Graphics(sprites_dir, cell_size, loop, fps)
\ No newline at end of file
+        return Graphics(sprites_dir, cell_size, loop, fps, lazy)
\ No newline at end of file
@@ -0,0 +1,60 @@
+from typing import List, Optional
+
+from Board import Board
+from Clock import ManualClock
+from Command import Command
+from Game import Game
+from Piece import Piece
+
+
+class HeadlessEngine:
+    """Runs the game rules with no window, no rendering and simulated time.
+
+    The same ``Piece.update`` / ``Game._process_input`` /
+    ``Game._resolve_collisions`` code as ``Game.run`` is driven by an
+    injected clock, so games can be simulated much faster than real time
+    (load tests, regression runs, bots).
+    """
+
+    def __init__(self, pieces: List[Piece], board: Board, clock: Optional[ManualClock] = None):
+        self.clock = clock if clock is not None else ManualClock()
+        self.game = Game(pieces, board, clock=self.clock)
+        self.game.animate_sprites = False
+        self.ticks = 0
+        self.game.start()
+
+    @property
+    def now_ms(self) -> int:
+        return self.clock.now_ms()
+
+    def is_over(self) -> bool:
+        return self.game._is_win()
+
+    def apply(self, cmd: Command):
+        """Queue an accepted command; it is processed on the next step()."""
+        self.game.user_input_queue.put(cmd)
+
+    def request_move(self, piece: Piece, target_cell, is_jump: bool = False) -> bool:
+        """Ask for a move through the same validation a player's key press uses."""
+        return self.game._attempt_move(piece, list(target_cell), is_jump)
+
+    def step(self, dt_ms: int) -> bool:
+        """Advance simulated time by `dt_ms` and run one tick. Returns True while the game goes on."""
+        self.clock.advance(dt_ms)
+        self.tick()
+        return not self.is_over()
+
+    def tick(self):
+        """One simulation tick at the clock's current time."""
+        self.ticks += 1
+        self.game._tick(self.clock.now_ms(), self.ticks)
+
+    def run_for(self, duration_ms: int, dt_ms: int = 33) -> int:
+        """Step until `duration_ms` of game time has passed or the game ends; returns ticks run."""
+        end_ms = self.clock.now_ms() + duration_ms
+        ticks = 0
+        while self.clock.now_ms() < end_ms:
+            ticks += 1
+            if not self.step(min(dt_ms, end_ms - self.clock.now_ms())):
+                break
+        return ticks
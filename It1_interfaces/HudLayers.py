@@ -0,0 +1,164 @@
+import collections
+from typing import Callable, Dict, Hashable, Tuple
+
+import cv2
+import numpy as np
+
+from img import Img
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+class Layer(Img):
+    """Pre-rendered text and shapes with their own coverage mask.
+
+    Primitives are drawn twice: in color over black into `img` and in
+    white into `alpha` (cv2's antialiasing mishandles a 4th channel, so
+    coverage is kept as a separate plane).  Antialiased edges therefore
+    fade color and coverage together - the colors are premultiplied -
+    and ``draw_on`` blends with "premultiplied over",
+    dst * (255 - a) / 255 + color, rather than Img's straight alpha.
+    A layer is treated as immutable once it has been drawn.
+    """
+
+    def __init__(self, width: int, height: int):
+        super().__init__()
+        self.img = np.zeros((height, width, 3), dtype=np.uint8)
+        self.alpha = np.zeros((height, width), dtype=np.uint8)
+        self._blend = None
+
+    def rectangle(self, pt1, pt2, color, thickness: int = 1):
+        cv2.rectangle(self.img, pt1, pt2, color, thickness)
+        cv2.rectangle(self.alpha, pt1, pt2, 255, thickness)
+
+    def circle(self, center, radius: int, color, thickness: int = 1):
+        cv2.circle(self.img, center, radius, color, thickness)
+        cv2.circle(self.alpha, center, radius, 255, thickness)
+
+    def text(self, text: str, org, font_scale: float, color, thickness: int = 1):
+        cv2.putText(self.img, text, org, FONT, font_scale, color, thickness)
+        cv2.putText(self.alpha, text, org, FONT, font_scale, 255, thickness)
+
+    def _blend_layers(self):
+        if self._blend is None:
+            self._blend = cv2.merge([255 - self.alpha] * 3)
+        return self._blend
+
+    def draw_on(self, other_img, x, y):
+        """Blend this layer onto `other_img` with its top-left at (x, y), clipped.
+
+        Two saturating SIMD passes, dst * (255 - a) / 255 (rounded) then
+        + color: opaque pixels come out as the layer color and transparent
+        ones untouched, so there is no per-pixel mask work.  Only the color
+        channels of the target are written.
+        """
+        inv_alpha = self._blend_layers()
+        x, y = int(x), int(y)
+        h, w = self.alpha.shape
+        H, W = other_img.img.shape[:2]
+        x0, y0, x1, y1 = max(x, 0), max(y, 0), min(x + w, W), min(y + h, H)
+        if x0 >= x1 or y0 >= y1:
+            return
+        src = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+        roi = other_img.img[y0:y1, x0:x1]
+        if roi.shape[2] == 3:
+            cv2.multiply(roi, inv_alpha[src], dst=roi, scale=1 / 255)
+            cv2.add(roi, self.img[src], dst=roi)
+        else:
+            rgb = cv2.multiply(np.ascontiguousarray(roi[..., :3]), inv_alpha[src], scale=1 / 255)
+            roi[..., :3] = cv2.add(rgb, self.img[src])
+
+
+def paste(dst: Layer, src: Layer, x: int, y: int):
+    """Composite layer `src` over layer `dst` (both premultiplied) at (x, y)."""
+    h, w = src.alpha.shape
+    H, W = dst.alpha.shape
+    x0, y0, x1, y1 = max(x, 0), max(y, 0), min(x + w, W), min(y + h, H)
+    if x0 >= x1 or y0 >= y1:
+        return
+    region = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+    alpha = src.alpha[region].astype(np.uint32)
+    for dst_plane, src_plane, a in ((dst.img[y0:y1, x0:x1], src.img[region], alpha[..., None]),
+                                    (dst.alpha[y0:y1, x0:x1], src.alpha[region], alpha)):
+        acc = dst_plane * (255 - a)
+        acc += src_plane.astype(np.uint32) * 255
+        acc += 128
+        acc += acc >> 8
+        acc >>= 8
+        np.copyto(dst_plane, np.minimum(acc, 255), casting='unsafe')
+
+
+class LayerCache:
+    """LRU of pre-rendered layers keyed by exactly what they show.
+
+    ``get(key, build)`` returns the cached layer or calls `build()` once;
+    a layer whose key (say, the selected piece or the piece counts) has
+    not changed is never drawn again - it is only blended.
+    """
+
+    def __init__(self, capacity: int = 128):
+        self.capacity = capacity
+        self._layers: "collections.OrderedDict[Hashable, Layer]" = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], Layer]) -> Layer:
+        layer = self._layers.get(key)
+        if layer is not None:
+            self._layers.move_to_end(key)
+            self.hits += 1
+            return layer
+        self.misses += 1
+        layer = build()
+        self._layers[key] = layer
+        if len(self._layers) > self.capacity:
+            self._layers.popitem(last=False)
+        return layer
+
+    def clear(self):
+        self._layers.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"layers": len(self._layers), "hits": self.hits, "misses": self.misses}
+
+
+class GlyphAtlas:
+    """Pre-rendered glyphs of one text style, for short strings that change often.
+
+    Countdowns like "2.7s" take a new value every 100 ms; instead of
+    rasterizing them with cv2.putText each time, every glyph is rendered
+    once and a string is assembled from them at the advances reported by
+    ``cv2.getTextSize``.  (Hershey glyphs are placed with sub-pixel
+    precision by putText, so the result can differ from it by a pixel.)
+    """
+
+    def __init__(self, chars: str, font_scale: float, color: Tuple[int, int, int],
+                 thickness: int = 1):
+        font = self.font = FONT
+        self.font_scale = font_scale
+        self.thickness = thickness
+        self.color = color
+        (_, ascent), descent = cv2.getTextSize(chars, font, font_scale, thickness)
+        self.ascent = ascent + thickness
+        self.glyphs: Dict[str, Layer] = {}
+        self.advances: Dict[str, int] = {}
+        for ch in chars:
+            (width, _), _ = cv2.getTextSize(ch, font, font_scale, thickness)
+            glyph = Layer(width + 2 * thickness + 2, self.ascent + descent + thickness + 1)
+            glyph.text(ch, (thickness, self.ascent), font_scale, color, thickness)
+            self.glyphs[ch] = glyph
+            self.advances[ch] = width
+
+    def draw(self, target: Img, text: str, x: int, y: int):
+        """Draw `text` with its baseline origin at (x, y), like cv2.putText."""
+        left = x - self.thickness
+        top = y - self.ascent
+        for ch in text:
+            glyph = self.glyphs.get(ch)
+            if glyph is None:  # תו שלא באטלס - ציור רגיל
+                cv2.putText(target.img, ch, (left + self.thickness, y), self.font, self.font_scale,
+                            self.color, self.thickness)
+                left += cv2.getTextSize(ch, self.font, self.font_scale, self.thickness)[0][0]
+                continue
+            glyph.draw_on(target, left, top)
+            left += self.advances[ch]
@@ -0,0 +1,94 @@
+import collections
+import time
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+import cv2
+
+NO_KEY = 255
+
+# תזוזת סמן לכל פעולת כיוון - (שורה, עמודה)
+CURSOR_STEPS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+
+class KeyEvent(NamedTuple):
+    key: int
+    captured_at: float  # time.perf_counter() ברגע הקריאה מהחלון
+
+
+class KeyBindings:
+    """Table from key code to (player, action); player 0 means "either player".
+
+    Actions are the CURSOR_STEPS directions, "move", "jump", "reset",
+    "stats" (frame-timing overlay) and "quit".  Codes are the low byte
+    returned by ``cv2.waitKey`` (arrow keys arrive as 81-84 on GTK/Qt,
+    which shadows 'Q', 'R', 'S' and 'T' - the arrows win, as they always
+    did).
+    """
+
+    DEFAULT = {
+        # Player 1 - חיצים + Enter + J לקפיצה
+        82: (1, "up"), 84: (1, "down"), 81: (1, "left"), 83: (1, "right"),
+        13: (1, "move"), 10: (1, "move"), ord('j'): (1, "jump"), ord('J'): (1, "jump"),
+        # Player 2 - WASD + רווח + K לקפיצה
+        ord('w'): (2, "up"), ord('W'): (2, "up"), ord('s'): (2, "down"),
+        ord('a'): (2, "left"), ord('A'): (2, "left"), ord('d'): (2, "right"), ord('D'): (2, "right"),
+        ord(' '): (2, "move"), ord('k'): (2, "jump"), ord('K'): (2, "jump"),
+        # מקשים כלליים
+        ord('q'): (0, "quit"), 27: (0, "quit"), ord('r'): (0, "reset"), ord('i'): (0, "stats"),
+    }
+
+    def __init__(self, table: Optional[Dict[int, Tuple[int, str]]] = None):
+        self.table = dict(self.DEFAULT if table is None else table)
+
+    def bind(self, key: int, player: int, action: str):
+        self.table[key] = (player, action)
+
+    def get(self, key: int) -> Optional[Tuple[int, str]]:
+        return self.table.get(key)
+
+
+def _wait_key() -> int:
+    key = cv2.waitKey(1) & 0xFF
+    if key == 0 or key == 224:  # מקש מיוחד - הקוד האמיתי מגיע בקריאה הבאה
+        key = cv2.waitKey(1) & 0xFF
+    return key
+
+
+class InputPump:
+    """Captures key presses with their wall-clock time for the simulation thread.
+
+    HighGUI only delivers keys to the thread that owns the window, so the
+    pump runs on the main thread: ``pump_until(deadline)`` replaces the
+    frame-pacing sleep and keeps polling ``waitKey`` until the next frame
+    is due, so no key waits for a frame boundary.  Events go into a deque,
+    whose append/popleft are atomic - the producer never takes a lock and
+    the simulation drains it once per tick with ``drain_until``.
+    """
+
+    def __init__(self, read_key: Callable[[], int] = _wait_key,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.read_key = read_key
+        self.clock = clock
+        self.events = collections.deque()
+        self.captured = 0
+
+    def poll(self) -> bool:
+        """Read at most one key; returns True if one was captured."""
+        key = self.read_key()
+        if key == NO_KEY:
+            return False
+        self.events.append(KeyEvent(key, self.clock()))
+        self.captured += 1
+        return True
+
+    def pump_until(self, deadline: float):
+        """Keep capturing keys until clock() reaches `deadline` (at least one poll)."""
+        self.poll()
+        while self.clock() < deadline:
+            self.poll()
+
+    def drain_until(self, wall_time: float) -> Iterator[KeyEvent]:
+        """Pop, in capture order, every event captured up to `wall_time`."""
+        events = self.events
+        while events and events[0].captured_at <= wall_time:
+            yield events.popleft()
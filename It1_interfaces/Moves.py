@@ -1,6 +1,92 @@
 # Moves.py  – drop-in replacement
+import math
 import pathlib
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+
+class MoveTable:
+    """Move rules of one piece type compiled once for a given board size.
+
+    Offsets that repeat one direction 1..k steps (rook, queen, the pawn's
+    double step) become slider rays whose intermediate cells must be
+    empty; everything else is a leaper.  Per-cell destination bitmasks
+    (bit ``r * W + c``) are built lazily and cached, so a legality check or
+    an all-moves query is a dict lookup plus a few bit tests against the
+    board's occupancy bitboard.
+    """
+
+    def __init__(self, rules: List[Tuple[int, int]], dims: Tuple[int, int]):
+        self.board_height, self.board_width = dims
+        # (d_row, d_col) -> cells between the source and the target that must be empty
+        self.paths: Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]] = {}
+        self.rays: List[Tuple[Tuple[int, int], ...]] = []
+        self._dest_masks: Dict[Tuple[int, int], int] = {}
+
+        # כל שורה ב-moves.txt היא "d_row,d_col", כמו Moves.get_moves
+        offsets = {(dr, dc) for dr, dc in rules if (dr, dc) != (0, 0)}
+        directions: Dict[Tuple[int, int], List[int]] = {}
+        for dr, dc in offsets:
+            g = math.gcd(dr, dc)
+            directions.setdefault((dr // g, dc // g), []).append(g)
+
+        for (ur, uc), steps in directions.items():
+            steps.sort()
+            # קרן רציפה 1..k - כל משבצת ביניים חייבת להיות ריקה
+            run = 0
+            while run < len(steps) and steps[run] == run + 1:
+                run += 1
+            if run > 1:
+                self.rays.append(tuple((ur * k, uc * k) for k in range(1, run + 1)))
+            for k in steps:
+                between = tuple((ur * i, uc * i) for i in range(1, k)) if k <= run else ()
+                self.paths[(ur * k, uc * k)] = between
+
+    def _bit(self, r: int, c: int) -> int:
+        return 1 << (r * self.board_width + c)
+
+    def destination_mask(self, r: int, c: int) -> int:
+        """Bitboard of every cell the rules reach from (r, c), ignoring blockers."""
+        mask = self._dest_masks.get((r, c))
+        if mask is None:
+            mask = 0
+            for dr, dc in self.paths:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < self.board_height and 0 <= nc < self.board_width:
+                    mask |= self._bit(nr, nc)
+            self._dest_masks[(r, c)] = mask
+        return mask
+
+    def is_legal(self, from_r: int, from_c: int, to_r: int, to_c: int, occupied: int = 0) -> bool:
+        """The target is reachable and no piece stands on the way (the target itself may be taken)."""
+        if not (self.destination_mask(from_r, from_c) >> (to_r * self.board_width + to_c)) & 1:
+            return False
+        for dr, dc in self.paths[(to_r - from_r, to_c - from_c)]:
+            if (occupied >> ((from_r + dr) * self.board_width + from_c + dc)) & 1:
+                return False
+        return True
+
+    def legal_moves(self, r: int, c: int, occupied: int = 0) -> List[Tuple[int, int]]:
+        """All targets from (r, c); slider rays stop at (and include) the first occupied cell."""
+        blocked = 0
+        for ray in self.rays:
+            hit = False
+            for dr, dc in ray:
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < self.board_height and 0 <= nc < self.board_width):
+                    break
+                if hit:
+                    blocked |= self._bit(nr, nc)
+                elif (occupied >> (nr * self.board_width + nc)) & 1:
+                    hit = True
+        mask = self.destination_mask(r, c) & ~blocked
+        moves = []
+        while mask:
+            low = mask & -mask
+            index = low.bit_length() - 1
+            moves.append(divmod(index, self.board_width))
+            mask ^= low
+        return moves
+
 
 class Moves:
    
@@ -9,8 +95,15 @@ class Moves:
         self.txt_path = txt_path
         self.dims = dims
         self.rules = []
+        self.table: Optional[MoveTable] = None
         self._load_rules()
 
+    def compiled(self) -> MoveTable:
+        """The rules compiled into a MoveTable (built once, shared by copies)."""
+        if self.table is None:
+            self.table = MoveTable(self.rules, self.dims)
+        return self.table
+
     def _load_rules(self):
         """טעינת חוקי התנועה מהקובץ"""
         try:
@@ -22,16 +115,16 @@ class Moves:
                             # תיקון: טיפול בפורמטים שונים
                             parts = line.split(",")
                             if len(parts) >= 2:
-                                dx = int(parts[0].strip())
-                                dy = int(parts[1].strip())
-                                self.rules.append((dx, dy))
+                                dr = int(parts[0].strip())
+                                dc = int(parts[1].strip())
+                                self.rules.append((dr, dc))
                         except ValueError as e:
                             print(f"Warning: Invalid move format at line {line_num}: '{line}' - {e}")
                             continue
         except FileNotFoundError:
             print(f"Warning: Moves file not found: {self.txt_path}")
             # ברירת מחדל: תנועות בסיסיות
-            self.rules = [(0,1), (0,-1), (1,0), (-1,0)]  # up, down, right, left
+            self.rules = [(0,1), (0,-1), (1,0), (-1,0)]  # right, left, down, up
         except Exception as e:
             print(f"Error loading moves from {self.txt_path}: {e}")
             self.rules = [(0,1), (0,-1), (1,0), (-1,0)]
@@ -39,16 +132,17 @@ class Moves:
     def get_moves(self, r: int, c: int) -> List[Tuple[int, int]]:
         """קבלת כל המהלכים האפשריים ממיקום נתון"""
         moves = []
-        for dx, dy in self.rules:
-            nr, nc = r + dy, c + dx  # תיקון: dy לשורה, dx לעמודה
+        for dr, dc in self.rules:
+            nr, nc = r + dr, c + dc  # moves.txt: שורה ואז עמודה
             if 0 <= nr < self.board_height and 0 <= nc < self.board_width:
                 moves.append((nr, nc))
         return moves
 
     def can_move_to(self, from_r: int, from_c: int, to_r: int, to_c: int) -> bool:
         """בדיקה האם מהלך מסוים חוקי"""
-        possible_moves = self.get_moves(from_r, from_c)
-        return (to_r, to_c) in possible_moves
+        if not (0 <= to_r < self.board_height and 0 <= to_c < self.board_width):
+            return False
+        return self.compiled().is_legal(from_r, from_c, to_r, to_c)
 
     def get_move_vector(self, from_r: int, from_c: int, to_r: int, to_c: int) -> Tuple[int, int]:
         """קבלת וקטור התנועה בין שתי נקודות"""
@@ -62,4 +156,5 @@ class Moves:
         new_moves.txt_path = self.txt_path
         new_moves.dims = self.dims
         new_moves.rules = self.rules.copy()
+        new_moves.table = self.table
         return new_moves
\ No newline at end of file
@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class OccupancyGrid:
+    """H×W index of which piece rests on each cell.
+
+    Every piece gets a slot number; ``cells[r, c]`` holds the slot of the
+    piece standing there (or ``EMPTY``).  The grid is kept up to date
+    incrementally by the game and by ``Physics`` so lookups never scan
+    the piece list.
+    """
+
+    EMPTY = -1
+
+    def __init__(self, H_cells: int, W_cells: int):
+        self.H_cells = H_cells
+        self.W_cells = W_cells
+        self.cells = np.full((H_cells, W_cells), self.EMPTY, dtype=np.int32)
+        # bitboard: ביט r*W+c דולק כשהמשבצת תפוסה - לבדיקות חסימה של MoveTable
+        self.bitboard = 0
+        self.slots: List[Optional[object]] = []
+        self.slot_cells: List[Optional[Tuple[int, int]]] = []
+        self._free_slots: List[int] = []
+        self._slot_by_piece_id: Dict[str, int] = {}
+
+    def in_bounds(self, r: int, c: int) -> bool:
+        return 0 <= r < self.H_cells and 0 <= c < self.W_cells
+
+    def add(self, piece, cell: Tuple[int, int]) -> int:
+        """Register a piece on `cell` and return its slot."""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self.slots[slot] = piece
+            self.slot_cells[slot] = None
+        else:
+            slot = len(self.slots)
+            self.slots.append(piece)
+            self.slot_cells.append(None)
+        self._slot_by_piece_id[piece.piece_id] = slot
+        self.move(slot, cell)
+        return slot
+
+    def remove(self, slot: int):
+        """Remove a piece (e.g. after a capture) and release its slot."""
+        if slot < 0 or slot >= len(self.slots) or self.slots[slot] is None:
+            return
+        self.vacate(slot)
+        self._slot_by_piece_id.pop(self.slots[slot].piece_id, None)
+        self.slots[slot] = None
+        self._free_slots.append(slot)
+
+    def vacate(self, slot: int):
+        """Take a piece off the board without forgetting it (piece in flight)."""
+        cell = self.slot_cells[slot]
+        if cell is not None and self.cells[cell] == slot:
+            self.cells[cell] = self.EMPTY
+            self.bitboard &= ~(1 << (cell[0] * self.W_cells + cell[1]))
+        self.slot_cells[slot] = None
+
+    def move(self, slot: int, cell: Tuple[int, int]):
+        """Place `slot` on `cell`, clearing the cell it rested on before."""
+        r, c = int(round(cell[0])), int(round(cell[1]))
+        self.vacate(slot)
+        if self.in_bounds(r, c):
+            self.cells[r, c] = slot
+            self.slot_cells[slot] = (r, c)
+            self.bitboard |= 1 << (r * self.W_cells + c)
+
+    def slot_of(self, piece) -> int:
+        return self._slot_by_piece_id.get(piece.piece_id, self.EMPTY)
+
+    def cell_of(self, slot: int) -> Optional[Tuple[int, int]]:
+        return self.slot_cells[slot]
+
+    def piece_at(self, r: int, c: int):
+        """O(1) lookup of the piece resting on (r, c)."""
+        if not self.in_bounds(r, c):
+            return None
+        slot = self.cells[r, c]
+        if slot == self.EMPTY:
+            return None
+        return self.slots[slot]
+
+    def is_occupied(self, r: int, c: int) -> bool:
+        return self.in_bounds(r, c) and self.cells[r, c] != self.EMPTY
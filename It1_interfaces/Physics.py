@@ -1,13 +1,62 @@
 from typing import Tuple, Optional
 from Command import Command
-from Board import Board
+from Board import Board, parse_cell_name
+from PhysicsWorld import PhysicsWorld, STATE_CODES, STATE_NAMES
 import math
 
 
+def _optional_number(array_name: str):
+    """Scalar row of a PhysicsWorld array; NaN <-> None."""
+    def fget(self):
+        value = getattr(self.world, array_name)[self.index]
+        return None if math.isnan(value) else int(value)
+
+    def fset(self, value):
+        getattr(self.world, array_name)[self.index] = math.nan if value is None else value
+    return property(fget, fset)
+
+
+def _number(array_name: str):
+    def fget(self):
+        return int(getattr(self.world, array_name)[self.index])
+
+    def fset(self, value):
+        getattr(self.world, array_name)[self.index] = value
+    return property(fget, fset)
+
+
+def _optional_cell(array_name: str):
+    """(row, col) row of a PhysicsWorld array; NaN <-> None."""
+    def fget(self):
+        r, c = getattr(self.world, array_name)[self.index]
+        return None if math.isnan(r) else (int(r), int(c))
+
+    def fset(self, value):
+        getattr(self.world, array_name)[self.index] = (math.nan, math.nan) if value is None else value
+    return property(fget, fset)
+
+
 class Physics:
+    """Per-piece physics API - a thin view on one row of a `PhysicsWorld`."""
+
     SLIDE_CELLS_PER_SEC = 4.0 
 
-    def __init__(self, start_cell: Tuple[int, int], board: Board, speed_m_s: float = 1.0):
+    # כל השדות המספריים יושבים בעולם - למופע נשארים רק אלה
+    __slots__ = ("world", "index", "board", "speed_m_s", "start_cell",
+                 "can_be_captured_flag", "can_capture_flag", "current_command")
+
+    move_from_cell = _optional_cell("from_cell")
+    target_cell = _optional_cell("target")
+    start_time_ms = _optional_number("start_ms")
+    duration_ms = _optional_number("duration_ms")
+    cooldown_start_ms = _number("cooldown_start_ms")
+    cooldown_duration_ms = _number("cooldown_duration_ms")
+
+    def __init__(self, start_cell: Tuple[int, int], board: Board, speed_m_s: float,
+                 world: PhysicsWorld):
+        # אין עולם משותף - כל משחק/חדר מעדכן רק את השורות של העולם שלו
+        self.world = world
+        self.index = self.world.allocate()
         self.board = board
         self.speed_m_s = speed_m_s
         
@@ -15,34 +64,52 @@ class Physics:
         self.start_cell = tuple(start_cell)
         self.current_cell = tuple(start_cell)
         
-        # משתנים לתזוזה
-        self.target_cell: Optional[Tuple[int, int]] = None
-        self.start_time_ms: Optional[int] = None
-        self.duration_ms: Optional[int] = None
-        
-        # ניהול מצבים
-        self.state = "Idle"
-        
-        # ניהול קוד השהיה
-        self.cooldown_start_ms = 0
-        self.cooldown_duration_ms = 0
-        
         # יכולות אכילה
         self.can_be_captured_flag = True
         self.can_capture_flag = True
         
         self.current_command = None
 
-    def copy(self):
-        """יצירת עותק של האובייקט"""
-        new_physics = Physics(self.start_cell, self.board, self.speed_m_s)
-        new_physics.current_cell = self.current_cell
-        new_physics.target_cell = self.target_cell
-        new_physics.start_time_ms = self.start_time_ms
-        new_physics.duration_ms = self.duration_ms
-        new_physics.state = self.state
-        new_physics.cooldown_start_ms = self.cooldown_start_ms
-        new_physics.cooldown_duration_ms = self.cooldown_duration_ms
+    # מיקום ומצב נשמרים במערכים של העולם
+    @property
+    def current_cell(self) -> Tuple[float, float]:
+        r, c = self.world.pos[self.index]
+        return (float(r), float(c))
+
+    @current_cell.setter
+    def current_cell(self, cell):
+        self.world.pos[self.index] = cell
+
+    @property
+    def state(self) -> str:
+        return STATE_NAMES[int(self.world.state[self.index])]
+
+    @state.setter
+    def state(self, name: str):
+        self.world.state[self.index] = STATE_CODES[name]
+
+    @property
+    def occupancy(self):
+        return self.world.occupancy[self.index]
+
+    @property
+    def occupancy_slot(self) -> int:
+        return self.world.occupancy_slot[self.index]
+
+    def bind_occupancy(self, occupancy, slot: int):
+        """Attach the game's occupancy grid so arrivals keep it up to date."""
+        self.world.occupancy[self.index] = occupancy
+        self.world.occupancy_slot[self.index] = slot
+
+    def release(self):
+        """Give the world row back (the piece was captured or this view was replaced)."""
+        self.world.release(self.index)
+
+    def copy(self, world: Optional[PhysicsWorld] = None):
+        """יצירת עותק של האובייקט - שורה חדשה באותו עולם (או בעולם אחר, למשל חדר אחר בשרת)"""
+        world = world if world is not None else self.world
+        new_physics = Physics(self.start_cell, self.board, self.speed_m_s, world)
+        world.copy_row(self.index, new_physics.index, self.world)
         new_physics.can_be_captured_flag = self.can_be_captured_flag
         new_physics.can_capture_flag = self.can_capture_flag
         new_physics.current_command = self.current_command
@@ -71,11 +138,12 @@ class Physics:
 
     def _handle_move_command(self, cmd: Command):
         """טיפול בפקודת תזוזה - תיקון להשהיה של 4 שניות"""
-        start_pos = self._parse_position(cmd.params[0])
-        target_pos = self._parse_position(cmd.params[1])
+        start_pos = self._cell_param(cmd.params[0])
+        target_pos = self._cell_param(cmd.params[1])
         
         if start_pos and target_pos:
             self.current_cell = start_pos
+            self.move_from_cell = start_pos
             self.target_cell = target_pos
             
             # חישוב משך התזוזה על בסיס המרחק
@@ -102,24 +170,27 @@ class Physics:
         self.cooldown_start_ms = cmd.timestamp + self.duration_ms  # אחרי הקפיצה!
         self.cooldown_duration_ms = 1000  # שנייה אחת
     
-    def _parse_position(self, pos_str: str) -> Optional[Tuple[int, int]]:
-        """המרת מחרוזת מיקום (כמו 'e2') לקואורדינטות"""
-        if not isinstance(pos_str, str) or len(pos_str) != 2:
-            return None
-        
-        try:
-            col = ord(pos_str[0].lower()) - ord('a')
-            row = int(pos_str[1]) - 1
-            
-            if 0 <= col < self.board.W_cells and 0 <= row < self.board.H_cells:
-                return (row, col)
-        except (ValueError, IndexError):
-            pass
-        
+    def _cell_param(self, value) -> Optional[Tuple[int, int]]:
+        """משבצת (שורה, עמודה) מפרמטר של פקודה - None אם מחוץ ללוח.
+
+        Commands carry integer cells; a notation string ('e2') is still
+        accepted for command logs and clients from before that.
+        """
+        if isinstance(value, str):
+            cell = parse_cell_name(value)
+        else:
+            try:
+                r, c = value
+                cell = (int(r), int(c))
+            except (TypeError, ValueError):
+                cell = None
+        if cell is not None and self.board.in_bounds(*cell):
+            return cell
         return None
 
     def update(self, now_ms: int):
         """עדכון מצב הפיזיקה"""
+        self.world.prev_pos[self.index] = self.world.pos[self.index]
         if self.start_time_ms is None:
             return
             
@@ -136,17 +207,16 @@ class Physics:
             # התזוזה הסתיימה
             if self.target_cell:
                 self.current_cell = self.target_cell
+                if self.occupancy is not None:
+                    self.occupancy.move(self.occupancy_slot, self.target_cell)
             self.state = "Idle"
             # שיקום יכולת האכילה רק אחרי קוד השהיה
         elif self.duration_ms and self.target_cell:
             # חישוב מיקום ביניים - תיקון חשוב!
             ratio = min(elapsed_ms / self.duration_ms, 1.0)
             
-            # וודא שה-current_cell הוא tuple של מספרים שלמים לפני החישוב
-            if isinstance(self.current_cell, tuple) and len(self.current_cell) == 2:
-                r1, c1 = self.current_cell
-            else:
-                r1, c1 = self.start_cell
+            # אינטרפולציה ליניארית מנקודת ההתחלה של ההחלקה - מסלול צפוי לחיזוי התנגשויות
+            r1, c1 = self.move_from_cell if self.move_from_cell else self.start_cell
             
             r2, c2 = self.target_cell
             
@@ -181,10 +251,13 @@ class Physics:
 
     def get_pos(self) -> Tuple[float, float]:
         """קבלת המיקום המדויק (לא מעוגל) לחישובי ציור"""
-        if isinstance(self.current_cell, tuple) and len(self.current_cell) == 2:
-            return (float(self.current_cell[0]), float(self.current_cell[1]))
-        return (0.0, 0.0)
+        return self.current_cell
     
+    def get_prev_pos(self) -> Tuple[float, float]:
+        """המיקום בעדכון הקודם - לאינטרפולציה בציור"""
+        r, c = self.world.prev_pos[self.index]
+        return (float(r), float(c))
+
     def get_cell_pos(self) -> Tuple[int, int]:
         """קבלת המיקום המעוגל לבדיקת התנגשויות"""
         r, c = self.get_pos()
@@ -220,6 +293,8 @@ class Physics:
         self.start_cell = tuple(cell)
         self.target_cell = None
         self.state = "Idle"
+        if self.occupancy is not None:
+            self.occupancy.move(self.occupancy_slot, self.current_cell)
     
     def stop_movement(self):
         """עצירת תנועה מיידית"""
@@ -230,6 +305,8 @@ class Physics:
             # החזרת יכולות לרגיל
             self.can_be_captured_flag = True
             self.can_capture_flag = True
+            if self.occupancy is not None:
+                self.occupancy.move(self.occupancy_slot, self.get_cell_pos())
     def can_pass_through(self, now_ms: int) -> bool:
         """בדיקה האם כלי יכול לעבור דרך (במהלך קפיצה)"""
         return self.state == "Jumping"
@@ -1,12 +1,15 @@
 from Board import Board
 from Physics import Physics
+from PhysicsWorld import PhysicsWorld
 
 
 class PhysicsFactory:      # very light for now
-    def __init__(self, board: Board): 
+    def __init__(self, board: Board, world: PhysicsWorld = None): 
         self.board = board
+        # כל הכלים של המפעל חולקים עולם פיזיקה אחד (מערכים רציפים)
+        self.world = world if world is not None else PhysicsWorld()
         
     def create(self, start_cell, cfg) -> Physics:
         """Create a physics object with the given configuration."""
         speed = cfg.get("speed", 1.0) if cfg else 1.0
-        return Physics(start_cell, self.board, speed)
+        return Physics(start_cell, self.board, speed, self.world)
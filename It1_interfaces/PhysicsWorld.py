@@ -0,0 +1,129 @@
+from typing import List, Optional
+
+import numpy as np
+
+
+STATE_IDLE = 0
+STATE_MOVING = 1
+STATE_JUMPING = 2
+
+STATE_NAMES = {STATE_IDLE: "Idle", STATE_MOVING: "Moving", STATE_JUMPING: "Jumping"}
+STATE_CODES = {name: code for code, name in STATE_NAMES.items()}
+
+
+class PhysicsWorld:
+    """Struct-of-arrays storage for the physics of many pieces.
+
+    Every `Physics` object is a thin view on one row of these arrays.
+    ``update`` advances all slides and jumps at once with NumPy, so a
+    tick costs about the same for 32 or 10,000 pieces.  ``None`` values
+    of the per-piece API (no target, no start time) are stored as NaN.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = 0
+        self.size = 0
+        self._free: List[int] = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.pos = np.zeros((0, 2))
+        self.prev_pos = np.zeros((0, 2))
+        self.from_cell = np.zeros((0, 2))
+        self.target = np.zeros((0, 2))
+        self.start_ms = np.zeros(0)
+        self.duration_ms = np.zeros(0)
+        self.state = np.zeros(0, dtype=np.int8)
+        self.cooldown_start_ms = np.zeros(0)
+        self.cooldown_duration_ms = np.zeros(0)
+        # קישור לאינדקס התפוסה - נגיעה רק בכלים שסיימו החלקה
+        self.occupancy: List[Optional[object]] = []
+        self.occupancy_slot: List[int] = []
+        self._grow(capacity)
+
+    _ARRAYS = ("alive", "pos", "prev_pos", "from_cell", "target", "start_ms",
+               "duration_ms", "state", "cooldown_start_ms", "cooldown_duration_ms")
+
+    def _grow(self, capacity: int):
+        for name in self._ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self.occupancy.extend([None] * (capacity - self.capacity))
+        self.occupancy_slot.extend([-1] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def allocate(self) -> int:
+        """Reserve a row for a new Physics view."""
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow(max(2 * self.capacity, 16))
+            index = self.size
+            self.size += 1
+        self.alive[index] = True
+        self.pos[index] = self.prev_pos[index] = 0.0
+        self.from_cell[index] = self.target[index] = np.nan
+        self.start_ms[index] = self.duration_ms[index] = np.nan
+        self.state[index] = STATE_IDLE
+        self.cooldown_start_ms[index] = self.cooldown_duration_ms[index] = 0
+        self.occupancy[index] = None
+        self.occupancy_slot[index] = -1
+        return index
+
+    def release(self, index: int):
+        if self.alive[index]:
+            self.alive[index] = False
+            self.occupancy[index] = None
+            self._free.append(index)
+
+    def copy_row(self, src: int, dst: int, source: Optional["PhysicsWorld"] = None):
+        """Copy row `src` (of `source`, default this world) into row `dst`."""
+        source = source if source is not None else self
+        for name in self._ARRAYS:
+            getattr(self, name)[dst] = getattr(source, name)[src]
+        self.occupancy[dst] = source.occupancy[src]
+        self.occupancy_slot[dst] = source.occupancy_slot[src]
+
+    def update(self, now_ms: float):
+        """Advance every slide and jump to `now_ms` in one vectorized pass."""
+        n = self.size
+        pos, state = self.pos[:n], self.state[:n]
+        self.prev_pos[:n] = pos
+
+        elapsed = now_ms - self.start_ms[:n]  # NaN where there is no start time
+        duration = self.duration_ms[:n]
+        with np.errstate(invalid='ignore'):
+            timed = self.alive[:n] & (duration > 0)
+            finished = timed & (elapsed >= duration)
+
+            # החלקות שהסתיימו - הכלי מגיע ליעד
+            arrived = finished & (state == STATE_MOVING)
+            has_target = ~np.isnan(self.target[:n, 0])
+            landed = arrived & has_target
+            pos[landed] = self.target[:n][landed]
+            state[arrived] = STATE_IDLE
+
+            # החלקות באמצע - אינטרפולציה ליניארית מנקודת ההתחלה
+            sliding = timed & ~finished & (state == STATE_MOVING) & has_target \
+                & ~np.isnan(self.from_cell[:n, 0])
+            if sliding.any():
+                ratio = (elapsed[sliding] / duration[sliding])[:, None]
+                start = self.from_cell[:n][sliding]
+                pos[sliding] = start + (self.target[:n][sliding] - start) * ratio
+
+            # קפיצות שהסתיימו
+            state[finished & (state == STATE_JUMPING)] = STATE_IDLE
+
+        for index in np.flatnonzero(landed):
+            occupancy = self.occupancy[index]
+            if occupancy is not None:
+                occupancy.move(self.occupancy_slot[index],
+                               (int(self.target[index, 0]), int(self.target[index, 1])))
+
+    def in_cooldown(self, now_ms: float) -> np.ndarray:
+        """Boolean mask of rows still inside their cooldown window."""
+        n = self.size
+        start = self.cooldown_start_ms[:n]
+        return self.alive[:n] & (start != 0) & (now_ms < start + self.cooldown_duration_ms[:n])
+
@@ -1,18 +1,40 @@
 from Board import Board
 from Command import Command
+from RenderSnapshot import PieceView
 from State import State
-import cv2
+import sys
+
+# קודי קבוצה - זהים למספר השחקן ששולט בכלי
+TEAM_NONE = 0
+TEAM_WHITE = 1
+TEAM_BLACK = 2
+
 
 class Piece:
-    def __init__(self, piece_id: str, init_state: State):
-        """Initialize a piece with ID and initial state."""
-        self.piece_id = piece_id
+    __slots__ = ("piece_id", "piece_type", "team", "current_state", "last_update_time",
+                 "cooldown_end_time", "is_jumping", "jump_end_time", "last_move_timestamp")
+
+    def __init__(self, piece_id: str, init_state: State,
+                 piece_type: str = "", team: int = TEAM_NONE):
+        """Initialize a piece with ID, initial state, type letter (e.g. "Q") and team code."""
+        self.piece_id = sys.intern(piece_id)
+        self.piece_type = piece_type
+        self.team = team
         self.current_state = init_state
         self.last_update_time = 0
+        # מצב המשחק של הכלי (השהיה, קפיצה, זמן תזוזה אחרונה) - מתעדכן ע"י Game
+        self.reset_game_state()
+
+    def reset_game_state(self):
+        self.cooldown_end_time = 0
+        self.is_jumping = False
+        self.jump_end_time = 0
+        self.last_move_timestamp = 0
 
     def on_command(self, cmd: Command, now_ms: int):
         if cmd.piece_id == self.piece_id:
-            self.current_state = self.current_state.get_state_after_command(cmd, now_ms)
+            # מעבר בטבלת המצבים המשותפת - בלי העתקות ובלי הקצאות
+            self.current_state.reset(cmd)
 
     def reset(self, start_ms: int):
         self.last_update_time = start_ms
@@ -24,58 +46,38 @@ class Piece:
         self.current_state = self.current_state.update(now_ms)
         self.last_update_time = now_ms
 
-    def draw_on_board(self, board: Board, now_ms: int):
-        """ציור הכלי על הלוח - תיקון לטיפול בקפיצה"""
-        sprite_img = self.current_state.graphics.get_img()
-        
-        # קבלת המיקום המדויק מהפיזיקה
+    def get_render_pos(self, alpha: float = 1.0):
+        """Position interpolated `alpha` of the way from the previous tick to the current one."""
         cell_r, cell_c = self.current_state.physics.get_pos()
-        
-        # המרה לפיקסלים
-        pixel_x = int(cell_c * board.cell_W_pix)
-        pixel_y = int(cell_r * board.cell_H_pix)
-        
-        # אם הכלי קופץ, הוסף אפקט חזותי
-        if self.current_state.physics.is_in_air(now_ms):
-            # הוסף צל או שנה את גובה הציור
-            pixel_y -= 10  # הרם את הכלי מעלה
-            self._draw_shadow(board, pixel_x, pixel_y + 10, now_ms)
-        
-        # ציור הספרייט
-        try:
-            sprite_img.draw_on(board.img, pixel_x, pixel_y)
-        except Exception as e:
-            print(f"Error drawing piece {self.piece_id}: {e}")
-        
-        # הוספת אינדיקטור קוד השהיה
-        if not self.current_state.physics.can_be_captured(now_ms):
-            self._draw_cooldown_overlay(board, pixel_x, pixel_y, now_ms)
-    def _draw_shadow(self, board: Board, x: int, y: int, now_ms: int):
-        """ציור צל לכלי קופץ"""
-        try:
-            import cv2
-            # ציור עיגול אפור כצל
-            center_x = x + board.cell_W_pix // 2
-            center_y = y + board.cell_H_pix // 2
-            radius = min(board.cell_W_pix, board.cell_H_pix) // 4
-            cv2.circle(board.img.img, (center_x, center_y), radius, (128, 128, 128, 128), -1)
-        except:
-            pass
+        if alpha >= 1.0:
+            return cell_r, cell_c
+        prev_r, prev_c = self.current_state.physics.get_prev_pos()
+        return prev_r + (cell_r - prev_r) * alpha, prev_c + (cell_c - prev_c) * alpha
+
+    def render_view(self, now_ms: int) -> PieceView:
+        """Immutable snapshot of what the renderer needs to draw this piece at `now_ms`."""
+        state = self.current_state
+        physics = state.physics
+        cooldown_end = physics.cooldown_start_ms + physics.cooldown_duration_ms
+        return PieceView(self.piece_id, self.piece_type, self.team, physics.state,
+                         state.frame_index, state.image(),
+                         physics.get_pos(), physics.get_prev_pos(), physics.is_in_air(now_ms),
+                         not physics.can_be_captured(now_ms) and now_ms < cooldown_end,
+                         self.is_jumping, now_ms < self.cooldown_end_time, self.cooldown_end_time)
+
+    # הציור עצמו נמצא ב-PieceView - חוט הרינדור מצייר מתמונת מצב בלבד
+    def get_draw_rect(self, board: Board, now_ms: int, alpha: float = 1.0):
+        """Pixel rectangle (x0, y0, x1, y1) touched by draw_on_board."""
+        return self.render_view(now_ms).draw_rect(board, alpha)
+
+    def get_draw_signature(self, board: Board, now_ms: int, alpha: float = 1.0):
+        """Everything that changes how the piece looks; equal signatures draw identical pixels."""
+        return self.render_view(now_ms).signature(board, alpha)
+
+    def draw_on_board(self, board: Board, now_ms: int, alpha: float = 1.0):
+        """ציור הכלי על הלוח"""
+        self.render_view(now_ms).draw(board, alpha)
 
-    def _draw_cooldown_overlay(self, board: Board, x: int, y: int, now_ms: int):
-        """ציור אינדיקטור קוד השהיה"""
-        cooldown_end = (self.current_state.physics.cooldown_start_ms + 
-                       self.current_state.physics.cooldown_duration_ms)
-        
-        if now_ms < cooldown_end:
-            # ציור מסגרת אדומה לציון קוד השהיה
-            try:
-                cv2.rectangle(board.img.img, 
-                            (x, y), 
-                            (x + board.cell_W_pix - 1, y + board.cell_H_pix - 1), 
-                            (0, 0, 255), 3)  # מסגרת אדומה
-            except:
-                pass
     def can_collide_with(self, other_piece: "Piece", now_ms: int) -> bool:
         """בדיקה האם שני כלים יכולים להתנגש"""
         # כלי שקופץ לא יכול להתנגש
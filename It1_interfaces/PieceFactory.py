@@ -1,12 +1,25 @@
 import pathlib
+import time
 from typing import Dict, Tuple
 import json
 from Board import Board
 from GraphicsFactory import GraphicsFactory
 from Moves import Moves
 from PhysicsFactory import PhysicsFactory
-from Piece import Piece
-from State import State
+from PhysicsWorld import PhysicsWorld
+from Piece import Piece, TEAM_NONE, TEAM_WHITE, TEAM_BLACK
+from SpriteCache import SpriteSet, sprite_loader
+from State import State, StateMachine
+
+
+TEAM_CODES = {"W": TEAM_WHITE, "B": TEAM_BLACK}
+
+
+def parse_piece_code(p_type: str) -> Tuple[str, int]:
+    """'QW' -> ('Q', TEAM_WHITE), 'PB' -> ('P', TEAM_BLACK); unknown names get TEAM_NONE."""
+    if len(p_type) == 2 and p_type[1].upper() in TEAM_CODES:
+        return p_type[0].upper(), TEAM_CODES[p_type[1].upper()]
+    return p_type, TEAM_NONE
 
 
 class PieceFactory:
@@ -16,25 +29,94 @@ class PieceFactory:
         self.graphics_factory = GraphicsFactory()
         self.physics_factory = PhysicsFactory(board)
         self.piece_templates = {}
+        # כל ערכות הספרייטים של כל המצבים (סוג כלי -> שם מצב -> SpriteSet), מתגלות מראש
+        self.sprite_sets: Dict[str, Dict[str, SpriteSet]] = {}
+        self.startup_ms = 0.0
+        self.eager_sets = 0
         self._load_piece_templates()
 
     def _load_piece_templates(self):
-        """Load all piece templates from the pieces directory."""
+        """Load all piece templates from the pieces directory.
+
+        Every state's sprite folder is discovered, but only the set a piece
+        starts in is decoded now, all of them in parallel on the sprite
+        loader's pool; the rest are decoded on first use or when
+        prefetched.
+        """
         if not self.pieces_root.exists():
             print(f"Pieces directory not found: {self.pieces_root}")
             return
 
-        for piece_dir in self.pieces_root.iterdir():
-            if piece_dir.is_dir():
+        began = time.perf_counter()
+        cell_size = (self.board.cell_W_pix, self.board.cell_H_pix)
+        piece_dirs = [d for d in sorted(self.pieces_root.iterdir()) if d.is_dir()]
+        initial = {}
+        for piece_dir in piece_dirs:
+            self.sprite_sets[piece_dir.name] = self._discover_sprite_sets(piece_dir, cell_size)
+            initial[piece_dir.name] = self._initial_sprites_dir(piece_dir)
+            sprite_loader.submit(initial[piece_dir.name], cell_size, reason="eager")
+        self.eager_sets = len(set(initial.values()))
+
+        for piece_dir in piece_dirs:
+            try:
+                state_machine = self._build_state_machine(piece_dir, initial[piece_dir.name])
+                self.piece_templates[piece_dir.name] = state_machine
+                print(f"Loaded piece template: {piece_dir.name}")
+            except Exception as e:
+                print(f"Failed to load piece template {piece_dir.name}: {e}")
+        self.startup_ms = (time.perf_counter() - began) * 1000
+        report = self.load_report()
+        print(f"Loaded {report['templates']} piece templates in {self.startup_ms:.0f} ms: "
+              f"{report['eager_sets']} sprite sets decoded eagerly (loader pool: {sprite_loader.max_workers} threads), "
+              f"{report['deferred_sets']} discovered for lazy loading")
+
+    def _discover_sprite_sets(self, piece_dir: pathlib.Path,
+                              cell_size: Tuple[int, int]) -> Dict[str, SpriteSet]:
+        """states/<name>/sprites of one piece type, with each state's config.json - nothing decoded."""
+        sets = {}
+        states_dir = piece_dir / "states"
+        if not states_dir.exists():
+            return sets
+        for state_dir in sorted(states_dir.iterdir()):
+            sprites_dir = state_dir / "sprites"
+            if not sprites_dir.is_dir():
+                continue
+            config = {}
+            config_file = state_dir / "config.json"
+            if config_file.exists():
                 try:
-                    state_machine = self._build_state_machine(piece_dir)
-                    self.piece_templates[piece_dir.name] = state_machine
-                    print(f"Loaded piece template: {piece_dir.name}")
+                    with open(config_file, 'r', encoding='utf-8') as f:
+                        config = json.load(f)
                 except Exception as e:
-                    print(f"Failed to load piece template {piece_dir.name}: {e}")
-                        
-    def _build_state_machine(self, piece_dir: pathlib.Path) -> State:
-        """בניית מכונת מצבים - תיקון ליצירת moves נכון"""
+                    print(f"Failed to load config for {piece_dir.name}/{state_dir.name}: {e}")
+            sets[state_dir.name] = SpriteSet(state_dir.name, sprites_dir, cell_size, config)
+        return sets
+
+    @staticmethod
+    def _initial_sprites_dir(piece_dir: pathlib.Path) -> pathlib.Path:
+        """Sprite folder a new piece shows: idle, else the first state with sprites, else the piece's own."""
+        states_dir = piece_dir / "states"
+        if states_dir.exists():
+            idle_sprites_dir = states_dir / "idle" / "sprites"
+            if idle_sprites_dir.exists():
+                return idle_sprites_dir
+            for state_subdir in sorted(states_dir.iterdir()):
+                candidate_sprites_dir = state_subdir / "sprites"
+                if candidate_sprites_dir.exists():
+                    return candidate_sprites_dir
+        sprites_dir = piece_dir / "sprites"
+        return sprites_dir if sprites_dir.exists() else piece_dir
+
+    def load_report(self) -> dict:
+        """What was decoded at startup and what is left (or was decoded later) lazily."""
+        sets = [s for by_state in self.sprite_sets.values() for s in by_state.values()]
+        loaded = sum(1 for s in sets if s.is_loaded)
+        return {"templates": len(self.piece_templates), "discovered_sets": len(sets),
+                "eager_sets": self.eager_sets, "deferred_sets": len(sets) - min(loaded, len(sets)),
+                "startup_ms": self.startup_ms, **sprite_loader.stats()}
+
+    def _build_state_machine(self, piece_dir: pathlib.Path, sprites_dir: pathlib.Path) -> State:
+        """בניית מכונת המצבים של סוג כלי (פעם אחת) ורשומת ריצה לתבנית"""
         config_file = piece_dir / "config.json"
         config = {}
         
@@ -54,49 +136,39 @@ class PieceFactory:
             # Create default moves file with safe default
             moves_file.parent.mkdir(parents=True, exist_ok=True)
             with open(moves_file, 'w', encoding='utf-8') as f:
-                f.write("# Default moves - one step in each direction\n")
-                f.write("0,1\n")   # up
-                f.write("0,-1\n")  # down  
-                f.write("1,0\n")   # right
-                f.write("-1,0\n")  # left
-                f.write("1,1\n")   # up-right
-                f.write("1,-1\n")  # down-right
-                f.write("-1,1\n")  # up-left
-                f.write("-1,-1\n") # down-left
+                f.write("# Default moves - one step in each direction (d_row,d_col)\n")
+                f.write("0,1\n")   # right
+                f.write("0,-1\n")  # left
+                f.write("1,0\n")   # down
+                f.write("-1,0\n")  # up
+                f.write("1,1\n")   # down-right
+                f.write("1,-1\n")  # down-left
+                f.write("-1,1\n")  # up-right
+                f.write("-1,-1\n") # up-left
         
         # תיקון: יצירת אובייקט Moves חדש לכל כלי
         moves = Moves(moves_file, (self.board.H_cells, self.board.W_cells))
+        moves.compiled()  # טבלת המהלכים נבנית פעם אחת לכל סוג ומשותפת לכל העותקים
         
-        # Load graphics from states directory
-        states_dir = piece_dir / "states"
-        sprites_dir = None
-        
-        if states_dir.exists():
-            idle_sprites_dir = states_dir / "idle" / "sprites"
-            if idle_sprites_dir.exists():
-                sprites_dir = idle_sprites_dir
-            else:
-                for state_subdir in states_dir.iterdir():
-                    candidate_sprites_dir = state_subdir / "sprites"
-                    if candidate_sprites_dir.exists():
-                        sprites_dir = candidate_sprites_dir
-                        break
-        
-        if sprites_dir is None:
-            sprites_dir = piece_dir / "sprites"
-            if not sprites_dir.exists():
-                sprites_dir = piece_dir
-
-        graphics = self.graphics_factory.load(sprites_dir, config.get('graphics', {}), cell_size)
+        # כל מצב מקבל גרפיקה משותפת אחת; רק ערכת ההתחלה פוענחה מראש, השאר בשימוש הראשון
+        states = {}
+        initial = "idle"
+        for name, sprite_set in self.sprite_sets.get(piece_dir.name, {}).items():
+            if sprite_set.folder == sprites_dir:
+                initial = name
+            states[name] = (self.graphics_factory.load(sprite_set.folder, sprite_set.config.get('graphics', {}),
+                                                       cell_size, lazy=sprite_set.folder != sprites_dir),
+                            sprite_set.config)
+        if initial not in states:
+            states = {initial: (self.graphics_factory.load(sprites_dir, config.get('graphics', {}), cell_size),
+                                config)}
         physics = self.physics_factory.create((0, 0), config.get('physics', {}))
         
-        # Create the idle state
-        idle_state = State(moves, graphics, physics)
-        
-        return idle_state
+        # מכונת המצבים נבנית פעם אחת לסוג; התבנית היא רשומת הריצה הראשונה עליה
+        return State(StateMachine(moves, states, initial), physics)
 
-    def create_piece(self, p_type: str, cell: Tuple[int, int]) -> Piece:
-        """יצירת כלי חדש מסוג מסוים"""
+    def create_piece(self, p_type: str, cell: Tuple[int, int], world: PhysicsWorld) -> Piece:
+        """יצירת כלי חדש מסוג מסוים (world: עולם הפיזיקה של המשחק/החדר - אחד לכל משחק)"""
         if p_type not in self.piece_templates:
             available_types = list(self.piece_templates.keys())
             raise ValueError(f"Unknown piece type: {p_type}. Available types: {available_types}")
@@ -104,8 +176,8 @@ class PieceFactory:
         # Clone the template state
         template_state = self.piece_templates[p_type]
         
-        # תיקון חשוב: יצירת עותק מלא של המצב
-        new_state = template_state.copy()
+        # רשומת ריצה חדשה על מכונת המצבים המשותפת - רק שורת הפיזיקה חדשה
+        new_state = template_state.copy(world)
         
         # הגדרת מיקום התחלתי
         new_state.physics.set_position(cell)
@@ -114,4 +186,6 @@ class PieceFactory:
         import uuid
         piece_id = f"{p_type}_{uuid.uuid4().hex[:8]}"
         
-        return Piece(piece_id, new_state)
\ No newline at end of file
+        # קוד סוג/קבוצה נקבע פעם אחת ביצירה - בלי חיפושי מחרוזות בזמן המשחק
+        piece_type, team = parse_piece_code(p_type)
+        return Piece(piece_id, new_state, piece_type, team)
\ No newline at end of file
@@ -0,0 +1,163 @@
+import collections
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import cv2
+
+from Board import Board
+
+
+class PieceView(NamedTuple):
+    """Immutable picture of one piece at the end of a tick - all the renderer may read.
+
+    `sprite` is the current animation frame (an Img inside the piece's
+    sprite atlas, never modified after loading) or None for pieces with
+    no graphics, which the game draws as a plain "demo" tile.
+    """
+    piece_id: str
+    piece_type: str
+    team: int
+    state: str
+    frame_index: int
+    sprite: object
+    pos: Tuple[float, float]
+    prev_pos: Tuple[float, float]
+    in_air: bool
+    shows_cooldown: bool
+    is_jumping: bool
+    in_cooldown: bool
+    cooldown_end_time: int
+
+    @property
+    def cell(self) -> Tuple[int, int]:
+        return (round(self.pos[0]), round(self.pos[1]))
+
+    def render_pos(self, alpha: float = 1.0):
+        """Position interpolated `alpha` of the way from the previous tick to this one."""
+        if alpha >= 1.0:
+            return self.pos
+        (prev_r, prev_c), (cell_r, cell_c) = self.prev_pos, self.pos
+        return prev_r + (cell_r - prev_r) * alpha, prev_c + (cell_c - prev_c) * alpha
+
+    def pixel_pos(self, board: Board, alpha: float = 1.0):
+        """מיקום הציור בפיקסלים (כולל הרמה בזמן קפיצה)"""
+        cell_r, cell_c = self.render_pos(alpha)
+        pixel_x = int(cell_c * board.cell_W_pix)
+        pixel_y = int(cell_r * board.cell_H_pix)
+        if self.in_air:
+            pixel_y -= 10  # הרם את הכלי מעלה
+        return pixel_x, pixel_y
+
+    def draw_rect(self, board: Board, alpha: float = 1.0):
+        """Pixel rectangle (x0, y0, x1, y1) touched by draw()."""
+        x, y = self.pixel_pos(board, alpha)
+        extra = 10 if self.in_air else 0
+        return (x, y, x + board.cell_W_pix, y + board.cell_H_pix + extra)
+
+    def signature(self, board: Board, alpha: float = 1.0):
+        """Everything that changes how the piece looks; equal signatures draw identical pixels."""
+        return (self.sprite, self.pixel_pos(board, alpha), self.in_air, self.shows_cooldown)
+
+    def draw(self, board: Board, alpha: float = 1.0):
+        """ציור הכלי על הלוח"""
+        pixel_x, pixel_y = self.pixel_pos(board, alpha)
+
+        # אם הכלי קופץ - צל מתחת לכלי המורם
+        if self.in_air:
+            center_x = pixel_x + board.cell_W_pix // 2
+            center_y = pixel_y + 10 + board.cell_H_pix // 2
+            radius = min(board.cell_W_pix, board.cell_H_pix) // 4
+            cv2.circle(board.img.img, (center_x, center_y), radius, (128, 128, 128, 128), -1)
+
+        try:
+            self.sprite.draw_on(board.img, pixel_x, pixel_y)
+        except Exception as e:
+            print(f"Error drawing piece {self.piece_id}: {e}")
+
+        # מסגרת אדומה לציון קוד השהיה, בתוך גבולות המשבצת
+        if self.shows_cooldown:
+            cv2.rectangle(board.img.img, (pixel_x + 2, pixel_y + 2),
+                          (pixel_x + board.cell_W_pix - 3, pixel_y + board.cell_H_pix - 3),
+                          (0, 0, 255), 3)
+
+
+class RenderSnapshot(NamedTuple):
+    """Everything one frame shows, captured by the simulation thread after a tick."""
+    tick_index: int
+    now_ms: int
+    alpha: float                         # שארית הטיק בזמן הפרסום
+    published_at: float                  # time.perf_counter() של הפרסום - לאינטרפולציה
+    pieces: Tuple[PieceView, ...]
+    cursors: Tuple[Tuple[int, Tuple[int, int]], ...]
+    selections: Tuple[Tuple[int, Tuple[int, int]], ...]
+    hud: tuple
+
+
+class SnapshotBuffer:
+    """Latest-wins handoff of immutable snapshots from the simulation to the renderer.
+
+    Because snapshots are never modified after publishing, the classic
+    triple buffer reduces to swapping one reference: the producer never
+    waits, and the consumer always draws the newest complete snapshot
+    (older ones it did not get to are simply skipped).  The renderer polls
+    `latest()` every frame instead of waiting for a newer snapshot: between
+    ticks it redraws the same one with a growing interpolation alpha.
+    """
+
+    def __init__(self):
+        # (מספר סידורי, תמונה) בהפניה אחת - הקורא תמיד מקבל זוג עקבי בלי מנעול
+        self._latest: Tuple[int, Optional[RenderSnapshot]] = (0, None)
+        self.published = 0
+
+    def publish(self, snapshot: RenderSnapshot):
+        self.published += 1
+        self._latest = (self.published, snapshot)
+
+    def latest(self) -> Tuple[int, Optional[RenderSnapshot]]:
+        return self._latest
+
+
+class FrameTimeline:
+    """Recent (start, end) intervals of each phase, per thread, in perf_counter seconds.
+
+    ``breakdown()`` reports the mean duration of every phase, how busy
+    each thread was over the window, and `overlap` - the share of the
+    render thread's work that ran while the simulation thread was busy
+    too (0 on a single serial loop).
+    """
+
+    THREADS = {"tick": "sim", "snapshot": "sim", "draw": "render", "show": "render"}
+
+    def __init__(self, size: int = 512):
+        self._phases: Dict[str, collections.deque] = {
+            phase: collections.deque(maxlen=size) for phase in self.THREADS}
+
+    def record(self, phase: str, start: float, end: float):
+        self._phases[phase].append((start, end))  # deque.append אטומי - בלי נעילה
+
+    def breakdown(self) -> dict:
+        phases = {phase: list(spans) for phase, spans in self._phases.items()}
+        spans = [s for v in phases.values() for s in v]
+        if not spans:
+            return {}
+        window_start = max(min(s for s, _ in v) for v in phases.values() if v)
+        window = max(e for _, e in spans) - window_start
+        result = {f"{phase}_ms": (sum(e - s for s, e in v) / len(v) * 1000) if v else 0.0
+                  for phase, v in phases.items()}
+        busy = {"sim": [], "render": []}
+        for phase, v in phases.items():
+            busy[self.THREADS[phase]].extend((max(s, window_start), e) for s, e in v if e > window_start)
+        for thread, intervals in busy.items():
+            intervals.sort()
+            result[f"{thread}_busy"] = sum(e - s for s, e in intervals) / window if window > 0 else 0.0
+        render_total = sum(e - s for s, e in busy["render"])
+        shared, i = 0.0, 0
+        sim = busy["sim"]
+        for start, end in busy["render"]:
+            while i < len(sim) and sim[i][1] <= start:
+                i += 1
+            j = i
+            while j < len(sim) and sim[j][0] < end:
+                shared += min(end, sim[j][1]) - max(start, sim[j][0])
+                j += 1
+        result["overlap"] = shared / render_total if render_total > 0 else 0.0
+        return result
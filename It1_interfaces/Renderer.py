@@ -0,0 +1,115 @@
+from typing import Callable, Dict, Hashable, List, Tuple
+
+import numpy as np
+
+from Board import Board
+from img import Img
+
+
+class Renderer:
+    """Incremental dirty-cell renderer.
+
+    Keeps one persistent frame buffer instead of cloning the board every
+    frame.  Each frame the caller registers its drawables (``add``) with a
+    stable id, a signature describing what it looks like and its pixel
+    rectangle.  Only cells whose content changed are restored from the
+    static board layer, and only the drawables touching those cells are
+    composited again (in registration order).
+    """
+
+    def __init__(self, board: Board):
+        self.board = board
+        self.static = board.img.img
+        frame = Img()
+        frame.img = self.static.copy()
+        self.frame_board = Board(
+            cell_H_pix=board.cell_H_pix,
+            cell_W_pix=board.cell_W_pix,
+            W_cells=board.W_cells,
+            H_cells=board.H_cells,
+            img=frame
+        )
+        self.dirty = np.ones((board.H_cells, board.W_cells), dtype=bool)
+        self._prev: Dict[Hashable, Tuple[Hashable, Tuple[int, int, int, int]]] = {}
+        self._items: List[Tuple[Hashable, Hashable, Tuple[int, int, int, int], Callable[[], None]]] = []
+        self.last_dirty_cells = 0
+
+    # ------------------------------------------------------------------ dirt
+    def invalidate_all(self):
+        self.dirty[:, :] = True
+
+    def mark_cells(self, cells: Tuple[int, int, int, int]):
+        """Mark a (r0, c0, r1, c1) half-open block of cells dirty."""
+        r0, c0, r1, c1 = cells
+        self.dirty[r0:r1, c0:c1] = True
+
+    def mark_rect(self, rect: Tuple[int, int, int, int]):
+        """Mark every cell touched by the pixel rectangle (x0, y0, x1, y1) dirty."""
+        self.mark_cells(self._rect_to_cells(rect))
+
+    def _rect_to_cells(self, rect: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        x0, y0, x1, y1 = rect
+        cw, ch = self.board.cell_W_pix, self.board.cell_H_pix
+        c0 = max(0, int(x0) // cw)
+        r0 = max(0, int(y0) // ch)
+        c1 = min(self.board.W_cells, -(-int(x1) // cw))
+        r1 = min(self.board.H_cells, -(-int(y1) // ch))
+        return (r0, c0, max(r0, r1), max(c0, c1))
+
+    # ---------------------------------------------------------------- frame
+    def add(self, item_id: Hashable, signature: Hashable,
+            rect: Tuple[int, int, int, int], draw: Callable[[], None]):
+        """Register a drawable for this frame (z-order = call order)."""
+        self._items.append((item_id, signature, self._rect_to_cells(rect), draw))
+
+    def render(self) -> Board:
+        """Repaint dirty cells and return the persistent frame board."""
+        items = self._items
+        self._items = []
+
+        # שינויים מול הפריים הקודם -> משבצות מלוכלכות
+        seen = set()
+        for item_id, signature, cells, _ in items:
+            seen.add(item_id)
+            prev = self._prev.get(item_id)
+            if prev is None or prev[0] != signature or prev[1] != cells:
+                if prev is not None:
+                    self.mark_cells(prev[1])
+                self.mark_cells(cells)
+        for item_id, (_, cells) in self._prev.items():
+            if item_id not in seen:
+                self.mark_cells(cells)
+        self._prev = {item_id: (signature, cells) for item_id, signature, cells, _ in items}
+
+        if not self.dirty.any():
+            self.last_dirty_cells = 0
+            return self.frame_board
+
+        # סגירה: כלי שנוגע במשבצת מלוכלכת מצויר מחדש כולו, אז כל המשבצות שלו מלוכלכות
+        redraw = [False] * len(items)
+        changed = True
+        while changed:
+            changed = False
+            for i, (_, _, (r0, c0, r1, c1), _) in enumerate(items):
+                if not redraw[i] and self.dirty[r0:r1, c0:c1].any():
+                    redraw[i] = True
+                    if not self.dirty[r0:r1, c0:c1].all():
+                        self.dirty[r0:r1, c0:c1] = True
+                        changed = True
+
+        self._restore_dirty_cells()
+        for i, (_, _, _, draw) in enumerate(items):
+            if redraw[i]:
+                draw()
+
+        self.last_dirty_cells = int(self.dirty.sum())
+        self.dirty[:, :] = False
+        return self.frame_board
+
+    def _restore_dirty_cells(self):
+        """Copy the static board layer back over every dirty cell."""
+        cw, ch = self.board.cell_W_pix, self.board.cell_H_pix
+        frame = self.frame_board.img.img
+        for r, c in np.argwhere(self.dirty):
+            y, x = r * ch, c * cw
+            frame[y:y + ch, x:x + cw] = self.static[y:y + ch, x:x + cw]
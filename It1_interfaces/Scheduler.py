@@ -0,0 +1,102 @@
+import time
+from typing import Iterator, Optional
+
+from Clock import ManualClock
+
+
+class FramePacer:
+    """Precise frame pacing: sleep most of the wait, busy-spin the last bit.
+
+    ``time.sleep`` alone overshoots by up to a few milliseconds, which is a
+    large share of a 120/144 FPS frame.  Sleeping until `spin_ms` before
+    the deadline and spinning the rest keeps frames on time for a little
+    CPU.  The spin holds the GIL, so a background thread whose lateness
+    does not matter should use ``spin_ms=0`` (a plain sleep).
+    """
+
+    def __init__(self, spin_ms: float = 2.0):
+        self.spin_s = spin_ms / 1000.0
+
+    def wait_until(self, deadline: float):
+        """Block until time.perf_counter() reaches `deadline` (seconds)."""
+        remaining = deadline - time.perf_counter()
+        if self.spin_s <= 0:
+            if remaining > 0:
+                time.sleep(remaining)
+            return
+        if remaining > self.spin_s:
+            time.sleep(remaining - self.spin_s)
+        while time.perf_counter() < deadline:
+            pass
+
+
+class FixedStepScheduler:
+    """Fixed simulation tick decoupled from the render rate.
+
+    Wall time is accumulated and converted into whole simulation ticks;
+    the game clock (`self.clock`) is set once per tick, so every call to
+    ``game_time_ms()`` inside a tick sees the same frozen timestamp.
+    What is left in the accumulator becomes `alpha`, the fraction of a
+    tick the renderer should interpolate past the previous tick.
+    """
+
+    def __init__(self, tick_hz: float = 60, render_fps: float = 30,
+                 max_ticks_per_frame: int = 5, pacer: Optional[FramePacer] = None):
+        self.tick_s = 1.0 / tick_hz
+        self.tick_ms = 1000.0 / tick_hz
+        self.frame_s = 1.0 / render_fps
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.pacer = pacer if pacer is not None else FramePacer()
+        self.clock = ManualClock()
+        self.tick_index = 0
+        self.alpha = 0.0
+        self.dropped_ticks = 0
+        self._accumulator = 0.0
+        self._last_wall = None
+        self._next_frame = None
+
+    def start(self):
+        now = time.perf_counter()
+        self._last_wall = now
+        self._next_frame = now + self.frame_s
+
+    def due_ticks(self) -> Iterator[int]:
+        """Yield the frozen timestamp (ms) of every simulation tick due since the last frame."""
+        if self._last_wall is None:
+            self.start()
+        now = time.perf_counter()
+        self._accumulator += now - self._last_wall
+        self._last_wall = now
+
+        ticks = 0
+        while self._accumulator >= self.tick_s:
+            if ticks == self.max_ticks_per_frame:
+                # מונע "ספירלת מוות" - מוותרים על הזמן שלא הספקנו לדמות
+                self.dropped_ticks += int(self._accumulator / self.tick_s)
+                self._accumulator = 0.0
+                break
+            self._accumulator -= self.tick_s
+            self.tick_index += 1
+            ticks += 1
+            self.clock.set(int(round(self.tick_index * self.tick_ms)))
+            yield self.clock.now_ms()
+
+        self.alpha = min(self._accumulator / self.tick_s, 1.0)
+
+    def game_ms_at(self, wall_time: float) -> float:
+        """Game time (ms) that corresponded to `wall_time` (a time.perf_counter() value)."""
+        # בכל רגע: זמן המשחק = הטיקים שדומו + מה שמחכה במצבר
+        return self.tick_index * self.tick_ms + (self._accumulator - (self._last_wall - wall_time)) * 1000
+
+    def wall_time_of(self, game_ms: float) -> float:
+        """Inverse of game_ms_at: the perf_counter() value at which `game_ms` was reached."""
+        return self._last_wall - (self.tick_index * self.tick_ms + self._accumulator * 1000 - game_ms) / 1000
+
+    def wait_next_frame(self):
+        """Pace the render loop to `render_fps`."""
+        self.pacer.wait_until(self._next_frame)
+        self._next_frame += self.frame_s
+        # אם פיגרנו ביותר מפריים, לא מנסים "להשלים" פריימים
+        now = time.perf_counter()
+        if self._next_frame < now:
+            self._next_frame = now + self.frame_s
@@ -0,0 +1,294 @@
+import asyncio
+import contextlib
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+from typing import Callable, Dict, List, Optional
+
+from GameServer import ClientConnection, GameServer
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+class _Worker:
+    """Runs inside a worker process: a GameServer whose requests arrive over a pipe."""
+
+    def __init__(self, worker_id: int, conn, room_factory, tick_hz: float):
+        self.worker_id = worker_id
+        self.conn = conn
+        self.server = GameServer(room_factory, tick_hz)
+        # "לקוח" אחד לכל החדרים - אירועים חוזרים למפקח בצינור; המפקח מזהה את המשתמשים שלו
+        self.forwarder = ClientConnection(lambda text: self.conn.send(("event", text)), trusted=True)
+        self.autoplay_tasks: Dict[str, asyncio.Task] = {}
+        self.last_stats = time.perf_counter()
+        self.last_ticks = 0
+        self.stopped: Optional[asyncio.Future] = None
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        self.stopped = loop.create_future()
+        loop.add_reader(self.conn.fileno(), self._on_readable)
+        await self.stopped
+        loop.remove_reader(self.conn.fileno())
+        await self.server.close()
+
+    def _on_readable(self):
+        try:
+            while self.conn.poll():
+                request_id, op, args = self.conn.recv()
+                try:
+                    result = self._handle(op, *args)
+                except Exception as e:
+                    result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                if request_id is not None:
+                    self.conn.send(("reply", request_id, result))
+        except (EOFError, OSError):
+            # המפקח נעלם - אין למי לדווח
+            if not self.stopped.done():
+                self.stopped.set_result(None)
+
+    def _handle(self, op: str, *args):
+        if op == "create":
+            (room_id,) = args
+            room = self.server.create_room(room_id)
+            room.clients.add(self.forwarder)
+            return {"ok": True, "room": room_id}
+        if op == "message":
+            return self.server.handle_message(self.forwarder, args[0])
+        if op == "autoplay":
+            room_id, seed, every_s = args
+            room = self.server.rooms[room_id]
+            self.autoplay_tasks[room_id] = asyncio.get_running_loop().create_task(
+                room.autoplay(seed, every_s))
+            return {"ok": True}
+        if op == "close":
+            (room_id,) = args
+            task = self.autoplay_tasks.pop(room_id, None)
+            if task is not None:
+                task.cancel()
+            asyncio.get_running_loop().create_task(self.server.close_room(room_id))
+            return {"ok": True}
+        if op == "stats":
+            return self._stats()
+        if op == "stop":
+            self.stopped.set_result(None)
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    def _stats(self) -> dict:
+        rooms = list(self.server.rooms.values())
+        lateness = [x * 1000 for room in rooms for x in room.lateness]
+        durations = [x * 1000 for room in rooms for x in room.durations]
+        ticks = sum(room.tick_index for room in rooms)
+        now = time.perf_counter()
+        rate = (ticks - self.last_ticks) / max(now - self.last_stats, 1e-9)
+        self.last_ticks, self.last_stats = ticks, now
+        return {"worker": self.worker_id, "pid": os.getpid(), "rooms": len(rooms), "ticks": ticks,
+                "ticks_per_s": rate, "lateness_p50_ms": _percentile(lateness, 0.5),
+                "lateness_p99_ms": _percentile(lateness, 0.99),
+                "tick_mean_ms": sum(durations) / len(durations) if durations else 0.0}
+
+
+def _worker_main(worker_id: int, conn, room_factory, tick_hz: float, quiet: bool):
+    worker = _Worker(worker_id, conn, room_factory, tick_hz)
+    if quiet:
+        # Game מדפיס כל מהלך - בעובדים זה רק מאט
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            asyncio.run(worker.serve())
+    else:
+        asyncio.run(worker.serve())
+
+
+class ShardSupervisor:
+    """Shards game rooms across worker processes, one asyncio GameServer per core.
+
+    Each worker owns its rooms completely (Game is GIL-bound, so rooms in
+    different processes tick truly in parallel).  The supervisor talks
+    to a worker over a duplex Pipe: requests carry an id and complete a
+    Future when the reply comes back; room events are forwarded to
+    `on_event` as NDJSON lines.  A background thread watches the pipes
+    and process sentinels; a worker that dies is restarted and its rooms
+    are re-created (fresh games - pair with CommandLog to resume them).
+    """
+
+    def __init__(self, room_factory: Callable, workers: Optional[int] = None, tick_hz: float = 30,
+                 on_event: Optional[Callable[[str], None]] = None, quiet: bool = True):
+        self.room_factory = room_factory
+        self.num_workers = workers or os.cpu_count() or 1
+        self.tick_hz = tick_hz
+        self.on_event = on_event
+        self.quiet = quiet
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context()
+        self._procs: List[Optional[multiprocessing.Process]] = [None] * self.num_workers
+        self._conns: List = [None] * self.num_workers
+        self._send_locks = [threading.Lock() for _ in range(self.num_workers)]
+        self._pending: Dict[int, Future] = {}
+        self._pending_worker: Dict[int, int] = {}
+        self._ids = itertools.count()
+        self._room_worker: Dict[str, int] = {}
+        self._autoplay: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._monitor: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------ lifecycle
+    def start(self):
+        for index in range(self.num_workers):
+            self._spawn(index)
+        self._running = True
+        self._monitor = threading.Thread(target=self._monitor_loop, name="ShardMonitor", daemon=True)
+        self._monitor.start()
+
+    def _spawn(self, index: int):
+        parent, child = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_worker_main, name=f"room-worker-{index}", daemon=True,
+                                 args=(index, child, self.room_factory, self.tick_hz, self.quiet))
+        proc.start()
+        child.close()
+        self._procs[index] = proc
+        self._conns[index] = parent
+
+    def stop(self, timeout: float = 2.0):
+        self._running = False
+        for index in range(self.num_workers):
+            try:
+                self._send(index, None, "stop")
+            except (OSError, EOFError):
+                pass
+        for proc in self._procs:
+            if proc is not None:
+                proc.join(timeout)
+                if proc.is_alive():
+                    proc.terminate()
+        if self._monitor is not None:
+            self._monitor.join(timeout)
+
+    # ------------------------------------------------------------ requests
+    def _send(self, index: int, request_id: Optional[int], op: str, *args):
+        with self._send_locks[index]:
+            self._conns[index].send((request_id, op, args))
+
+    def _call(self, index: int, op: str, *args) -> Future:
+        future = Future()
+        request_id = next(self._ids)
+        with self._lock:
+            self._pending[request_id] = future
+            self._pending_worker[request_id] = index
+        try:
+            self._send(index, request_id, op, *args)
+        except (OSError, EOFError) as e:
+            self._fail(request_id, e)
+        return future
+
+    def _fail(self, request_id: int, error: Exception):
+        with self._lock:
+            future = self._pending.pop(request_id, None)
+            self._pending_worker.pop(request_id, None)
+        if future is not None and not future.done():
+            future.set_exception(RuntimeError(f"worker failed: {error}"))
+
+    def _pick_worker(self) -> int:
+        load = [0] * self.num_workers
+        for index in self._room_worker.values():
+            load[index] += 1
+        return load.index(min(load))
+
+    def create_room(self, room_id: str, timeout: float = 5.0) -> int:
+        """Create a room on the least loaded worker; returns the worker index."""
+        index = self._room_worker.get(room_id)
+        if index is None:
+            index = self._pick_worker()
+            self._room_worker[room_id] = index
+        self._call(index, "create", room_id).result(timeout)
+        return index
+
+    def request(self, room_id: str, message: dict) -> Future:
+        """Route a GameServer protocol message (move, join...) to the room's worker."""
+        return self._call(self._room_worker[room_id], "message", {**message, "room": room_id})
+
+    def autoplay(self, room_id: str, seed: int = 0, every_s: float = 1.0) -> Future:
+        self._autoplay[room_id] = (seed, every_s)
+        return self._call(self._room_worker[room_id], "autoplay", room_id, seed, every_s)
+
+    def close_room(self, room_id: str) -> Future:
+        index = self._room_worker.pop(room_id)
+        self._autoplay.pop(room_id, None)
+        return self._call(index, "close", room_id)
+
+    def stats(self, timeout: float = 5.0) -> dict:
+        """Per-worker tick statistics plus totals across the pool."""
+        futures = [self._call(index, "stats") for index in range(self.num_workers)]
+        workers = []
+        for future in futures:
+            try:
+                workers.append(future.result(timeout))
+            except Exception as e:
+                workers.append({"error": str(e)})
+        ok = [w for w in workers if "error" not in w]
+        return {"workers": workers, "restarts": self.restarts,
+                "rooms": sum(w["rooms"] for w in ok),
+                "ticks_per_s": sum(w["ticks_per_s"] for w in ok),
+                "lateness_p99_ms": max((w["lateness_p99_ms"] for w in ok), default=0.0)}
+
+    # ------------------------------------------------------------ monitor
+    def _monitor_loop(self):
+        while self._running:
+            conns = {conn: i for i, conn in enumerate(self._conns)}
+            sentinels = {proc.sentinel: i for i, proc in enumerate(self._procs)}
+            for ready in wait(list(conns) + list(sentinels), timeout=0.5):
+                if not self._running:
+                    return
+                if ready in sentinels:
+                    self._restart(sentinels[ready])
+                    break
+                try:
+                    while ready.poll():
+                        self._on_message(ready.recv())
+                except (EOFError, OSError):
+                    self._restart(conns[ready])
+                    break
+
+    def _on_message(self, message):
+        if message[0] == "reply":
+            _, request_id, result = message
+            with self._lock:
+                future = self._pending.pop(request_id, None)
+                self._pending_worker.pop(request_id, None)
+            if future is not None:
+                future.set_result(result)
+        elif message[0] == "event" and self.on_event is not None:
+            try:
+                self.on_event(message[1])
+            except Exception as e:
+                print(f"Error in shard event handler: {e}")
+
+    def _restart(self, index: int):
+        if not self._running:
+            return
+        proc = self._procs[index]
+        if proc is not None:
+            proc.join(0.1)
+        # תחת מנעול השליחה - אף _send לא כותב לצינור סגור בזמן ההחלפה
+        with self._send_locks[index]:
+            self._conns[index].close()
+            with self._lock:
+                lost = [rid for rid, w in self._pending_worker.items() if w == index]
+            self._spawn(index)
+        for request_id in lost:
+            self._fail(request_id, RuntimeError(f"worker {index} exited"))
+        print(f"Room worker {index} exited (code {proc.exitcode if proc else None}), restarting")
+        self.restarts += 1
+        # החדרים של העובד נוצרים מחדש (משחק חדש)
+        for room_id, worker in list(self._room_worker.items()):
+            if worker == index:
+                self._send(index, None, "create", room_id)
+                if room_id in self._autoplay:
+                    self._send(index, None, "autoplay", room_id, *self._autoplay[room_id])
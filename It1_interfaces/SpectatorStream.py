@@ -0,0 +1,172 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class SpectatorStream:
+    """MJPEG spectator output of the composed board frame.
+
+    ``submit(frame)`` is called from the game loop and never blocks: a
+    frame is dropped when it comes sooner than `max_fps` allows or when
+    every encoder thread is still busy, otherwise a copy is JPEG-encoded
+    on the thread pool (``cv2.imencode`` releases the GIL).  Every viewer
+    is served by its own HTTP thread and always gets the newest encoded
+    frame, so a slow viewer simply skips frames instead of holding up the
+    encoder or the simulation.
+
+        stream = SpectatorStream(port=8080).start()
+        game.spectator = stream        # http://127.0.0.1:8080/stream
+    """
+
+    BOUNDARY = "ctdframe"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, max_fps: float = 15,
+                 quality: int = 80, encoder_threads: int = 2):
+        self.host = host
+        self.port = port
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.params = [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)]
+        self.encoder_threads = encoder_threads
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._server_thread: Optional[threading.Thread] = None
+        self._in_flight = 0
+        self._last_submit = 0.0
+        self._latest: Optional[bytes] = None
+        self._sequence = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.viewers = 0
+        self.frames_submitted = 0
+        self.frames_encoded = 0
+        self.dropped_rate = 0
+        self.dropped_busy = 0
+
+    # ------------------------------------------------------------ lifecycle
+    def start(self) -> "SpectatorStream":
+        self._pool = ThreadPoolExecutor(self.encoder_threads, thread_name_prefix="mjpeg-encode")
+        stream = self
+
+        class Handler(_StreamHandler):
+            spectator = stream
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._server_thread = threading.Thread(target=self._server.serve_forever,
+                                               name="mjpeg-http", daemon=True)
+        self._server_thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    # ------------------------------------------------------------ producer
+    def submit(self, frame: np.ndarray) -> bool:
+        """Offer a frame from the game loop; returns False when it was dropped."""
+        if self._pool is None:
+            return False
+        self.frames_submitted += 1
+        now = time.perf_counter()
+        if now - self._last_submit < self.min_interval:
+            self.dropped_rate += 1
+            return False
+        with self._cond:
+            if self._in_flight >= self.encoder_threads:
+                self.dropped_busy += 1
+                return False
+            self._in_flight += 1
+        self._last_submit = now
+        # העתק - המרנדר ממשיך לצייר על אותו חוצץ בפריים הבא
+        snapshot = frame[:, :, :3].copy() if frame.ndim == 3 and frame.shape[2] == 4 else frame.copy()
+        self._pool.submit(self._encode, snapshot)
+        return True
+
+    def _encode(self, frame: np.ndarray):
+        try:
+            ok, jpeg = cv2.imencode(".jpg", frame, self.params)
+        except cv2.error as e:
+            ok = False
+            print(f"Error encoding spectator frame: {e}")
+        with self._cond:
+            self._in_flight -= 1
+            if ok:
+                self._latest = jpeg.tobytes()
+                self._sequence += 1
+                self.frames_encoded += 1
+                self._cond.notify_all()
+
+    # ------------------------------------------------------------ consumers
+    def latest(self) -> Optional[bytes]:
+        return self._latest
+
+    def wait_frame(self, after_sequence: int, timeout: float = 1.0):
+        """Block a viewer thread until a frame newer than `after_sequence` exists."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._sequence > after_sequence or self._closed, timeout)
+            return self._sequence, self._latest
+
+    def stats(self) -> dict:
+        return {"viewers": self.viewers, "submitted": self.frames_submitted,
+                "encoded": self.frames_encoded, "dropped_rate": self.dropped_rate,
+                "dropped_busy": self.dropped_busy}
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    spectator: SpectatorStream = None
+
+    def log_message(self, format, *args):
+        pass  # בלי שורת לוג לכל בקשה
+
+    def do_GET(self):
+        if self.path in ("/", "/stream"):
+            self._stream()
+        elif self.path == "/snapshot.jpg":
+            jpeg = self.spectator.latest()
+            if jpeg is None:
+                self.send_error(503, "No frame yet")
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(jpeg)))
+            self.end_headers()
+            self.wfile.write(jpeg)
+        else:
+            self.send_error(404)
+
+    def _stream(self):
+        spectator = self.spectator
+        self.send_response(200)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={spectator.BOUNDARY}")
+        self.end_headers()
+        with spectator._cond:
+            spectator.viewers += 1
+        seen = 0
+        try:
+            while not spectator._closed:
+                sequence, jpeg = spectator.wait_frame(seen)
+                if jpeg is None or sequence == seen:
+                    continue
+                seen = sequence  # צופה איטי מדלג ישר לפריים האחרון
+                self.wfile.write(f"--{spectator.BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                 f"Content-Length: {len(jpeg)}\r\n\r\n".encode("ascii"))
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with spectator._cond:
+                spectator.viewers -= 1
@@ -0,0 +1,256 @@
+import glob
+import os
+import pathlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from img import Img
+
+
+SPRITE_EXTENSIONS = ['*.png', '*.jpg', '*.jpeg', '*.bmp']
+
+
+def sprite_files(sprites_folder: pathlib.Path) -> List[str]:
+    """The frame files of a sprite folder in frame order - a directory listing, nothing decoded."""
+    files = []
+    if sprites_folder.exists():
+        for ext in SPRITE_EXTENSIONS:
+            files.extend(glob.glob(str(sprites_folder / ext)))
+        files.sort()  # Ensure consistent ordering
+    return files
+
+
+class SpriteAtlas:
+    """All frames of one sprite set packed side by side in a single array.
+
+    ``frames`` are `Img` objects whose ``img`` is a view into ``pixels``,
+    so the decoded data exists exactly once no matter how many `Graphics`
+    instances use it.
+    """
+
+    def __init__(self, frames: List[np.ndarray]):
+        height = max(f.shape[0] for f in frames)
+        channels = max(f.shape[2] for f in frames)
+        width = sum(f.shape[1] for f in frames)
+        self.pixels = np.zeros((height, width, channels), dtype=np.uint8)
+        self.rects: List[Tuple[int, int, int, int]] = []  # (x, y, w, h)
+
+        views = []
+        x = 0
+        for frame in frames:
+            h, w = frame.shape[:2]
+            if frame.shape[2] != channels:
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA)
+            self.pixels[:h, x:x + w] = frame
+            self.rects.append((x, 0, w, h))
+            view = Img()
+            view.img = self.pixels[:h, x:x + w]
+            views.append(view)
+            x += w
+        self.frames: Tuple[Img, ...] = tuple(views)
+
+    @property
+    def nbytes(self) -> int:
+        return self.pixels.nbytes
+
+
+class SpriteCache:
+    """Process-wide LRU cache of decoded, resized sprite sets.
+
+    Keyed by (sprites folder, cell size, interpolation).  A hit returns the
+    same `SpriteAtlas` object, so loading a sprite set a second time costs
+    no file I/O and no decoding.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self._atlases: "OrderedDict[tuple, SpriteAtlas]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(sprites_folder: pathlib.Path, cell_size: Tuple[int, int],
+                 interpolation: int = cv2.INTER_AREA) -> tuple:
+        return (str(pathlib.Path(sprites_folder).resolve()), tuple(cell_size), interpolation)
+
+    def peek(self, key: tuple) -> Optional[SpriteAtlas]:
+        """The cached atlas for a make_key() key, or None - never decodes, not counted."""
+        with self._lock:
+            return self._atlases.get(key)
+
+    def load(self, sprites_folder: pathlib.Path, cell_size: Tuple[int, int],
+             interpolation: int = cv2.INTER_AREA) -> SpriteAtlas:
+        """Return the atlas for `sprites_folder`, decoding it only on a miss."""
+        key = self.make_key(sprites_folder, cell_size, interpolation)
+        with self._lock:
+            atlas = self._atlases.get(key)
+            if atlas is not None:
+                self._atlases.move_to_end(key)
+                self.hits += 1
+                return atlas
+            self.misses += 1
+
+        atlas = SpriteAtlas(self._decode(pathlib.Path(sprites_folder), cell_size, interpolation))
+
+        with self._lock:
+            # טעינה מקבילה של אותו מפתח - הראשון שנכנס נשאר
+            existing = self._atlases.get(key)
+            if existing is not None:
+                return existing
+            self._atlases[key] = atlas
+            while len(self._atlases) > self.capacity:
+                self._atlases.popitem(last=False)
+                self.evictions += 1
+        return atlas
+
+    def _decode(self, sprites_folder: pathlib.Path, cell_size: Tuple[int, int],
+                interpolation: int) -> List[np.ndarray]:
+        frames = []
+        for sprite_file in sprite_files(sprites_folder):
+            try:
+                sprite = Img().read(sprite_file, size=cell_size, keep_aspect=True,
+                                    interpolation=interpolation)
+                if sprite.img.ndim == 2:
+                    sprite.img = cv2.cvtColor(sprite.img, cv2.COLOR_GRAY2BGR)
+                frames.append(sprite.img)
+            except Exception as e:
+                print(f"Failed to load sprite {sprite_file}: {e}")
+
+        # If no sprites found, use a default colored square
+        if not frames:
+            frames.append(np.full((cell_size[1], cell_size[0], 4),
+                                  [100, 100, 255, 255], dtype=np.uint8))
+        return frames
+
+    def clear(self):
+        with self._lock:
+            self._atlases.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._atlases),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": sum(a.nbytes for a in self._atlases.values()),
+            }
+
+
+class SpriteLoader:
+    """Decodes sprite sets on a thread pool in front of a SpriteCache.
+
+    ``cv2.imread`` and ``cv2.resize`` release the GIL, so sets decoded on
+    the pool really run in parallel.  ``submit`` starts a set in the
+    background and returns its future; a set already being decoded shares
+    the same future.  ``load`` returns the atlas: it waits for a decode in
+    flight, or decodes on the calling thread.  Every decode is counted
+    under the reason it ran: "eager" (startup), "prefetch" or "lazy"
+    (first use).
+    """
+
+    REASONS = ("eager", "prefetch", "lazy")
+
+    def __init__(self, cache: SpriteCache, max_workers: Optional[int] = None):
+        self.cache = cache
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self.loaded: Dict[str, int] = dict.fromkeys(self.REASONS, 0)
+        self.seconds: Dict[str, float] = dict.fromkeys(self.REASONS, 0.0)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="SpriteLoader")
+        return self._pool
+
+    def submit(self, sprites_folder: pathlib.Path, cell_size: Tuple[int, int],
+               reason: str = "prefetch") -> Future:
+        """Decode a set in the background (no-op if cached or already in flight)."""
+        key = self.cache.make_key(sprites_folder, cell_size)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                atlas = self.cache.peek(key)
+                if atlas is not None:
+                    future = Future()
+                    future.set_result(atlas)
+                    return future
+                future = self._executor().submit(self._decode, key, sprites_folder, cell_size, reason)
+                self._pending[key] = future
+        return future
+
+    def load(self, sprites_folder: pathlib.Path, cell_size: Tuple[int, int]) -> SpriteAtlas:
+        key = self.cache.make_key(sprites_folder, cell_size)
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            return future.result()
+        if self.cache.peek(key) is not None:
+            return self.cache.load(sprites_folder, cell_size)
+        return self._decode(key, sprites_folder, cell_size, "lazy")
+
+    def _decode(self, key: tuple, sprites_folder: pathlib.Path, cell_size: Tuple[int, int],
+                reason: str) -> SpriteAtlas:
+        began = time.perf_counter()
+        try:
+            return self.cache.load(sprites_folder, cell_size)
+        finally:
+            # האטלס כבר במטמון - מי שמגיע עכשיו ימצא אותו שם
+            with self._lock:
+                self._pending.pop(key, None)
+                self.loaded[reason] += 1
+                self.seconds[reason] += time.perf_counter() - began
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            result = {f"{reason}_sets": self.loaded[reason] for reason in self.REASONS}
+            result.update({f"{reason}_ms": self.seconds[reason] * 1000 for reason in self.REASONS})
+            result["in_flight"] = len(self._pending)
+        return result
+
+
+class SpriteSet:
+    """One sprite folder (a piece state) at one cell size, discovered up front, decoded on first use."""
+
+    __slots__ = ("name", "folder", "cell_size", "config", "_atlas")
+
+    def __init__(self, name: str, folder: pathlib.Path, cell_size: Tuple[int, int],
+                 config: Optional[dict] = None):
+        self.name = name
+        self.folder = folder
+        self.cell_size = tuple(cell_size)
+        self.config = config or {}
+        self._atlas: Optional[SpriteAtlas] = None
+
+    @property
+    def atlas(self) -> SpriteAtlas:
+        if self._atlas is None:
+            self._atlas = sprite_loader.load(self.folder, self.cell_size)
+        return self._atlas
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._atlas is not None or \
+            sprite_cache.peek(sprite_cache.make_key(self.folder, self.cell_size)) is not None
+
+    def prefetch(self, reason: str = "prefetch") -> Optional[Future]:
+        """Start decoding on the loader pool; None if this set is already decoded."""
+        if self._atlas is not None:
+            return None
+        return sprite_loader.submit(self.folder, self.cell_size, reason)
+
+
+# מטמון משותף לכל התהליך ומאגר החוטים שמפענח לתוכו
+sprite_cache = SpriteCache()
+sprite_loader = SpriteLoader(sprite_cache)
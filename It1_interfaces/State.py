@@ -1,67 +1,147 @@
 from Command import Command
 from Moves import Moves
-from Graphics import Graphics
+from Graphics import Graphics, blank_img
+from img import Img
 from Physics import Physics
-from typing import Dict
-import time
+from PhysicsWorld import PhysicsWorld
+from typing import Dict, Iterable, Optional, Tuple
 
+# מתי מצב מסתיים (ועובר ל-next_state_when_finished)
+FINISH_NEVER = 0      # מצב שחוזר לעצמו (idle)
+FINISH_PHYSICS = 1    # כשההחלקה/הקפיצה של הפיזיקה נגמרת (move, jump)
+FINISH_REST = 2       # כשקוד ההשהיה נגמר והאנימציה (שאינה בלולאה) הסתיימה
 
-class State:
-    def __init__(self, moves: Moves, graphics: Graphics, physics: Physics):
+
+class StateMachine:
+    """The states of one piece type, compiled once and shared by all its pieces.
+
+    Built from each ``states/<name>/config.json``: `graphics` gives a
+    state's frames, ``frames_per_sec`` and ``is_loop``;
+    ``next_state_when_finished`` gives where it goes when done.  A state
+    with a positive ``speed_m_per_sec`` is done when its slide or jump
+    ends.  Any other state is done when the piece's cooldown is over
+    and its animation has played; a state that leads back to itself
+    never finishes.  A command enters the state named after it in lower
+    case ("Move" -> move, "Jump" -> jump); "Reset" enters the initial
+    state.  Everything is a tuple indexed by state id, so command handling
+    and finished-state transitions are lookups with nothing copied.
+    """
+
+    __slots__ = ("moves", "names", "ids", "graphics", "next_state", "finish", "commands", "initial")
+
+    def __init__(self, moves: Moves, states: Dict[str, Tuple[Graphics, dict]], initial: str = "idle"):
         self.moves = moves
-        self.graphics = graphics
+        self.names: Tuple[str, ...] = tuple(states)
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.initial = self.ids.get(initial, 0)
+        self.graphics: Tuple[Graphics, ...] = tuple(graphics for graphics, _ in states.values())
+
+        next_state, finish = [], []
+        for i, (_, config) in enumerate(states.values()):
+            physics_cfg = config.get("physics", {})
+            target = self.ids.get(physics_cfg.get("next_state_when_finished"), i)
+            next_state.append(target)
+            if target == i:
+                finish.append(FINISH_NEVER)
+            elif physics_cfg.get("speed_m_per_sec", 0) > 0:
+                finish.append(FINISH_PHYSICS)
+            else:
+                finish.append(FINISH_REST)
+        self.next_state: Tuple[int, ...] = tuple(next_state)
+        self.finish: Tuple[int, ...] = tuple(finish)
+
+        # אותה טבלה לכל מצב כרגע - אבל ממופה לפי מצב, כדי שגרסאות יוכלו לחסום פקודות במצבים מסוימים
+        by_command = {"Reset": self.initial}
+        for name, i in self.ids.items():
+            by_command[name.capitalize()] = i
+        self.commands: Tuple[Dict[str, int], ...] = tuple(by_command for _ in self.names)
+
+
+class State:
+    """A piece's runtime record in its type's StateMachine - the only per-piece state data.
+
+    Holds the current state id, when it was entered, the animation frame
+    and the piece's own Physics (one PhysicsWorld row).  Moves and
+    Graphics belong to the shared machine.
+    """
+
+    __slots__ = ("machine", "state_id", "start_ms", "frame_index", "physics", "current_command")
+
+    def __init__(self, machine: StateMachine, physics: Physics, state_id: Optional[int] = None):
+        self.machine = machine
+        self.state_id = machine.initial if state_id is None else state_id
+        self.start_ms = 0
+        self.frame_index = 0
         self.physics = physics
-        self.transitions = {}
         self.current_command = None
-        self.state_start_time = 0
-
-    def copy(self):
-        """יצירת עותק של המצב - תיקון חשוב"""
-        new_moves = self.moves.copy()  # יצירת עותק של moves
-        new_graphics = self.graphics.copy()
-        new_physics = self.physics.copy()
-        new_state = State(new_moves, new_graphics, new_physics)
-        new_state.transitions = self.transitions.copy()
+
+    @property
+    def name(self) -> str:
+        return self.machine.names[self.state_id]
+
+    @property
+    def moves(self) -> Moves:
+        return self.machine.moves
+
+    @property
+    def graphics(self) -> Graphics:
+        return self.machine.graphics[self.state_id]
+
+    def copy(self, world: PhysicsWorld) -> "State":
+        """Another piece's record on the same machine - only the physics row is new."""
+        new_state = State(self.machine, self.physics.copy(world), self.state_id)
+        new_state.start_ms = self.start_ms
+        new_state.frame_index = self.frame_index
         new_state.current_command = self.current_command
-        new_state.state_start_time = self.state_start_time
         return new_state
-    
-    def set_transition(self, event: str, target: "State"):
-        self.transitions[event] = target
+
+    def _enter(self, state_id: int, now_ms: int):
+        self.state_id = state_id
+        self.start_ms = now_ms
+        self.frame_index = 0
 
     def reset(self, cmd: Command):
+        """Apply a command: a table lookup for the next state, then the physics of the command."""
+        self._enter(self.machine.commands[self.state_id].get(cmd.type, self.state_id), cmd.timestamp)
         self.current_command = cmd
-        self.state_start_time = cmd.timestamp
-        self.graphics.reset(cmd)
         self.physics.reset(cmd)
 
-    def can_transition(self, now_ms: int) -> bool:
-        min_duration = 100
-        return (now_ms - self.state_start_time) >= min_duration
-
-    def get_state_after_command(self, cmd: Command, now_ms: int) -> "State":
-        # תיקון חשוב: בדיקה אם הטרנזישן קיים
-        if cmd.type not in self.transitions:
-            # אם אין טרנזישן מתאים, החזר את המצב הנוכחי עם reset
-            new_state = self.copy()
-            new_state.reset(cmd)
-            return new_state
-        
-        next_state = self.transitions[cmd.type].copy()  # תיקון: copy במקום שיתוף
-        next_state.reset(cmd)
-        return next_state
+    def advance(self, now_ms: int):
+        """Follow finished-state transitions and pick the animation frame for `now_ms`."""
+        machine = self.machine
+        finish = machine.finish[self.state_id]
+        if finish == FINISH_PHYSICS:
+            if not self.physics.is_moving():
+                self._enter(machine.next_state[self.state_id], now_ms)
+        elif finish == FINISH_REST:
+            physics = self.physics
+            if (now_ms >= physics.cooldown_start_ms + physics.cooldown_duration_ms and
+                    machine.graphics[self.state_id].is_finished(now_ms - self.start_ms)):
+                self._enter(machine.next_state[self.state_id], now_ms)
+        self.frame_index = machine.graphics[self.state_id].frame_at(now_ms - self.start_ms)
+
+    def image(self) -> Img:
+        """The frame to draw now; while this state's sprites are still decoding, the initial state's first frame."""
+        img = self.graphics.get_img(self.frame_index)
+        if img is None:
+            fallback = self.machine.graphics[self.machine.initial]
+            img = fallback.get_img(0)
+            if img is None:
+                img = blank_img(fallback.cell_size)
+        return img
 
     def update(self, now_ms: int) -> "State":
-        self.graphics.update(now_ms)
         self.physics.update(now_ms)
-        
-        # Check for automatic transitions (e.g., animation complete)
-        if 'auto' in self.transitions and self.can_transition(now_ms):
-            # Could add logic for automatic state transitions
-            pass
-            
+        self.advance(now_ms)
         return self
 
+    def prefetch(self, names: Iterable[str]):
+        """Start decoding the sprites of the named states in the background."""
+        for name in names:
+            state_id = self.machine.ids.get(name)
+            if state_id is not None:
+                self.machine.graphics[state_id].prefetch()
+
     def get_command(self) -> Command:
         """Get the current command for this state."""
-        return self.current_command
\ No newline at end of file
+        return self.current_command
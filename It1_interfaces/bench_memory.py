@@ -0,0 +1,117 @@
+"""Memory and allocation benchmark for the hot game objects.
+
+    python bench_memory.py [count]
+
+Measures bytes per object (tracemalloc) for the slotted Command, a
+"piece_moved" Event with its PieceMoved payload record, and the real
+Piece / State / Physics classes against the same classes with a
+per-instance __dict__ (the old layout), the total for a piece made by
+PieceFactory.create_piece.
+"""
+import contextlib
+import io
+import pathlib
+import sys
+import tracemalloc
+
+import numpy as np
+
+from Board import Board
+from Bus.bus import Event
+from Command import Command
+from GameEvents import PieceMoved
+from img import Img
+from Physics import Physics
+from PhysicsWorld import PhysicsWorld
+from Piece import TEAM_WHITE, Piece
+from PieceFactory import PieceFactory
+from State import State
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+
+class DictCommand:
+    """The old Command layout: a plain object with a __dict__ and a list payload."""
+
+    def __init__(self, timestamp, piece_id, type, params):
+        self.timestamp = timestamp
+        self.piece_id = piece_id
+        self.type = type
+        self.params = params
+
+
+class DictEvent:
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+
+
+def dict_layout(cls):
+    """`cls` as it was before __slots__: the same methods, attributes in a per-instance __dict__."""
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in cls.__slots__ and name != "__slots__"}
+    return type(f"Dict{cls.__name__}", cls.__bases__, namespace)
+
+
+def make_factory():
+    img = Img()
+    img.img = np.zeros((8 * 16, 8 * 16, 3), dtype=np.uint8)
+    board = Board(cell_H_pix=16, cell_W_pix=16, W_cells=8, H_cells=8, img=img)
+    # PieceFactory מדפיס את טעינת הכלים
+    with contextlib.redirect_stdout(io.StringIO()):
+        return PieceFactory(board, PIECES_ROOT)
+
+
+def _piece_ids(count):
+    # מזהים שנבנים מחדש בכל פעם - כמו פקודות שמגיעות מהרשת או מקובץ
+    return ["QW_%08x" % (i % 32) for i in range(count)]
+
+
+def bytes_per_object(factory, count):
+    ids = _piece_ids(count)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i, ids[i]) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    factory = make_factory()
+    template = factory.piece_templates["QW"]
+    DictPiece, DictState, DictPhysics = dict_layout(Piece), dict_layout(State), dict_layout(Physics)
+    old_world, new_world = PhysicsWorld(), PhysicsWorld()
+
+    cmd = Command(0, "QW_1", "Move", ((1, 4), (3, 4)))
+
+    print(f"bytes per object ({count:,} objects)")
+    rows = [
+        ("Command", lambda i, pid: DictCommand(i, pid, "Move", [[1, 4], [3, 4]]),
+                    lambda i, pid: Command(i, pid, "Move", ((1, 4), (3, 4)))),
+        ("Event", lambda i, pid: DictEvent("piece_moved", {"piece_id": pid, "command": cmd,
+                                                           "position": (3, 4)}),
+                  lambda i, pid: Event("piece_moved", PieceMoved(pid, cmd, (3, 4)))),
+        ("Piece", lambda i, pid: DictPiece(pid, template, "Q", TEAM_WHITE),
+                  lambda i, pid: Piece(pid, template, "Q", TEAM_WHITE)),
+        ("State", lambda i, pid: DictState(template.machine, template.physics),
+                  lambda i, pid: State(template.machine, template.physics)),
+        ("Physics", lambda i, pid: DictPhysics((0, 0), factory.board, 1.0, old_world),
+                    lambda i, pid: Physics((0, 0), factory.board, 1.0, new_world)),
+    ]
+    for name, old, new in rows:
+        before = bytes_per_object(old, count)
+        after = bytes_per_object(new, count)
+        print(f"  {name:<13} dict {before:7.1f}   slotted {after:7.1f}   ({before / after:.2f}x)")
+    # כלי שלם כמו במשחק: Piece + רשומת State + שורת Physics (כולל המערכים של העולם)
+    piece_world = PhysicsWorld()
+    whole = bytes_per_object(lambda i, pid: factory.create_piece("QW", (i % 8, i // 8 % 8), piece_world),
+                             count)
+    print(f"  {'create_piece':<13} {whole:7.1f} (Piece + State + Physics row)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""How many concurrent rooms one core sustains at a fixed tick rate.
+
+    python bench_server.py [--hz 30] [--budget-ms MS] [--seconds 3] [--max-rooms 512]
+
+Hosts N rooms in one asyncio loop (one process = one core). Each room
+has a bot that asks for a random legal move every `--move-every` seconds
+through the same validation a client request uses. The room count
+doubles until the p99 tick lateness (tick start vs. schedule) goes over
+the budget (default: half a tick period). The last count within budget
+is reported.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import statistics
+
+from GameServer import GameServer, StandardRoomFactory
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+async def measure(new_room, rooms: int, hz: float, seconds: float, move_every: float) -> dict:
+    server = GameServer(new_room, tick_hz=hz)
+    loop = asyncio.get_running_loop()
+    bots = [loop.create_task(server.create_room(f"r{i}").autoplay(i, move_every))
+            for i in range(rooms)]
+    await asyncio.sleep(0.5)  # חימום
+    for room in server.rooms.values():
+        room.lateness.clear()
+        room.durations.clear()
+    await asyncio.sleep(seconds)
+    lateness = [x * 1000 for room in server.rooms.values() for x in room.lateness]
+    durations = [x * 1000 for room in server.rooms.values() for x in room.durations]
+    ticks = len(durations)
+    for task in bots:
+        task.cancel()
+    await server.close()
+    return {"rooms": rooms, "ticks_per_s": ticks / seconds,
+            "lateness_p50_ms": percentile(lateness, 0.5), "lateness_p99_ms": percentile(lateness, 0.99),
+            "tick_mean_ms": statistics.fmean(durations) if durations else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hz", type=float, default=30)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--move-every", type=float, default=1.0)
+    parser.add_argument("--max-rooms", type=int, default=512)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+    if args.budget_ms is None:
+        args.budget_ms = 500.0 / args.hz
+
+    new_room = StandardRoomFactory()
+    results = []
+    sustained = 0
+    rooms = 1
+    while rooms <= args.max_rooms:
+        # Game מדפיס כל מהלך - לא מודדים את הקונסול
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = asyncio.run(measure(new_room, rooms, args.hz, args.seconds, args.move_every))
+        results.append(result)
+        if not args.json:
+            print(f"{rooms:5d} rooms  {result['ticks_per_s']:8.0f} ticks/s  "
+                  f"lateness p50 {result['lateness_p50_ms']:6.2f} ms  p99 {result['lateness_p99_ms']:6.2f} ms  "
+                  f"tick {result['tick_mean_ms']:.3f} ms")
+        if result["lateness_p99_ms"] > args.budget_ms:
+            break
+        sustained = rooms
+        rooms *= 2
+
+    if args.json:
+        print(json.dumps({"hz": args.hz, "budget_ms": args.budget_ms,
+                          "sustained_rooms": sustained, "runs": results}, indent=2))
+    else:
+        print(f"sustained: {sustained} rooms at {args.hz:g} Hz with p99 lateness <= {args.budget_ms:g} ms")
+
+
+if __name__ == "__main__":
+    main()
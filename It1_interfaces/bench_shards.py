@@ -0,0 +1,63 @@
+"""Throughput scaling of ShardSupervisor with the number of worker processes.
+
+    python bench_shards.py [--rooms-per-worker 400] [--max-workers N] [--seconds 3] [--hz 30]
+
+For 1, 2, 4 ... workers (up to the core count) it hosts
+rooms-per-worker rooms on each worker, all on autoplay. It then reports
+the aggregate ticks/s, the worst p99 tick lateness and the scaling
+efficiency relative to one worker. The default load saturates a worker,
+so ticks/s measures capacity rather than the tick rate.
+"""
+import argparse
+import json
+import os
+import time
+
+from GameServer import StandardRoomFactory
+from ShardSupervisor import ShardSupervisor
+
+
+def measure(workers: int, rooms_per_worker: int, hz: float, seconds: float, move_every: float) -> dict:
+    supervisor = ShardSupervisor(StandardRoomFactory(), workers=workers, tick_hz=hz)
+    supervisor.start()
+    try:
+        for i in range(workers * rooms_per_worker):
+            supervisor.create_room(f"r{i}", timeout=30)
+            supervisor.autoplay(f"r{i}", i, move_every)
+        time.sleep(1.0)  # חימום
+        supervisor.stats()  # מאפס את חלון קצב הטיקים
+        time.sleep(seconds)
+        stats = supervisor.stats()
+    finally:
+        supervisor.stop()
+    return {"workers": workers, "rooms": stats["rooms"], "ticks_per_s": stats["ticks_per_s"],
+            "lateness_p99_ms": stats["lateness_p99_ms"], "restarts": stats["restarts"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms-per-worker", type=int, default=400)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--hz", type=float, default=30)
+    parser.add_argument("--move-every", type=float, default=1.0)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    workers = 1
+    while workers <= args.max_workers:
+        result = measure(workers, args.rooms_per_worker, args.hz, args.seconds, args.move_every)
+        result["efficiency"] = result["ticks_per_s"] / (results[0]["ticks_per_s"] * workers) \
+            if results else 1.0
+        results.append(result)
+        if not args.json:
+            print(f"{workers:3d} workers  {result['rooms']:5d} rooms  {result['ticks_per_s']:9.0f} ticks/s  "
+                  f"p99 lateness {result['lateness_p99_ms']:6.2f} ms  efficiency {result['efficiency']:.2f}")
+        workers *= 2
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,440 @@
+"""Micro and macro benchmarks for rendering, physics, collisions, asset loading and bot search.
+
+    python bench_suite.py [--sizes 8,16,32] [--pieces 16,32,64] [--cases name,...]
+                          [--repeat 5] [--min-time 0.05] [--cell-px PX]
+                          [--json PATH|-] [--baseline PATH] [--tolerance 0.15]
+
+Every case runs once per board size x piece count; counts above half
+the board are skipped. Each measurement sets the case up once per
+repeat (untimed). The loop count is picked like timeit's autorange, so
+that one repeat takes at least --min-time. The result is the best and
+median time per operation. The first call after each setup is an
+untimed warm-up. A case that uses up its state (resolve_collisions)
+prepares it again before every call, times only the call, and runs a
+fixed number of calls per repeat instead.
+--list shows what one operation of each case is.
+
+--json writes the results to PATH, or to stdout for "-". --baseline
+compares this run with an earlier --json file, matching by case, size
+and count. A case whose best time grew by more than --tolerance counts
+as a regression, and the exit status is then 1.
+
+Large boards: --sizes 64,256 --pieces 2048,8192.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import pathlib
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from Board import Board
+from Bot import BotPosition, BotSearch
+from Clock import ManualClock
+from Game import Game
+from HeadlessEngine import HeadlessEngine
+from img import Img
+from PhysicsWorld import PhysicsWorld
+from Piece import TEAM_WHITE
+from PieceFactory import PieceFactory
+from SpriteCache import sprite_cache
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+RANKS = ("RNBQKBNR", "PPPPPPPP")  # שורה אחורית ושורת חיילים, לסירוגין
+
+
+def make_board(size: int, cell_px: int) -> Board:
+    """A size x size checkerboard like main.create_board, with `cell_px` pixel cells."""
+    light, dark = (240, 217, 181), (181, 136, 99)
+    board_img = np.empty((size * cell_px, size * cell_px, 3), dtype=np.uint8)
+    board_img[...] = dark
+    checker = (np.add.outer(np.arange(size), np.arange(size)) % 2 == 0)
+    board_img[np.kron(checker, np.ones((cell_px, cell_px), dtype=bool))] = light
+    img = Img()
+    img.img = board_img
+    return Board(cell_H_pix=cell_px, cell_W_pix=cell_px, W_cells=size, H_cells=size, img=img)
+
+
+def layout(size: int, count: int) -> List[tuple]:
+    """`count` pieces, half per team: white fills rows from the top, black from the bottom."""
+    setup = []
+    for team, first_row, step in (("W", 0, 1), ("B", size - 1, -1)):
+        for i in range(count // 2 + (count % 2 if team == "W" else 0)):
+            row, col = divmod(i, size)
+            code = RANKS[row % 2][col % 8]
+            setup.append((code + team, (first_row + step * row, col)))
+    return setup
+
+
+class Env:
+    """Board, piece factory and layout for one (size, count) point; games are built fresh."""
+
+    def __init__(self, size: int, count: int, cell_px: int, factory: PieceFactory):
+        self.size = size
+        self.count = count
+        self.cell_px = cell_px
+        self.board = factory.board
+        self.factory = factory
+        self.setup = layout(size, count)
+
+    def pieces(self):
+        world = PhysicsWorld()  # עולם נפרד לכל משחק - כמו חדר בשרת
+        return [self.factory.create_piece(code, cell, world) for code, cell in self.setup]
+
+    def game(self, clock: Optional[ManualClock] = None) -> Game:
+        game = Game(self.pieces(), self.board, clock=clock if clock is not None else ManualClock())
+        game.animate_sprites = False
+        game.start()
+        return game
+
+
+def _random_moves(game: Game, rng: random.Random, pieces) -> int:
+    """Ask for one random legal move per piece in `pieces`; returns how many were accepted."""
+    accepted = 0
+    for piece in pieces:
+        cell = piece.current_state.physics.get_cell_pos()
+        moves = piece.current_state.moves.compiled().legal_moves(*cell, game.occupancy.bitboard)
+        if moves and game._attempt_move(piece, list(rng.choice(moves))):
+            accepted += 1
+    return accepted
+
+
+class Staged:
+    """An op whose `setup` must run before every call; only the call itself is timed.
+
+    Setup can cost far more than the op, so instead of autorange every
+    repeat times a fixed `number` of calls.
+    """
+
+    def __init__(self, setup: Callable[[], None], op: Callable[[], None], number: int = 200):
+        self.setup = setup
+        self.op = op
+        self.number = number
+
+    def __call__(self):
+        self.op()
+
+
+# ---------------------------------------------------------------- cases
+# כל מקרה: env -> פונקציה שמבצעת פעולה אחת. ההכנה עצמה לא נמדדת.
+
+def case_img_draw_on(env: Env) -> Callable[[], None]:
+    """Img.draw_on: blend every piece's sprite at its cell (one op = all pieces)."""
+    target = Img()
+    target.img = env.board.img.img.copy()
+    blits = [(p.current_state.image(), col * env.cell_px, row * env.cell_px)
+             for p, (_, (row, col)) in zip(env.pieces(), env.setup)]
+
+    def op():
+        for sprite, x, y in blits:
+            sprite.draw_on(target, x, y)
+    return op
+
+
+def case_board_clone(env: Env) -> Callable[[], None]:
+    """Board.clone: deep copy of the board image."""
+    return env.board.clone
+
+
+def case_game_draw_full(env: Env) -> Callable[[], None]:
+    """Game._draw from a fresh Renderer: every cell repainted."""
+    game = env.game()
+
+    def op():
+        game.renderer = None
+        game._draw()
+    return op
+
+
+def case_game_draw_incremental(env: Env) -> Callable[[], None]:
+    """Game._draw with one cursor moving every frame: only dirty cells repainted."""
+    game = env.game()
+    game._draw()
+    cells = [[env.size // 2, 0], [env.size // 2, 1]]
+    frame = [0]
+
+    def op():
+        frame[0] ^= 1
+        game.player1_cursor = cells[frame[0]]
+        game._draw()
+    return op
+
+
+def case_resolve_collisions(env: Env) -> Staged:
+    """Game._resolve_collisions at the next queued contact, so ops resolve real captures.
+
+    Setup (untimed) plays the game on - random legal moves, 16 ms ticks -
+    until a contact is queued, then moves the clock to it. A game that is
+    over or stalls is replaced by a fresh one.
+    """
+    rng = random.Random(env.size * 1000 + env.count)
+    current: Dict[str, object] = {}
+
+    def new_game():
+        clock = ManualClock()
+        current.update(game=env.game(clock), clock=clock)
+
+    def setup(fresh: bool = False):
+        if "game" not in current:
+            new_game()
+        game, clock = current["game"], current["clock"]
+        for _ in range(100):
+            if game.collisions.pending() or game.game_over:
+                break
+            now_ms = clock.now_ms()
+            ready = [p for p in game.pieces if p.cooldown_end_time <= now_ms]
+            if not ready:
+                # אף כלי לא יכול לזוז - קופצים לסוף ההשהיה הקרובה
+                clock.set(min(p.cooldown_end_time for p in game.pieces))
+                ready = [p for p in game.pieces if p.cooldown_end_time <= clock.now_ms()]
+            _random_moves(game, rng, ready)
+            clock.advance(16)
+            game._tick(clock.now_ms(), 1)
+        if not game.collisions.pending() or game.game_over:
+            if fresh:
+                raise RuntimeError("no contacts in a fresh game - pieces cannot reach each other")
+            new_game()
+            return setup(fresh=True)
+        clock.set(max(clock.now_ms(), math.ceil(game.collisions.next_event_ms())))
+
+    return Staged(setup, lambda: current["game"]._resolve_collisions())
+
+
+def case_find_piece_at_cell(env: Env) -> Callable[[], None]:
+    """Game._find_piece_at_cell on every cell of the board (one op = size*size lookups)."""
+    game = env.game()
+    cells = [(r, c) for r in range(env.size) for c in range(env.size)]
+    find = game._find_piece_at_cell
+
+    def op():
+        for r, c in cells:
+            find(r, c)
+    return op
+
+
+def case_moves_get_moves(env: Env) -> Callable[[], None]:
+    """Moves.get_moves from every piece's cell (one op = all pieces)."""
+    queries = [(p.current_state.moves, cell) for p, (_, cell) in zip(env.pieces(), env.setup)]
+
+    def op():
+        for moves, (r, c) in queries:
+            moves.get_moves(r, c)
+    return op
+
+
+def case_piece_factory_startup(env: Env) -> Callable[[], None]:
+    """PieceFactory startup from disk (cold sprite cache) plus creating all the pieces."""
+    def op():
+        sprite_cache.clear()
+        factory = PieceFactory(env.board, PIECES_ROOT)
+        world = PhysicsWorld()
+        for code, cell in env.setup:
+            factory.create_piece(code, cell, world)
+    return op
+
+
+def case_headless_tick(env: Env) -> Callable[[], None]:
+    """HeadlessEngine.step(16): one 60 Hz tick, with a random legal move asked every 4th tick."""
+    engine = HeadlessEngine(env.pieces(), env.board)
+    rng = random.Random(env.size * 1000 + env.count)
+    ticks = [0]
+
+    def op():
+        ticks[0] += 1
+        if ticks[0] % 4 == 0 and engine.game.pieces:
+            _random_moves(engine.game, rng, [rng.choice(engine.game.pieces)])
+        engine.step(16)
+    return op
+
+
+def case_bot_search(env: Env) -> Callable[[], None]:
+    """BotSearch.search with an empty table: depth 2 (depth 1 above 64 pieces), in process."""
+    pieces = env.pieces()
+    kinds: Dict[tuple, int] = {}
+    tables = []
+    for piece in pieces:
+        key = (piece.team, piece.piece_type)
+        if key not in kinds:
+            kinds[key] = len(tables)
+            tables.append(piece.current_state.moves.compiled())
+    snapshot = [(piece.piece_id, kinds[(piece.team, piece.piece_type)],
+                 *piece.current_state.physics.get_cell_pos(), 0, 0) for piece in pieces]
+    timing = {"move_cooldown_ms": Game.MOVE_COOLDOWN_MS, "jump_cooldown_ms": Game.JUMP_COOLDOWN_MS,
+              "jump_air_ms": Game.JUMP_AIR_MS}
+    position = BotPosition((env.size, env.size), tables, list(kinds), timing, snapshot,
+                           1000, TEAM_WHITE, 250)
+    depth = 2 if env.count <= 64 else 1
+
+    def op():
+        BotSearch().search(position, budget_ms=60_000, max_depth=depth)
+    return op
+
+
+CASES: Dict[str, Callable[[Env], Callable[[], None]]] = {
+    "img_draw_on": case_img_draw_on,
+    "board_clone": case_board_clone,
+    "game_draw_full": case_game_draw_full,
+    "game_draw_incremental": case_game_draw_incremental,
+    "resolve_collisions": case_resolve_collisions,
+    "find_piece_at_cell": case_find_piece_at_cell,
+    "moves_get_moves": case_moves_get_moves,
+    "piece_factory_startup": case_piece_factory_startup,
+    "headless_tick": case_headless_tick,
+    "bot_search": case_bot_search,
+}
+
+
+# ---------------------------------------------------------------- timing
+def measure(prepare: Callable[[], Callable[[], None]], repeat: int, min_time: float) -> dict:
+    """Best and median seconds per op over `repeat` fresh setups (loop count as timeit.autorange)."""
+    op = _warm(prepare())
+    if isinstance(op, Staged):
+        number = op.number
+        elapsed = _time_loop(op, number)
+    else:
+        number = 1
+        while True:
+            elapsed = _time_loop(op, number)
+            if elapsed >= min_time:
+                break
+            number = number * 10 if elapsed < min_time / 10 else number * 2
+    per_op = [elapsed / number]
+    for _ in range(repeat - 1):
+        per_op.append(_time_loop(_warm(prepare()), number) / number)
+    return {"number": number, "repeat": repeat,
+            "best_us": min(per_op) * 1e6, "median_us": statistics.median(per_op) * 1e6}
+
+
+def _warm(op: Callable[[], None]) -> Callable[[], None]:
+    _time_loop(op, 1)  # קריאה ראשונה לא נמדדת - מטמוני שכבות, הקצאות ראשונות
+    return op
+
+
+def _time_loop(op: Callable[[], None], number: int) -> float:
+    if isinstance(op, Staged):
+        # ההכנה לפני כל קריאה לא נמדדת - רק הפעולה עצמה
+        elapsed = 0.0
+        for _ in range(number):
+            op.setup()
+            start = time.perf_counter()
+            op.op()
+            elapsed += time.perf_counter() - start
+        return elapsed
+    start = time.perf_counter()
+    for _ in range(number):
+        op()
+    return time.perf_counter() - start
+
+
+def run_suite(sizes: List[int], counts: List[int], cases: List[str], repeat: int,
+              min_time: float, cell_px: Optional[int] = None, progress=None) -> List[dict]:
+    results = []
+    for size in sizes:
+        px = cell_px or max(8, min(80, 2048 // size))  # לוחות גדולים - משבצות קטנות יותר
+        # Game ו-PieceFactory מדפיסים כל מהלך - לא מודדים את הקונסול
+        with contextlib.redirect_stdout(io.StringIO()):
+            factory = PieceFactory(make_board(size, px), PIECES_ROOT)
+        for count in counts:
+            if count > size * size // 2:
+                continue
+            env = Env(size, count, px, factory)
+            for name in cases:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = measure(lambda: CASES[name](env), repeat, min_time)
+                result = {"case": name, "board": size, "pieces": count, "cell_px": px, **result}
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return results
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[dict]:
+    """Pair each result with its baseline entry; ratio > 1 + tolerance is a regression."""
+    base = {(r["case"], r["board"], r["pieces"]): r for r in baseline}
+    rows = []
+    for r in results:
+        b = base.get((r["case"], r["board"], r["pieces"]))
+        if b is None:
+            continue
+        ratio = r["best_us"] / b["best_us"] if b["best_us"] else float("inf")
+        status = "regression" if ratio > 1 + tolerance else "faster" if ratio < 1 - tolerance else "same"
+        rows.append({"case": r["case"], "board": r["board"], "pieces": r["pieces"],
+                     "baseline_us": b["best_us"], "best_us": r["best_us"], "ratio": ratio,
+                     "status": status})
+    return rows
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(x) for x in text.split(",") if x]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=_int_list, default=[8, 16, 32])
+    parser.add_argument("--pieces", type=_int_list, default=[16, 32, 64])
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help="comma separated subset of: " + ", ".join(CASES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--cell-px", type=int, default=None,
+                        help="cell size in pixels (default: 80, smaller above 25x25 boards)")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON to PATH (- for stdout)")
+    parser.add_argument("--baseline", metavar="PATH", help="compare with an earlier --json file")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, case in CASES.items():
+            print(f"{name:<22} {case.__doc__}")
+        return 0
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    quiet = args.json == "-"
+
+    def progress(r):
+        if not quiet:
+            print(f"{r['case']:<22} {r['board']:4d}x{r['board']:<4d} {r['pieces']:5d} pieces  "
+                  f"best {r['best_us']:11.2f} us  median {r['median_us']:11.2f} us  (x{r['number']})")
+
+    results = run_suite(args.sizes, args.pieces, cases, args.repeat, args.min_time, args.cell_px, progress)
+    report = {"python": platform.python_version(), "numpy": np.__version__, "opencv": cv2.__version__,
+              "platform": platform.platform(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "results": results}
+
+    status = 0
+    if args.baseline:
+        baseline = json.loads(pathlib.Path(args.baseline).read_text(encoding="utf-8"))
+        rows = compare(results, baseline["results"], args.tolerance)
+        report["comparison"] = {"baseline": args.baseline, "tolerance": args.tolerance, "rows": rows}
+        regressions = [row for row in rows if row["status"] == "regression"]
+        if not quiet:
+            print(f"\ncompared with {args.baseline} (tolerance {args.tolerance:.0%})")
+            for row in rows:
+                print(f"{row['case']:<22} {row['board']:4d}x{row['board']:<4d} {row['pieces']:5d} pieces  "
+                      f"{row['baseline_us']:11.2f} -> {row['best_us']:11.2f} us  "
+                      f"x{row['ratio']:.2f}  {row['status']}")
+            print(f"{len(regressions)} regression(s) in {len(rows)} compared case(s)")
+        status = 1 if regressions else 0
+
+    if args.json == "-":
+        print(json.dumps(report, indent=2))
+    elif args.json:
+        pathlib.Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Shared pytest fixtures: the pieces on disk and the starting position main.py builds."""
+import contextlib
+import io
+import pathlib
+
+import numpy as np
+import pytest
+
+from Board import Board
+from HeadlessEngine import HeadlessEngine
+from img import Img
+from main import PIECE_SETUP
+from PhysicsWorld import PhysicsWorld
+from PieceFactory import PieceFactory
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+
+def make_board(size: int = 8, cell_px: int = 16) -> Board:
+    img = Img()
+    img.img = np.zeros((size * cell_px, size * cell_px, 3), dtype=np.uint8)
+    return Board(cell_H_pix=cell_px, cell_W_pix=cell_px, W_cells=size, H_cells=size, img=img)
+
+
+@pytest.fixture(scope="module")
+def factory():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return PieceFactory(make_board(), PIECES_ROOT)
+
+
+@pytest.fixture
+def engine(factory):
+    """A headless game in main.py's starting position."""
+    world = PhysicsWorld()  # עולם נפרד לכל משחק
+    pieces = [factory.create_piece(p_type, cell, world)
+              for p_type, cells in PIECE_SETUP.items() for cell in cells]
+    with contextlib.redirect_stdout(io.StringIO()):
+        return HeadlessEngine(pieces, factory.board)
@@ -8,6 +8,8 @@ import numpy as np
 class Img:
     def __init__(self):
         self.img = None
+        self._blit_cache = None
+        self._scratch = None
 
     def read(self, path: str | pathlib.Path,
              size: tuple[int, int] | None = None,
@@ -53,31 +55,76 @@ class Img:
 
         return self
 
+    def _blit_layers(self):
+        """
+        Return the sprite in blit-ready form, computed once per image.
+
+        Returns ``(color, premul, inv_alpha)``:
+        color      uint8  (h, w, 3)  BGR pixels
+        premul     uint16 (h, w, 3)  color * alpha   (None for opaque images)
+        inv_alpha  uint16 (h, w, 1)  255 - alpha     (None for opaque images)
+        """
+        if self._blit_cache is not None and self._blit_cache[0] is self.img:
+            return self._blit_cache[1]
+
+        src = self.img
+        if src.ndim == 2:
+            src = cv2.cvtColor(src, cv2.COLOR_GRAY2BGR)
+
+        color = np.ascontiguousarray(src[..., :3])
+        if src.shape[2] == 4 and (src[..., 3] < 255).any():
+            alpha = src[..., 3:4].astype(np.uint16)
+            premul = color.astype(np.uint16) * alpha
+            inv_alpha = 255 - alpha
+        else:
+            premul = inv_alpha = None
+
+        layers = (color, premul, inv_alpha)
+        h, w = color.shape[:2]
+        self._scratch = (np.empty((h, w, 3), np.uint16), np.empty((h, w, 3), np.uint16))
+        self._blit_cache = (self.img, layers)
+        return layers
+
     def draw_on(self, other_img, x, y):
+        """
+        Alpha-blend this image onto `other_img` with its top-left at (x, y).
+
+        The part falling outside `other_img` is clipped.  Only the colour
+        channels of the target are written; a 4-channel target keeps its
+        own alpha.  Blending is integer (uint16) with the sprite
+        premultiplied once and cached, so `self.img` is never modified.
+        """
         if self.img is None or other_img.img is None:
             raise ValueError("Both images must be loaded before drawing.")
 
-        if self.img.shape[2] != other_img.img.shape[2]:
-            if self.img.shape[2] == 3 and other_img.img.shape[2] == 4:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGR2BGRA)
-            elif self.img.shape[2] == 4 and other_img.img.shape[2] == 3:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGRA2BGR)
-
-        h, w = self.img.shape[:2]
+        color, premul, inv_alpha = self._blit_layers()
+        x, y = int(x), int(y)
+        h, w = color.shape[:2]
         H, W = other_img.img.shape[:2]
 
-        if y + h > H or x + w > W:
-            raise ValueError("Logo does not fit at the specified position.")
-
-        roi = other_img.img[y:y + h, x:x + w]
-
-        if self.img.shape[2] == 4:
-            b, g, r, a = cv2.split(self.img)
-            mask = a / 255.0
-            for c in range(3):
-                roi[..., c] = (1 - mask) * roi[..., c] + mask * self.img[..., c]
-        else:
-            other_img.img[y:y + h, x:x + w] = self.img
+        # חיתוך לגבולות הלוח
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, W), min(y + h, H)
+        if x0 >= x1 or y0 >= y1:
+            return
+        src = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+        roi = other_img.img[y0:y1, x0:x1, :3]
+
+        if premul is None:
+            roi[...] = color[src]
+            return
+
+        # out = (dst * (255 - a) + src * a) / 255, rounded, in one uint16 pass
+        acc, tmp = self._scratch
+        acc = acc[:y1 - y0, :x1 - x0]
+        tmp = tmp[:y1 - y0, :x1 - x0]
+        np.multiply(roi, inv_alpha[src], out=acc)
+        acc += premul[src]
+        acc += 128
+        np.right_shift(acc, 8, out=tmp)
+        acc += tmp
+        acc >>= 8
+        np.copyto(roi, acc, casting='unsafe')
 
     def put_text(self, txt, x, y, font_size, color=(255, 255, 255, 255), thickness=1):
         if self.img is None:
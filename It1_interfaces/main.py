@@ -39,12 +39,24 @@ except ImportError as e:
     print(f"Error importing PieceFactory: {e}")
     PieceFactory = None
 
+try:
+    from PhysicsWorld import PhysicsWorld
+except ImportError as e:
+    print(f"Error importing PhysicsWorld: {e}")
+    PhysicsWorld = None
+
 try:
     from Piece import Piece
 except ImportError as e:
     print(f"Error importing Piece: {e}")
     Piece = None
 
+try:
+    from Bot import BotPlayer
+except ImportError as e:
+    print(f"Error importing Bot: {e}")
+    BotPlayer = None
+
 
 def create_minimal_img_class():
     """יצירת מחלקת Img מינימלית אם לא קיימת"""
@@ -60,6 +72,30 @@ def create_minimal_img_class():
     return MinimalImg
 
 
+# מיקומים מסורתיים של שחמט - לבנים למעלה (שורות 0-1), שחורים למטה (שורות 6-7)
+PIECE_SETUP = {
+    # שורה 1 - כלים לבנים עיקריים
+    'RW': [(0, 0), (0, 7)],  # צריחים לבנים
+    'NW': [(0, 1), (0, 6)],  # סוסים לבנים
+    'BW': [(0, 2), (0, 5)],  # רצים לבנים
+    'QW': [(0, 3)],          # מלכה לבנה
+    'KW': [(0, 4)],          # מלך לבן
+
+    # שורה 2 - חיילים לבנים
+    'PW': [(1, col) for col in range(8)],
+
+    # שורה 7 - חיילים שחורים
+    'PB': [(6, col) for col in range(8)],
+
+    # שורה 8 - כלים שחורים עיקריים
+    'RB': [(7, 0), (7, 7)],  # צריחים שחורים
+    'NB': [(7, 1), (7, 6)],  # סוסים שחורים
+    'BB': [(7, 2), (7, 5)],  # רצים שחורים
+    'QB': [(7, 3)],          # מלכה שחורה
+    'KB': [(7, 4)],          # מלך שחור
+}
+
+
 def create_board() -> Board:
     """יצירת לוח שחמט 8x8 עם תאים בגודל 80x80 פיקסלים"""
     
@@ -141,39 +177,18 @@ def create_pieces(board: Board) -> list:
     
     piece_factory = PieceFactory(board, pieces_dir)
     available_types = discover_piece_types(pieces_dir)
+    # עולם פיזיקה אחד לכל הכלים של המשחק הזה
+    world = PhysicsWorld()
     
     print(f"Available piece types: {available_types}")
     
-    # הגדרת מיקומים מסורתיים של שחמט
-    piece_setup = {
-        # שורה 1 - כלים לבנים עיקריים
-        'RW': [(0, 0), (0, 7)],  # צריחים לבנים
-        'NW': [(0, 1), (0, 6)],  # סוסים לבנים
-        'BW': [(0, 2), (0, 5)],  # רצים לבנים
-        'QW': [(0, 3)],          # מלכה לבנה
-        'KW': [(0, 4)],          # מלך לבן
-        
-        # שורה 2 - חיילים לבנים
-        'PW': [(1, col) for col in range(8)],
-        
-        # שורה 7 - חיילים שחורים
-        'PB': [(6, col) for col in range(8)],
-        
-        # שורה 8 - כלים שחורים עיקריים
-        'RB': [(7, 0), (7, 7)],  # צריחים שחורים
-        'NB': [(7, 1), (7, 6)],  # סוסים שחורים
-        'BB': [(7, 2), (7, 5)],  # רצים שחורים
-        'QB': [(7, 3)],          # מלכה שחורה
-        'KB': [(7, 4)],          # מלך שחור
-    }
-    
     # יצירת הכלים לפי ההגדרה המסורתית
     for piece_type in available_types:
-        if piece_type in piece_setup:
-            positions = piece_setup[piece_type]
+        if piece_type in PIECE_SETUP:
+            positions = PIECE_SETUP[piece_type]
             for row, col in positions:
                 try:
-                    piece = piece_factory.create_piece(piece_type, (row, col))
+                    piece = piece_factory.create_piece(piece_type, (row, col), world)
                     pieces.append(piece)
                     print(f"Created piece: {piece.piece_id} at ({row}, {col})")
                 except Exception as e:
@@ -192,7 +207,7 @@ def create_pieces(board: Board) -> list:
         for piece_type, (row, col) in basic_setup:
             if piece_type in available_types:
                 try:
-                    piece = piece_factory.create_piece(piece_type, (row, col))
+                    piece = piece_factory.create_piece(piece_type, (row, col), world)
                     pieces.append(piece)
                     print(f"Created basic piece: {piece.piece_id} at ({row}, {col})")
                 except Exception as e:
@@ -291,6 +306,11 @@ def main():
         game = Game(pieces, board)
         print("✅ Game initialized successfully")
         
+        # python main.py --bot: המחשב משחק בשחורים (שחקן 2)
+        if "--bot" in sys.argv and BotPlayer is not None:
+            game.bots.append(BotPlayer(2))
+            print("🤖 Black is played by the computer")
+        
         print("\n🎯 Controls:")
         print("   • Arrow Keys / WASD - Move cursor")
         print("   • Enter/Space - Select piece")
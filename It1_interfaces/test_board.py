@@ -0,0 +1,77 @@
+"""Cell names and bounds on boards wider than a-z / taller than 9 rows."""
+import contextlib
+import io
+
+import pytest
+
+from Board import cell_name, parse_cell_name
+from conftest import PIECES_ROOT, make_board
+from HeadlessEngine import HeadlessEngine
+from PhysicsWorld import PhysicsWorld
+from PieceFactory import PieceFactory
+
+
+@pytest.mark.parametrize("cell, name", [
+    ((1, 4), "e2"), ((0, 25), "z1"), ((0, 26), "aa1"), ((0, 27), "ab1"), ((0, 52), "ba1"),
+    ((0, 701), "zz1"), ((0, 702), "aaa1"), ((9, 0), "a10"), ((99, 0), "a100"), ((255, 255), "iv256"),
+])
+def test_cell_name_beyond_z_and_9(cell, name):
+    assert cell_name(cell) == name
+    assert parse_cell_name(name) == cell
+    assert parse_cell_name(name.upper()) == cell
+
+
+def test_cell_name_round_trips_on_a_large_board():
+    cells = [(r, c) for r in range(0, 1000, 37) for c in range(0, 1000, 13)]
+    assert all(parse_cell_name(cell_name(cell)) == cell for cell in cells)
+
+
+@pytest.mark.parametrize("name", ["", "a", "12", "1a", "a0", "a-1", "e2x"])
+def test_parse_cell_name_rejects_non_names(name):
+    assert parse_cell_name(name) is None
+
+
+@pytest.fixture(scope="module")
+def big_factory():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return PieceFactory(make_board(64, 4), PIECES_ROOT)
+
+
+def test_cell_param_rejects_cells_outside_the_board(big_factory):
+    physics = big_factory.create_piece("RW", (0, 0), PhysicsWorld()).current_state.physics
+    assert physics._cell_param((63, 63)) == (63, 63)
+    assert physics._cell_param("bl64") == (63, 63)
+    assert physics._cell_param("ay41") == (40, 50)
+    for value in [(64, 0), (0, 64), (-1, 0), (0, -1), "bm1", "a65", "??", None, (1,)]:
+        assert physics._cell_param(value) is None
+
+
+def test_large_board_move_and_capture(big_factory):
+    world = PhysicsWorld()
+
+    def create(code, cell):
+        return big_factory.create_piece(code, cell, world)
+
+    knight = create("NW", (60, 60))
+    white_rook = create("RW", (40, 30))
+    black_rook = create("RB", (40, 36))
+    pieces = [knight, white_rook, black_rook, create("KW", (0, 0)), create("KB", (63, 63))]
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = HeadlessEngine(pieces, big_factory.board)
+        assert engine.request_move(knight, (62, 61))
+        assert engine.request_move(white_rook, (40, 36))
+        engine.step(100)
+        # מי שהתחיל לזוז ראשון מנצח
+        assert engine.request_move(black_rook, (40, 30))
+        engine.run_for(6000)
+
+    occupancy = engine.game.occupancy
+    assert knight.current_state.physics.get_cell_pos() == (62, 61)
+    assert occupancy.piece_at(62, 61) is knight
+    assert occupancy.piece_at(60, 60) is None
+    assert black_rook not in engine.game.pieces
+    assert white_rook in engine.game.pieces
+    r, c = white_rook.current_state.physics.get_cell_pos()
+    assert r == 40 and 30 < c <= 36
+    assert occupancy.piece_at(r, c) is white_rook
+    assert not engine.is_over()
@@ -0,0 +1,25 @@
+"""Cooldown starts when a move is accepted, not when the queue is drained."""
+import contextlib
+import io
+
+
+def test_second_move_before_the_next_tick_is_rejected(engine):
+    game = engine.game
+    knight = game.occupancy.piece_at(0, 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert engine.request_move(knight, (2, 2))
+        assert not engine.request_move(knight, (2, 0))
+        engine.run_for(2000)
+    assert knight.current_state.physics.get_cell_pos() == (2, 2)
+    assert game.user_input_queue.empty()
+
+
+def test_move_is_accepted_again_after_the_cooldown(engine):
+    game = engine.game
+    knight = game.occupancy.piece_at(0, 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert engine.request_move(knight, (2, 2))
+        engine.run_for(game.MOVE_COOLDOWN_MS - 100)
+        assert not engine.request_move(knight, (4, 3))
+        engine.run_for(200)
+        assert engine.request_move(knight, (4, 3))
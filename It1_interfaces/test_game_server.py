@@ -0,0 +1,70 @@
+"""GameServer protocol: clients move only their own team, and only through the game's validation."""
+import asyncio
+import contextlib
+import io
+import json
+
+from GameServer import ClientConnection, GameServer, StandardRoomFactory
+
+
+def _run(scenario):
+    async def main():
+        server = GameServer(StandardRoomFactory())
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return scenario(server, server.create_room("r1"))
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def _piece_id(room, cell):
+    return room.game.occupancy.piece_at(*cell).piece_id
+
+
+def test_raw_command_op_is_gone():
+    def scenario(server, room):
+        client = ClientConnection(lambda text: None)
+        reply = server.handle_message(client, {"op": "command", "room": "r1", "piece_id": _piece_id(room, (1, 3)),
+                                               "type": "Move", "params": [[5, 5], [6, 6]]})
+        assert not reply["ok"]
+        assert room.game.user_input_queue.empty()
+    _run(scenario)
+
+
+def test_client_moves_only_its_own_team():
+    def scenario(server, room):
+        white, black, watcher = (ClientConnection(lambda text: None) for _ in range(3))
+        assert server.handle_message(white, {"op": "join", "room": "r1", "team": "white"})["team"] == 1
+        assert server.handle_message(black, {"op": "join", "room": "r1", "team": 2})["ok"]
+        assert server.handle_message(watcher, {"op": "join", "room": "r1"})["ok"]
+        # הצד כבר תפוס
+        assert not server.handle_message(watcher, {"op": "join", "room": "r1", "team": "white"})["ok"]
+
+        black_pawn, white_pawn = _piece_id(room, (6, 3)), _piece_id(room, (1, 3))
+        move = {"op": "move", "room": "r1"}
+        assert not server.handle_message(watcher, {**move, "piece_id": white_pawn, "to": [2, 3]})["ok"]
+        assert not server.handle_message(white, {**move, "piece_id": black_pawn, "to": [5, 3]})["ok"]
+        assert server.handle_message(white, {**move, "piece_id": white_pawn, "to": [2, 3]})["ok"]
+        assert server.handle_message(black, {**move, "piece_id": black_pawn, "to": [5, 3]})["ok"]
+        # המהלך עדיין עובר את בדיקות המשחק
+        assert not server.handle_message(black, {**move, "piece_id": _piece_id(room, (6, 4)), "to": [2, 4]})["ok"]
+
+        server._disconnect(white)
+        assert server.handle_message(watcher, {"op": "join", "room": "r1", "team": "white"})["ok"]
+    _run(scenario)
+
+
+def test_moves_are_broadcast_as_plain_json_fields():
+    def scenario(server, room):
+        lines = []
+        client = ClientConnection(lines.append)
+        assert server.handle_message(client, {"op": "join", "room": "r1", "team": "white"})["ok"]
+        pawn = _piece_id(room, (1, 3))
+        assert server.handle_message(client, {"op": "move", "room": "r1", "piece_id": pawn, "to": [2, 3]})["ok"]
+        room.tick(room.clock.now_ms() + 40)
+        return [json.loads(line) for line in lines]
+    events = [m for m in _run(scenario) if m.get("event") == "piece_moved"]
+    assert events
+    assert {k: v for k, v in events[0].items() if k != "piece_id"} == {
+        "event": "piece_moved", "room": "r1", "position": [2, 3]}
@@ -0,0 +1,49 @@
+"""Move tables on the starting position main.py builds (run with pytest from the repo root)."""
+import contextlib
+import io
+
+from PhysicsWorld import PhysicsWorld
+
+
+def _destinations(game, piece):
+    """Cells the move table allows, minus cells held by the piece's own team."""
+    cell = piece.current_state.physics.get_cell_pos()
+    targets = piece.current_state.moves.compiled().legal_moves(*cell, game.occupancy.bitboard)
+    own = {p.current_state.physics.get_cell_pos() for p in game.pieces if p.team == piece.team}
+    return set(targets) - own
+
+
+def _expected(p_type, r, c):
+    if p_type in ("PW", "PB"):
+        step = 1 if p_type == "PW" else -1
+        cells = {(r + step, c), (r + 2 * step, c), (r + step, c - 1), (r + step, c + 1)}
+        return {(nr, nc) for nr, nc in cells if 0 <= nc < 8}
+    if p_type[0] == "N":
+        home = 0 if p_type == "NW" else 7
+        step = 1 if p_type == "NW" else -1
+        return {(home + 2 * step, nc) for nc in (c - 1, c + 1) if 0 <= nc < 8}
+    # צריח, רץ, מלכה ומלך חסומים בשורת הבית
+    return set()
+
+
+def test_every_starting_piece_gets_its_destinations(engine):
+    for piece in engine.game.pieces:
+        p_type = piece.piece_type + ("W" if piece.team == 1 else "B")
+        r, c = piece.current_state.physics.get_cell_pos()
+        assert _destinations(engine.game, piece) == _expected(p_type, r, c), (p_type, (r, c))
+
+
+def test_bishop_moves_diagonally_and_rook_orthogonally(factory):
+    bishop = factory.create_piece("BW", (3, 3), PhysicsWorld()).current_state.moves.compiled()
+    rook = factory.create_piece("RW", (3, 3), PhysicsWorld()).current_state.moves.compiled()
+    assert (4, 4) in bishop.legal_moves(3, 3) and (3, 4) not in bishop.legal_moves(3, 3)
+    assert (3, 4) in rook.legal_moves(3, 3) and (4, 4) not in rook.legal_moves(3, 3)
+
+
+def test_pawn_forward_move_is_accepted(engine):
+    game = engine.game
+    pawn = game.occupancy.piece_at(1, 3)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert engine.request_move(pawn, (2, 3))
+        engine.run_for(1000)
+    assert pawn.current_state.physics.get_cell_pos() == (2, 3)
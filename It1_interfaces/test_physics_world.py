@@ -0,0 +1,40 @@
+"""Games built from one PieceFactory do not move each other's pieces."""
+import contextlib
+import io
+
+from HeadlessEngine import HeadlessEngine
+from PhysicsWorld import PhysicsWorld
+
+
+def _game(factory):
+    world = PhysicsWorld()
+    knight = factory.create_piece("NW", (0, 1), world)
+    pieces = [knight, factory.create_piece("KW", (0, 4), world), factory.create_piece("KB", (7, 4), world)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        return HeadlessEngine(pieces, factory.board), knight
+
+
+def test_one_game_ticking_leaves_another_games_pieces_alone(factory):
+    engine_a, knight_a = _game(factory)
+    engine_b, _ = _game(factory)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert engine_a.request_move(knight_a, (2, 2))
+        engine_a.step(1)
+        engine_b.run_for(50_000)
+    physics = knight_a.current_state.physics
+    assert physics.is_moving()
+    assert physics.get_pos() == (0, 1)
+    assert engine_a.game.occupancy.piece_at(2, 2) is None
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine_a.run_for(3000)
+    assert physics.get_cell_pos() == (2, 2)
+    assert engine_a.game.occupancy.piece_at(2, 2) is knight_a
+
+
+def test_each_batch_of_pieces_gets_rows_in_its_own_world(factory):
+    world_a, world_b = PhysicsWorld(), PhysicsWorld()
+    a = factory.create_piece("QW", (0, 3), world_a).current_state.physics
+    b = factory.create_piece("QW", (0, 3), world_b).current_state.physics
+    assert a.world is world_a and b.world is world_b
+    assert world_a.size == world_b.size == 1
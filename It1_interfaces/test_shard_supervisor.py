@@ -0,0 +1,34 @@
+"""A worker killed from outside is restarted with its rooms re-created."""
+import os
+import signal
+import time
+
+from GameServer import StandardRoomFactory
+from ShardSupervisor import ShardSupervisor
+
+
+def _wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+def test_killed_worker_is_restarted_with_its_rooms():
+    supervisor = ShardSupervisor(StandardRoomFactory(), workers=2)
+    supervisor.start()
+    try:
+        for i in range(4):
+            supervisor.create_room(f"r{i}")
+        before = supervisor.stats()["workers"]
+        victim = supervisor.create_room("r1")
+        os.kill(before[victim]["pid"], signal.SIGKILL)
+        _wait_for(lambda: supervisor.restarts == 1)
+
+        after = supervisor.stats()
+        assert after["workers"][victim]["pid"] != before[victim]["pid"]
+        assert after["rooms"] == 4
+        reply = supervisor.request("r1", {"op": "join"}).result(5)
+        assert reply["ok"] and reply["pieces"]
+    finally:
+        supervisor.stop()
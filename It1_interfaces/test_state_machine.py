@@ -0,0 +1,48 @@
+"""State timing and drawing never wait for a sprite set to be decoded."""
+import contextlib
+import io
+from concurrent.futures import Future
+
+from conftest import PIECES_ROOT, make_board
+from HeadlessEngine import HeadlessEngine
+from PhysicsWorld import PhysicsWorld
+from PieceFactory import PieceFactory
+from SpriteCache import sprite_cache, sprite_loader
+
+
+def _undecoded_factory(monkeypatch):
+    """A factory whose non-initial sprite sets will never finish decoding."""
+    sprite_cache.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        factory = PieceFactory(make_board(), PIECES_ROOT)
+    monkeypatch.setattr(sprite_loader, "submit", lambda *args, **kwargs: Future())
+    monkeypatch.setattr(sprite_loader, "load", lambda *args, **kwargs: (_ for _ in ()).throw(
+        AssertionError("decoded on the calling thread")))
+    return factory
+
+
+def test_move_rest_idle_follows_the_cooldown_without_decoding(monkeypatch):
+    factory = _undecoded_factory(monkeypatch)
+    world = PhysicsWorld()
+    knight = factory.create_piece("NW", (0, 1), world)
+    king = factory.create_piece("KB", (7, 4), world)
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = HeadlessEngine([knight, king], factory.board)
+        engine.game.animate_sprites = True
+        assert engine.request_move(knight, (2, 2))
+        engine.step(10)
+    state = knight.current_state
+    assert state.name == "move" and not state.graphics.is_ready()
+    idle_frame = state.machine.graphics[state.machine.initial].get_img(0)
+    assert knight.render_view(engine.now_ms).sprite is idle_frame
+
+    seen = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        while engine.now_ms < 8000:
+            engine.step(10)
+            if not seen or seen[-1][0] != state.name:
+                seen.append((state.name, engine.now_ms))
+    physics = state.physics
+    rest_end = physics.cooldown_start_ms + physics.cooldown_duration_ms
+    assert [name for name, _ in seen] == ["move", "long_rest", "idle"]
+    assert rest_end <= seen[-1][1] <= rest_end + 10